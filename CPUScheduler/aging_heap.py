@@ -0,0 +1,100 @@
+import heapq
+import math
+
+
+class AgingHeap:
+    """
+    Ready set of the Priority algorithms: lowest priority number first, ties
+    going to the smaller 'order' (distinct for every item). With an aging
+    'interval', every waiting item moves up one level, down to 0, at each
+    tick (time interval, 2 * interval, ...).
+    Aging never visits the waiting items: one still moving up is keyed by
+    its priority plus the ticks before it started waiting, so one more tick
+    raises all of them at once and its priority now is that key minus the
+    ticks so far. On reaching 0 it moves to a heap of settled items, whose
+    priorities no longer change. push and pop are O(log n), and settling
+    costs one more O(log n) move per item however long it waits.
+    Methods that look at priorities take the current time, which must
+    never go back.
+    """
+    __slots__ = ("interval", "_rising", "_settled", "_ticks", "moves")
+
+    def __init__(self, interval=0):
+        self.interval = interval
+        self._rising = []  # (priority + ticks before it waited, order, item), still aging
+        self._settled = [] # (priority, order, item), done aging (or no aging at all)
+        self._ticks = 0    # Ticks applied so far
+        self.moves = 0     # Items moved from rising to settled
+
+    def __len__(self):
+        return len(self._rising) + len(self._settled)
+
+    def push(self, item, priority, order, now):
+        """Adds an item waiting from just after 'now' (a tick at 'now' does not count for it)."""
+        self._add(item, priority, order, self._ticks_through(now), now)
+
+    def arrive(self, item, priority, order, now):
+        """Adds an item arriving at 'now': a tick at 'now' already counts for it."""
+        ticks = 0
+        if self.interval and now > 0:
+            ticks = -(-now // self.interval) - 1 # Ticks strictly before 'now'
+        self._add(item, priority, order, ticks, now)
+
+    def peek(self, now):
+        """Returns (priority, item) of the best waiting item at 'now' without removing it, or None."""
+        self._advance(now)
+        if self._settled:
+            priority, _, item = self._settled[0]
+            return priority, item
+        if self._rising:
+            key, _, item = self._rising[0]
+            return key - self._ticks, item
+        return None
+
+    def pop(self, now):
+        """Removes the best waiting item at 'now'. Returns (its priority, item)."""
+        self._advance(now)
+        if self._settled:
+            priority, _, item = heapq.heappop(self._settled)
+            return priority, item
+        key, _, item = heapq.heappop(self._rising)
+        return key - self._ticks, item
+
+    def beats_at(self, priority, now):
+        """
+        Time of the first aging tick after 'now' at which the best waiting
+        item has a better (lower) priority than 'priority', or inf if none
+        ever will.
+        """
+        top = self.peek(now)
+        if top is None or not self.interval:
+            return math.inf
+        if top[0] < priority:
+            return (now // self.interval + 1) * self.interval
+        if priority <= 0:
+            return math.inf # Nothing ages below 0
+        # The top is still rising (settled items are at 0 or below), and
+        # nothing overtakes it: it reaches priority - 1 after key - priority + 1 ticks
+        return (self._rising[0][0] - priority + 1) * self.interval
+
+    def _ticks_through(self, now):
+        return now // self.interval if self.interval and now > 0 else 0
+
+    def _add(self, item, priority, order, ticks_before, now):
+        if not self.interval or priority <= 0:
+            heapq.heappush(self._settled, (priority, order, item))
+        elif priority + ticks_before <= self._ticks_through(now):
+            heapq.heappush(self._settled, (0, order, item)) # Aged to 0 on arrival
+        else:
+            heapq.heappush(self._rising, (priority + ticks_before, order, item))
+
+    def _advance(self, now):
+        ticks = self._ticks_through(now)
+        if ticks <= self._ticks:
+            return
+        self._ticks = ticks
+        rising, settled = self._rising, self._settled
+        while rising and rising[0][0] <= ticks:
+            _, order, item = heapq.heappop(rising)
+            heapq.heappush(settled, (0, order, item))
+            self.moves += 1
@@ -0,0 +1,49 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None # Fall back to plain Python: same results, just slower
+
+
+def to_list(column):
+    """A column (NumPy array or list) as a list of plain Python numbers."""
+    return column.tolist() if np is not None and isinstance(column, np.ndarray) else column
+
+
+def summarize(values):
+    """Returns (count, mean, sum of squared deviations, min, max) of a batch of numbers."""
+    n = len(values)
+    if n == 0:
+        return 0, 0.0, 0.0, 0, 0
+    if np is not None:
+        a = np.asarray(values)
+        mean = float(a.mean())
+        deviations = a.astype(np.float64) - mean
+        return n, mean, float(deviations @ deviations), a.min().item(), a.max().item()
+
+    mean = math.fsum(values) / n
+    m2 = math.fsum((v - mean) ** 2 for v in values)
+    return n, mean, m2, min(values), max(values)
+
+
+def log_bucket_counts(values, log_gamma):
+    """
+    Returns (zeros, {bucket: count}) for a batch of values, where a positive
+    value v goes in bucket ceil(log(v) / log_gamma), like QuantileSketch.
+    """
+    if np is not None:
+        a = np.asarray(values, dtype=np.float64)
+        positive = a[a > 0]
+        buckets, counts = np.unique(np.ceil(np.log(positive) / log_gamma), return_counts=True)
+        return len(a) - len(positive), dict(zip(buckets.astype(np.int64).tolist(), counts.tolist()))
+
+    zeros = 0
+    counts = {}
+    for v in values:
+        if v <= 0:
+            zeros += 1
+        else:
+            i = math.ceil(math.log(v) / log_gamma)
+            counts[i] = counts.get(i, 0) + 1
+    return zeros, counts
@@ -0,0 +1,176 @@
+"""
+Benchmarks every solve_* engine on seeded synthetic workloads.
+
+    python benchmark.py                              # run and print
+    python benchmark.py --save baseline.json         # record a baseline
+    python benchmark.py --compare baseline.json      # flag regressions against it
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from generator import BURST_DISTRIBUTIONS, WorkloadGenerator
+from scheduler import solve_fcfs, solve_sjf, solve_srt, solve_rr, solve_mlfq, solve_priority
+
+
+ENGINES = {
+    "FCFS": lambda ps: solve_fcfs(ps),
+    "SJF": lambda ps: solve_sjf(ps),
+    "SRT": lambda ps: solve_srt(ps),
+    "RR": lambda ps: solve_rr(ps, quantum=2),
+    "MLFQ": lambda ps: solve_mlfq(ps, aging_interval=20),
+    "PRIO": lambda ps: solve_priority(ps),
+    "PRIO-P": lambda ps: solve_priority(ps, preemptive=True, aging_interval=20),
+}
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# Offered load (mean burst / mean inter-arrival gap): above 1 the ready queue keeps growing
+ARRIVAL_DENSITIES = {"sparse": 0.5, "dense": 1.5}
+DEFAULT_SCENARIOS = ("sparse-uniform", "dense-exponential", "dense-bimodal")
+
+MEAN_BURST = 10
+
+# Priority classes of the generated jobs (only the Priority engines read them)
+PRIORITY_MIX = "0:1,1:3,2:6"
+
+# A run this much slower than the baseline counts as a regression,
+# unless the difference is below timer noise
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_SECONDS = 0.01
+
+
+def generate_workload(n, scenario, seed=0):
+    """
+    Builds a reproducible Workload of n jobs for a '<density>-<burst distribution>'
+    scenario: Poisson arrivals at the density's offered load (see generator.py),
+    in the priority classes of PRIORITY_MIX.
+    """
+    density, distribution = scenario.split("-", 1)
+    if density not in ARRIVAL_DENSITIES:
+        raise ValueError(f"Unknown arrival density '{density}'")
+    return WorkloadGenerator(n, seed=seed, load=ARRIVAL_DENSITIES[density], bursts=distribution,
+                             mean_burst=MEAN_BURST, priorities=PRIORITY_MIX).to_workload()
+
+
+def _run_engine(engine, workload):
+    processes = workload.to_processes()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        ENGINES[engine](processes)
+        return time.perf_counter() - start
+
+
+def _peak_memory(engine, workload):
+    tracemalloc.start()
+    try:
+        _run_engine(engine, workload)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, scenarios=DEFAULT_SCENARIOS, engines=tuple(ENGINES),
+                   seed=0, repeat=1, measure_memory=True, progress=None):
+    """
+    Times every engine on every (scenario, size) workload.
+    Returns a list of dicts with the best of 'repeat' wall times and, if
+    requested, the tracemalloc peak from a separate run.
+    """
+    results = []
+    for scenario in scenarios:
+        for n in sizes:
+            workload = generate_workload(n, scenario, seed)
+            for engine in engines:
+                seconds = min(_run_engine(engine, workload) for _ in range(repeat))
+                row = {"engine": engine, "scenario": scenario, "size": n, "seconds": seconds}
+                if measure_memory:
+                    row["peak_bytes"] = _peak_memory(engine, workload)
+                results.append(row)
+                if progress:
+                    progress(row)
+    return results
+
+
+def _key(row):
+    return f"{row['engine']}/{row['scenario']}/{row['size']}"
+
+
+def save_baseline(filename, results, seed):
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "results": {_key(row): row for row in results},
+    }
+    with open(filename, 'w') as file:
+        json.dump(data, file, indent=2)
+
+
+def compare_to_baseline(filename, results, ratio=REGRESSION_RATIO):
+    """Returns a list of (key, baseline_seconds, seconds) for runs slower than ratio x baseline."""
+    with open(filename, 'r') as file:
+        baseline = json.load(file)["results"]
+    
+    regressions = []
+    for row in results:
+        old = baseline.get(_key(row))
+        if (old and row["seconds"] > old["seconds"] * ratio
+                and row["seconds"] - old["seconds"] > REGRESSION_MIN_SECONDS):
+            regressions.append((_key(row), old["seconds"], row["seconds"]))
+    return regressions
+
+
+def _print_row(row):
+    memory = f"{row['peak_bytes'] / 2**20:10.1f} MiB" if "peak_bytes" in row else ""
+    print(f"{row['engine']:<8}{row['scenario']:<20}{row['size']:>10}{row['seconds']:>12.3f}s{memory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the CPU scheduling engines")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="Comma separated job counts")
+    parser.add_argument("--scenarios", default=",".join(DEFAULT_SCENARIOS),
+                        help="Comma separated <density>-<bursts> scenarios, densities: "
+                             f"{', '.join(ARRIVAL_DENSITIES)}; bursts: {', '.join(BURST_DISTRIBUTIONS)}")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="Comma separated engine names")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Keep the best of N timed runs")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run")
+    parser.add_argument("--save", metavar="FILE", help="Write results to a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Compare against a JSON baseline")
+    args = parser.parse_args(argv)
+    
+    engines = args.engines.split(",")
+    for engine in engines:
+        if engine not in ENGINES:
+            parser.error(f"Unknown engine '{engine}'")
+    
+    print(f"{'Engine':<8}{'Scenario':<20}{'Jobs':>10}{'Time':>13}{'Peak Memory':>14}")
+    print("-" * 67)
+    results = run_benchmarks(sizes=[int(n) for n in args.sizes.split(",")],
+                             scenarios=args.scenarios.split(","),
+                             engines=engines, seed=args.seed, repeat=args.repeat,
+                             measure_memory=not args.no_memory, progress=_print_row)
+    
+    if args.save:
+        save_baseline(args.save, results, args.seed)
+        print(f"Baseline saved to '{args.save}'")
+    
+    if args.compare:
+        regressions = compare_to_baseline(args.compare, results)
+        if regressions:
+            print(f"\nRegressions (> {REGRESSION_RATIO:.2f}x baseline):")
+            for key, old, new in regressions:
+                print(f"  {key}: {old:.3f}s -> {new:.3f}s")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
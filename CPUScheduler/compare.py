@@ -0,0 +1,183 @@
+import contextlib
+import csv
+import io
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from metrics import MetricsAggregator, PriorityMetrics
+from overhead import cpu_efficiency
+from profiler import Profiler
+from result_cache import ResultCache, cached_run
+from scheduler import ALGORITHMS
+from smp import GLOBAL
+from timeline import as_lanes
+from workload import clear_workload_cache, load_workload, save_workload
+
+
+# Short names used for each algorithm's result file (results_<name>.csv)
+RESULT_NAMES = {"FCFS": "FCFS", "SJF (Non-Preemptive)": "SJF", "SRT (Preemptive)": "SRT",
+                "Round Robin": "RR", "MLFQ": "MLFQ",
+                "Priority (Non-Preemptive)": "PRIO", "Priority (Preemptive)": "PRIO-P"}
+
+# Submitted first when there are fewer workers than algorithms, so the
+# slowest engines never end up queued behind the fast ones
+SLOWEST_FIRST = ("MLFQ", "Round Robin", "Priority (Preemptive)", "SRT (Preemptive)",
+                 "Priority (Non-Preemptive)", "SJF (Non-Preemptive)", "FCFS")
+
+# In-memory workloads at least this big are spilled to a temporary binary
+# file, so workers map one shared copy instead of each unpickling their own
+SHARE_MIN_JOBS = 50_000
+
+# Workload shared by every task of a worker process (set once by _init_worker)
+_worker_workload = None
+
+
+def write_results_csv(filename, processes, algorithm_name, metrics=None, efficiency=None):
+    """
+    Writes one algorithm's per-process results and summary rows to a CSV file.
+    'efficiency' (from overhead.cpu_efficiency) adds the CPU efficiency row,
+    and PriorityMetrics add a table of per-priority-class statistics.
+    """
+    if metrics is None:
+        metrics = MetricsAggregator.from_processes(processes)
+
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+
+        # Write Header
+        writer.writerow(["Algorithm", algorithm_name])
+        writer.writerow([]) # Empty line
+        writer.writerow(["PID", "Arrival", "Burst", "Finish", "Wait", "Turnaround", "Response"])
+
+        # Write Data
+        writer.writerows((p.pid, p.arrival_time, p.burst_time, p.completion_time,
+                          p.waiting_time, p.turnaround_time, p.response_time)
+                         for p in processes)
+
+        # Write Summary (Averages, percentiles, max, stddev)
+        writer.writerow([])
+        for label, wait, turnaround, response in metrics.stats():
+            writer.writerow(["Averages" if label == "Average" else label, "", "", "",
+                             f"{wait:.2f}",
+                             f"{turnaround:.2f}",
+                             f"{response:.2f}"])
+        if efficiency is not None:
+            writer.writerow(["CPU Efficiency", f"{efficiency[0]:.2%}", "Overhead", efficiency[1]])
+        if isinstance(metrics, PriorityMetrics):
+            writer.writerow([])
+            writer.writerow(["Priority", "Count", "Avg Wait", "P95 Wait", "Avg Response", "P95 Response"])
+            writer.writerows((priority, count) + tuple(f"{value:.2f}" for value in values)
+                             for priority, count, *values in metrics.class_stats())
+
+
+def _init_worker(workload):
+    global _worker_workload
+    _worker_workload = workload
+
+
+def _run_algorithm(algorithm, params, output_dir, cache_dir, profile, trace_memory):
+    cache = ResultCache(max_entries=1, disk_dir=cache_dir) if cache_dir else None
+    profiler = Profiler(trace_memory=trace_memory) if profile or trace_memory else None
+    start = time.perf_counter()
+
+    # Keep the per-run banners out of the comparison output
+    with contextlib.redirect_stdout(io.StringIO()), (profiler or contextlib.nullcontext()):
+        processes, gantt, metrics, cached = cached_run(cache, _worker_workload, algorithm,
+                                                       profiler=profiler, **params)
+    elapsed = time.perf_counter() - start
+
+    efficiency = cpu_efficiency(gantt)
+    if output_dir:
+        write_results_csv(os.path.join(output_dir, f"results_{RESULT_NAMES[algorithm]}.csv"),
+                          processes, algorithm, metrics, efficiency)
+
+    # Only the summary goes back to the parent; the schedule stays in the worker
+    makespan = max(lane.end_time for lane in as_lanes(gantt))
+    return (algorithm, metrics, makespan, efficiency[0], elapsed, cached, profiler)
+
+
+def run_comparison(workload, algorithms=ALGORITHMS, output_dir=None, workers=None, cache_dir=None,
+                   quantum=2, aging_interval=20, cores=1, queues=GLOBAL, profile=False, trace_memory=False,
+                   switch_cost=None, priority_aging=0):
+    """
+    Runs every algorithm on the same workload at once, one per worker process.
+    The workload is handed to each worker once; binary workloads (and big
+    in-memory ones, via a temporary binary file) are memory-mapped by every
+    worker, so they all read the same physical pages.
+    With 'output_dir', each worker writes results_<name>.csv for its
+    algorithm. With 'cache_dir', runs go through the on-disk result cache.
+    With 'profile' (or 'trace_memory') every run is profiled in its worker.
+    Returns a list of (algorithm, metrics, makespan, CPU efficiency,
+    seconds, cached, profiler or None) in 'algorithms' order.
+    """
+    unknown = [a for a in algorithms if a not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unknown algorithm '{unknown[0]}'")
+    params = {"quantum": quantum, "aging_interval": aging_interval, "cores": cores, "queues": queues,
+              "switch_cost": switch_cost, "priority_aging": priority_aging}
+    order = sorted(algorithms, key=lambda a: SLOWEST_FIRST.index(a))
+
+    workers = min(workers or os.cpu_count() or 1, len(order))
+    if workers <= 1:
+        _init_worker(workload)
+        results = {a: _run_algorithm(a, params, output_dir, cache_dir, profile, trace_memory)
+                   for a in order}
+        return [results[a] for a in algorithms]
+
+    spill_dir = None
+    try:
+        if workload.source is None and len(workload) >= SHARE_MIN_JOBS:
+            spill_dir = tempfile.mkdtemp(prefix="cpusched-")
+            path = os.path.join(spill_dir, "workload.wkb")
+            save_workload(workload, path)
+            workload = load_workload(path)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(workload,)) as pool:
+            futures = {a: pool.submit(_run_algorithm, a, params, output_dir, cache_dir, profile, trace_memory)
+                       for a in order}
+            return [futures[a].result() for a in algorithms]
+    finally:
+        if spill_dir:
+            # Unmap before deleting the file (required on Windows): drop our
+            # reference, the executor's initargs and load_workload's cache entry
+            del workload
+            pool = None
+            clear_workload_cache(path)
+            # A file still mapped somewhere must not hide a worker's exception
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+def comparison_rows(results):
+    """
+    Side-by-side summary of run_comparison results: a header row of
+    algorithm names, then one row per statistic.
+    """
+    header = ["Metric"] + [RESULT_NAMES.get(algorithm, algorithm) for algorithm, *_ in results]
+    rows = [header]
+
+    stats = [metrics.stats() for _, metrics, *_ in results]
+    for i, (label, *_) in enumerate(stats[0] if stats else ()):
+        for j, measure in enumerate(("Wait", "Turnaround", "Response")):
+            rows.append([f"{label} {measure}"] + [f"{table[i][j + 1]:.2f}" for table in stats])
+
+    rows.append(["Makespan"] + [str(makespan) for _, _, makespan, *_ in results])
+    rows.append(["Throughput (jobs/unit)"] + [f"{metrics.count / makespan:.4f}" if makespan else "0"
+                                              for _, metrics, makespan, *_ in results])
+    rows.append(["CPU Efficiency"] + [f"{efficiency:.2%}" for _, _, _, efficiency, *_ in results])
+    rows.append(["Run Time (s)"] + [f"{seconds:.3f}" + (" (cached)" if cached else "")
+                                    for *_, seconds, cached, _ in results])
+
+    # Profiled runs: their counters and timings, one row each
+    profiles = [profiler.rows() for *_, profiler in results if profiler is not None]
+    if len(profiles) == len(results):
+        for i, (label, _) in enumerate(profiles[0]):
+            rows.append([label] + [table[i][1] for table in profiles])
+    return rows
+
+
+def write_comparison_csv(filename, results):
+    with open(filename, 'w', newline='') as file:
+        csv.writer(file).writerows(comparison_rows(results))
@@ -0,0 +1,300 @@
+import math
+from itertools import cycle
+from overhead import OVERHEAD_PID
+from timeline import as_lanes
+
+
+# Color palette for PIDs
+COLORS = ["#ff9999", "#99ccff", "#99ff99", "#ffff99", "#ffcc99",
+          "#cc99ff", "#ff99cc", "#99ffcc", "#ccff99", "#ffccff"]
+
+# Context-switch overhead segments
+OVERHEAD_COLOR = "#808080"
+
+
+class GanttView:
+    """
+    Zoomable, scrollable Gantt chart on a Tk canvas.
+    Only the time window currently on screen is drawn, so the number of
+    canvas items is bounded by the canvas width, not by the number of
+    segments. When segments get narrower than LOD_PX pixels the window is
+    drawn as BIN_PX-wide bands instead: band height is CPU utilization in
+    that slice and the color is the pid running in its middle.
+    Multi-core results get one lane per core, squeezed to fit the canvas
+    height; the level of detail is chosen per lane.
+    Scrolling, dragging and zooming only schedule a redraw, and bursts of
+    events are coalesced into one redraw on the next idle cycle.
+    """
+    MARGIN = 20
+    BAR_Y = 30
+    BAR_HEIGHT = 40
+    MIN_LANE_HEIGHT = 3
+    DEFAULT_SCALE = 40 # pixels per time unit, same as the old fixed-scale chart
+    MAX_SCALE = 400
+    LOD_PX = 3         # fewer pixels per visible segment than this -> utilization bands
+    BIN_PX = 2
+    LABEL_GAP = 30     # minimum pixels between time labels
+
+    def __init__(self, canvas, scrollbar):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.lanes = None
+        self.end_time = 0
+        self._names = []     # color id -> pid, shared by every lane
+        self._fills = []     # color id -> fill color
+        self._color_ids = [] # per lane: interned pid id -> color id
+        self.scale = self.DEFAULT_SCALE
+        self.offset = 0.0 # time at the left edge of the view
+        self._redraw_pending = False
+        self._drag_x = None
+
+        scrollbar.configure(command=self.on_scroll)
+        canvas.bind("<Configure>", lambda e: self.request_redraw())
+        canvas.bind("<ButtonPress-1>", self._on_drag_start)
+        canvas.bind("<B1-Motion>", self._on_drag)
+        # Wheel scrolls, Ctrl+Wheel zooms (MouseWheel on Windows/macOS, Button-4/5 on X11)
+        canvas.bind("<MouseWheel>", lambda e: self._on_wheel(e, 1 if e.delta > 0 else -1, False))
+        canvas.bind("<Control-MouseWheel>", lambda e: self._on_wheel(e, 1 if e.delta > 0 else -1, True))
+        canvas.bind("<Button-4>", lambda e: self._on_wheel(e, 1, False))
+        canvas.bind("<Button-5>", lambda e: self._on_wheel(e, -1, False))
+        canvas.bind("<Control-Button-4>", lambda e: self._on_wheel(e, 1, True))
+        canvas.bind("<Control-Button-5>", lambda e: self._on_wheel(e, -1, True))
+
+    # --- Public API ---
+
+    def set_data(self, gantt_data):
+        """Shows a Timeline, a list of (pid, start, end) tuples, or a list of Timelines (one per core)."""
+        self.lanes = as_lanes(gantt_data)
+        self.end_time = max(lane.end_time for lane in self.lanes)
+
+        # The same pid keeps its color on every core
+        color_of = {}
+        self._color_ids = [[color_of.setdefault(pid, len(color_of)) for pid in lane.pids]
+                           for lane in self.lanes]
+        self._names = list(color_of)
+        palette = cycle(COLORS)
+        self._fills = [OVERHEAD_COLOR if pid == OVERHEAD_PID else next(palette) for pid in self._names]
+
+        self.scale = self.DEFAULT_SCALE
+        self.offset = 0.0
+        self.redraw()
+
+    def clear(self):
+        self.lanes = None
+        self.end_time = 0
+        self.canvas.delete("all")
+        self.scrollbar.set(0, 1)
+
+    def zoom(self, factor, anchor_x=None):
+        """Zooms by 'factor', keeping the time under canvas x 'anchor_x' (default: center) in place."""
+        if not self.end_time:
+            return
+        if anchor_x is None:
+            anchor_x = self.MARGIN + self._view_width() / 2
+        anchor_time = self.offset + (anchor_x - self.MARGIN) / self.scale
+
+        self.scale = min(max(self.scale * factor, self._fit_scale()), self.MAX_SCALE)
+        self.offset = anchor_time - (anchor_x - self.MARGIN) / self.scale
+        self.request_redraw()
+
+    def fit(self):
+        if not self.end_time:
+            return
+        self.scale = self._fit_scale()
+        self.offset = 0.0
+        self.request_redraw()
+
+    def on_scroll(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        if not self.end_time:
+            return
+        span = self._view_width() / self.scale
+        if args[0] == "moveto":
+            self.offset = float(args[1]) * self.end_time
+        elif args[0] == "scroll":
+            step = span if args[2] == "pages" else span / 10
+            self.offset += int(args[1]) * step
+        self.request_redraw()
+
+    def request_redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.canvas.after_idle(self.redraw)
+
+    # --- Drawing ---
+
+    def redraw(self):
+        self._redraw_pending = False
+        canvas = self.canvas
+        canvas.delete("all")
+        if self.lanes is None:
+            return
+
+        if not self.end_time:
+            canvas.create_text(300, 60, text="No Gantt chart data available",
+                               font=("Arial", 12), fill="gray")
+            self.scrollbar.set(0, 1)
+            return
+
+        width = self._view_width()
+        end_time = self.end_time
+        span = width / self.scale
+        self.offset = min(max(self.offset, 0.0), max(0.0, end_time - span))
+        t0, t1 = self.offset, self.offset + span
+
+        single = len(self.lanes) == 1
+        pitch, height = self._lane_geometry()
+        color_ids = {} # Insertion-ordered set of the pids drawn
+        detailed = True
+        for k, timeline in enumerate(self.lanes):
+            y = self.BAR_Y + k * pitch
+            lo, hi = timeline.visible_range(t0, t1)
+            if hi - lo <= width / self.LOD_PX:
+                drawn = self._draw_segments(timeline, self._color_ids[k], lo, hi, t0, t1, y, height, single)
+            else:
+                drawn = self._draw_bands(timeline, self._color_ids[k], t0, t1, width, y, height)
+                detailed = False
+            color_ids.update(dict.fromkeys(drawn))
+            if not single:
+                canvas.create_text(self.MARGIN - 2, y + height / 2, text=f"C{k}",
+                                   font=("Arial", 7), anchor="e")
+
+        # Timeline
+        bottom = self.BAR_Y + (len(self.lanes) - 1) * pitch + height
+        if not (single and detailed):
+            self._draw_ticks(t0, t1, bottom)
+        y = bottom + 25
+        canvas.create_line(self._x(max(t0, 0)), y, self._x(min(t1, end_time)), y, width=2)
+
+        self._draw_legend(list(color_ids), width, bottom)
+        self.scrollbar.set(t0 / end_time, min(1.0, t1 / end_time))
+
+    def _lane_geometry(self):
+        """Returns (pitch, bar height) of the lanes: one full-height lane, or lanes sharing the canvas."""
+        n = len(self.lanes)
+        if n == 1:
+            return self.BAR_HEIGHT, self.BAR_HEIGHT
+        available = self.canvas.winfo_height() - self.BAR_Y - 60
+        pitch = max(self.MIN_LANE_HEIGHT, min(self.BAR_HEIGHT, available / n))
+        return pitch, max(1, pitch * 0.8)
+
+    def _draw_segments(self, timeline, colors, lo, hi, t0, t1, y, height, time_labels):
+        canvas = self.canvas
+        left, right = self._x(t0) - 2, self._x(t1) + 2
+        last_label_x = -math.inf
+        color_ids = {} # Insertion-ordered set of the pids drawn (as color ids)
+
+        for i in range(lo, hi):
+            pid, start, end = timeline[i]
+            color_id = colors[timeline.pid_id(i)]
+            color_ids[color_id] = None
+
+            x0 = self._x(start)
+            x1 = self._x(end)
+
+            # Draw Rectangle (clipped to the view so huge segments stay cheap)
+            canvas.create_rectangle(max(x0, left), y, min(x1, right), y+height,
+                                    fill=self._fills[color_id],
+                                    outline="black",
+                                    width=2 if x1 - x0 >= 6 and height >= 10 else 0)
+
+            # Draw Text (PID) if it fits
+            if x1 - x0 >= 8 * len(str(pid)) + 4 and height >= 12:
+                canvas.create_text((max(x0, left) + min(x1, right)) / 2, y+height/2,
+                                   text=pid,
+                                   font=("Arial", 10, "bold"))
+
+            # Draw Time Markers at start, when there is room
+            if time_labels and x0 >= left and x0 - last_label_x >= self.LABEL_GAP:
+                canvas.create_text(x0, y+height+15,
+                                   text=str(start),
+                                   font=("Arial", 8))
+                last_label_x = x0
+
+        # Final time marker of the last visible segment
+        if time_labels and hi > lo:
+            end = timeline[hi - 1][2]
+            x_end = self._x(end)
+            if x_end <= right and x_end - last_label_x >= self.LABEL_GAP / 2:
+                canvas.create_text(x_end, y+height+15, text=str(end), font=("Arial", 8))
+        return color_ids
+
+    def _draw_bands(self, timeline, colors, t0, t1, width, y, height):
+        canvas = self.canvas
+        bottom = y + height
+        bin_time = self.BIN_PX / self.scale
+        color_ids = {} # Insertion-ordered set of the pids drawn (as color ids)
+
+        for k in range(int(width // self.BIN_PX) + 1):
+            a = t0 + k * bin_time
+            if a >= t1:
+                break
+            b = a + bin_time
+            busy = timeline.busy_time(a, b)
+            if busy <= 0:
+                continue
+
+            # Color by whoever runs in the middle of the slice (or the first segment in it)
+            i = timeline.segment_at((a + b) / 2)
+            if i < 0:
+                i = timeline.visible_range(a, b)[0]
+            color_id = colors[timeline.pid_id(i)]
+            color_ids[color_id] = None
+
+            x0 = self._x(a)
+            canvas.create_rectangle(x0, bottom - height * min(1.0, busy / bin_time),
+                                    x0 + self.BIN_PX, bottom,
+                                    fill=self._fills[color_id], width=0)
+        return color_ids
+
+    def _draw_ticks(self, t0, t1, bottom):
+        # 1, 2 or 5 x 10^k time units, about every 80 pixels
+        raw = 80 / self.scale
+        magnitude = 10 ** math.floor(math.log10(raw)) if raw >= 1 else 1
+        step = next((m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw), 10 * magnitude)
+
+        t = math.ceil(t0 / step) * step
+        while t <= t1:
+            x = self._x(t)
+            self.canvas.create_line(x, bottom + 20, x, bottom + 25)
+            self.canvas.create_text(x, bottom + 15, text=str(t), font=("Arial", 8))
+            t += step
+
+    def _draw_legend(self, color_ids, width, bottom):
+        legend_y = bottom + 40
+        max_items = max(1, int(width // 80))
+        for i, color_id in enumerate(color_ids[:max_items]):
+            x_pos = self.MARGIN + (i * 80)
+            self.canvas.create_rectangle(x_pos, legend_y, x_pos+20, legend_y+15,
+                                         fill=self._fills[color_id], outline="black")
+            self.canvas.create_text(x_pos+30, legend_y+7,
+                                    text=self._names[color_id],
+                                    font=("Arial", 9),
+                                    anchor="w")
+
+    # --- Helpers ---
+
+    def _x(self, time):
+        return self.MARGIN + (time - self.offset) * self.scale
+
+    def _view_width(self):
+        return max(100, self.canvas.winfo_width() - 2 * self.MARGIN)
+
+    def _fit_scale(self):
+        return min(self.DEFAULT_SCALE, self._view_width() / max(1, self.end_time))
+
+    def _on_drag_start(self, event):
+        self._drag_x = event.x
+
+    def _on_drag(self, event):
+        if self._drag_x is None or not self.end_time:
+            return
+        self.offset -= (event.x - self._drag_x) / self.scale
+        self._drag_x = event.x
+        self.request_redraw()
+
+    def _on_wheel(self, event, direction, zoom):
+        if zoom:
+            self.zoom(1.25 if direction > 0 else 0.8, anchor_x=event.x)
+        else:
+            self.on_scroll("scroll", -direction, "units")
@@ -0,0 +1,269 @@
+"""
+Seeded synthetic workloads, generated lazily.
+
+    python generator.py 1000000 -o trace.wkb                     # Poisson arrivals, exponential bursts
+    python generator.py 100000 --arrivals bursty --bursts pareto --priorities 0:1,1:3,2:6 -o trace.csv
+    python generator.py 50000000 --simulate RR                   # stream into an engine, nothing stored
+
+Jobs are produced in chunks as they are consumed, so a trace of any size
+can be written to CSV or the binary format, or streamed through the
+incremental schedulers in online.py, with only one chunk in memory.
+"""
+import argparse
+import bisect
+import csv
+import math
+import random
+import sys
+import time
+from process import Process
+
+
+ARRIVAL_PROCESSES = ("poisson", "bursty")
+BURST_DISTRIBUTIONS = ("exponential", "pareto", "bimodal", "uniform")
+
+CHUNK_SIZE = 65_536
+
+
+def parse_priority_mix(text):
+    """
+    Parses a priority mix into [(priority, weight)].
+    Accepts a single priority ("0") or weighted classes ("0:1,1:3,2:6":
+    10% priority 0, 30% priority 1, 60% priority 2).
+    """
+    mix = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        priority, _, weight = part.partition(":")
+        try:
+            mix.append((int(priority), float(weight) if weight else 1.0))
+        except ValueError:
+            raise ValueError(f"Invalid priority class '{part}', expected PRIORITY or PRIORITY:WEIGHT") from None
+    if not mix or any(weight <= 0 for _, weight in mix):
+        raise ValueError(f"Invalid priority mix '{text}': need at least one class, all weights positive")
+    return mix
+
+
+class WorkloadGenerator:
+    """
+    A reproducible synthetic workload of 'n' jobs, generated on demand.
+    arrivals:   "poisson" (exponential gaps), or "bursty": clusters of
+                'burstiness' jobs on average, arriving close together, with
+                longer gaps between clusters and the same overall rate
+    load:       offered load, mean burst / mean inter-arrival gap (above 1
+                the ready queue keeps growing)
+    bursts:     "exponential", "pareto" (heavy-tailed, 'pareto_shape' > 1),
+                "bimodal" (90% short jobs, 10% long ones) or "uniform",
+                all with mean about 'mean_burst' and at least 1
+    priorities: priority mix, see parse_priority_mix
+    Arrivals, bursts and priorities come from separate generators seeded
+    with 'seed', so changing the burst distribution keeps the same
+    arrival times. Iterating again gives the same jobs.
+    """
+
+    def __init__(self, n, seed=0, arrivals="poisson", load=0.9, burstiness=10, bursts="exponential",
+                 mean_burst=10, pareto_shape=1.5, priorities="0"):
+        if n < 0:
+            raise ValueError("Job count must not be negative")
+        if arrivals not in ARRIVAL_PROCESSES:
+            raise ValueError(f"Unknown arrival process '{arrivals}', expected one of {', '.join(ARRIVAL_PROCESSES)}")
+        if bursts not in BURST_DISTRIBUTIONS:
+            raise ValueError(f"Unknown burst distribution '{bursts}', expected one of {', '.join(BURST_DISTRIBUTIONS)}")
+        if load <= 0 or mean_burst < 1 or burstiness < 1:
+            raise ValueError("load must be positive, mean_burst and burstiness at least 1")
+        if bursts == "pareto" and pareto_shape <= 1:
+            raise ValueError("pareto_shape must be above 1 (the mean is infinite otherwise)")
+
+        self.n = n
+        self.seed = seed
+        self.arrivals = arrivals
+        self.load = load
+        self.burstiness = burstiness
+        self.bursts = bursts
+        self.mean_burst = mean_burst
+        self.pareto_shape = pareto_shape
+        self.priorities = priorities if isinstance(priorities, list) else parse_priority_mix(str(priorities))
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        """Yields fresh Process objects in arrival order."""
+        for pids, arrivals, bursts, priorities in self.chunks():
+            yield from map(Process, pids, arrivals, bursts, priorities)
+
+    def chunks(self, size=CHUNK_SIZE):
+        """Yields (pids, arrival times, burst times, priorities) column lists of up to 'size' jobs."""
+        next_gap = self._gap_sampler(random.Random(f"{self.seed}-arrivals"))
+        next_burst = self._burst_sampler(random.Random(f"{self.seed}-bursts"))
+        next_priority = self._priority_sampler(random.Random(f"{self.seed}-priorities"))
+
+        clock = 0.0
+        for first in range(0, self.n, size):
+            count = min(size, self.n - first)
+            arrivals = []
+            for _ in range(count):
+                clock += next_gap()
+                arrivals.append(int(clock))
+            yield ([f"P{i}" for i in range(first + 1, first + count + 1)], arrivals,
+                   [next_burst() for _ in range(count)], [next_priority() for _ in range(count)])
+
+    def to_workload(self):
+        """Materializes the jobs as a Workload (for sizes that fit in memory)."""
+        from workload import Workload
+        pids, arrivals, bursts, priorities = [], [], [], []
+        for chunk in self.chunks():
+            for column, values in zip((pids, arrivals, bursts, priorities), chunk):
+                column.extend(values)
+        return Workload(pids, arrivals, bursts, priorities)
+
+    def _gap_sampler(self, rng):
+        mean_gap = self.mean_burst / self.load
+        if self.arrivals == "poisson":
+            return lambda: rng.expovariate(1 / mean_gap)
+
+        # Bursty: geometric cluster sizes with mean B, jobs in a cluster 1/B of
+        # the mean gap apart; the gap before each cluster makes up the rest
+        size = self.burstiness
+        inner = mean_gap / size
+        outer = size * mean_gap - (size - 1) * inner
+        keep = 1 - 1 / size # Chance the next job joins the current cluster
+        def gap():
+            if rng.random() < keep:
+                return rng.expovariate(1 / inner)
+            return rng.expovariate(1 / outer)
+        return gap
+
+    def _burst_sampler(self, rng):
+        mean = self.mean_burst
+        if self.bursts == "exponential":
+            return lambda: max(1, round(rng.expovariate(1 / mean)))
+        if self.bursts == "pareto":
+            shape = self.pareto_shape
+            scale = mean * (shape - 1) / shape # Pareto with this minimum has the requested mean
+            return lambda: max(1, round(scale * rng.paretovariate(shape)))
+        if self.bursts == "bimodal":
+            # Short interactive jobs (0.1-0.5 x mean) and long batch jobs (5.3-9.3 x mean)
+            return lambda: max(1, round(mean * (rng.uniform(0.1, 0.5) if rng.random() < 0.9
+                                                else rng.uniform(5.3, 9.3))))
+        high = max(1, 2 * round(mean) - 1)
+        return lambda: rng.randint(1, high)
+
+    def _priority_sampler(self, rng):
+        if len(self.priorities) == 1:
+            priority = self.priorities[0][0]
+            return lambda: priority
+        classes = [priority for priority, _ in self.priorities]
+        cumulative = []
+        total = 0.0
+        for _, weight in self.priorities:
+            total += weight
+            cumulative.append(total)
+        return lambda: classes[min(bisect.bisect_right(cumulative, rng.random() * total), len(classes) - 1)]
+
+    def __repr__(self):
+        return (f"WorkloadGenerator({self.n} jobs, {self.arrivals} arrivals at load {self.load}, "
+                f"{self.bursts} bursts, seed {self.seed})")
+
+
+def write_csv(generator, filename):
+    """Writes the generated jobs as a workload CSV, one chunk at a time. Returns the job count."""
+    from workload import CSV_COLUMNS
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_COLUMNS)
+        for chunk in generator.chunks():
+            writer.writerows(zip(*chunk))
+    return len(generator)
+
+
+def write_binary(generator, filename):
+    """Writes the generated jobs in the binary workload format, one chunk at a time. Returns the job count."""
+    from workload import save_columns
+    save_columns(generator.chunks(), len(generator), filename)
+    return len(generator)
+
+
+def simulate(generator, algorithm, quantum=2, aging_interval=20, priority_aging=0, metrics=None):
+    """
+    Streams the generated jobs through the incremental scheduler for
+    'algorithm'. Each job is dropped once it completes, so memory stays
+    flat however many jobs there are. Returns (metrics, makespan).
+    """
+    from metrics import MetricsAggregator, PriorityMetrics
+    from online import COMPLETED, make_scheduler, stream
+    from scheduler import PRIORITY_ALGORITHMS
+    if metrics is None:
+        metrics = PriorityMetrics() if algorithm in PRIORITY_ALGORITHMS else MetricsAggregator()
+    scheduler = make_scheduler(algorithm, quantum=quantum, aging_interval=aging_interval,
+                               priority_aging=priority_aging, metrics=metrics)
+    makespan = 0
+    for kind, event in stream(scheduler, generator):
+        if kind == COMPLETED:
+            makespan = max(makespan, event.completion_time)
+    return metrics, makespan
+
+
+def main(argv=None):
+    from compare import RESULT_NAMES
+    parser = argparse.ArgumentParser(description="Generate a synthetic workload, and write it or simulate it")
+    parser.add_argument("jobs", type=int, help="Number of jobs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--arrivals", choices=ARRIVAL_PROCESSES, default="poisson")
+    parser.add_argument("--load", type=float, default=0.9,
+                        help="Offered load, mean burst / mean inter-arrival gap (default: 0.9)")
+    parser.add_argument("--burstiness", type=float, default=10,
+                        help="Mean cluster size of bursty arrivals (default: 10)")
+    parser.add_argument("--bursts", choices=BURST_DISTRIBUTIONS, default="exponential")
+    parser.add_argument("--mean-burst", type=float, default=10)
+    parser.add_argument("--pareto-shape", type=float, default=1.5)
+    parser.add_argument("--priorities", default="0",
+                        help="Priority mix, e.g. 0 or 0:1,1:3,2:6 (priority:weight)")
+    parser.add_argument("-o", "--output", metavar="FILE",
+                        help="Write the workload: .csv for CSV, anything else for the binary format")
+    parser.add_argument("--simulate", metavar="ALGORITHM", type=str.upper, choices=list(RESULT_NAMES.values()),
+                        help="Stream the workload through this algorithm: " + ", ".join(RESULT_NAMES.values()))
+    parser.add_argument("--quantum", type=int, default=2)
+    parser.add_argument("--aging-interval", type=int, default=20)
+    parser.add_argument("--priority-aging", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        generator = WorkloadGenerator(args.jobs, seed=args.seed, arrivals=args.arrivals, load=args.load,
+                                      burstiness=args.burstiness, bursts=args.bursts,
+                                      mean_burst=args.mean_burst, pareto_shape=args.pareto_shape,
+                                      priorities=args.priorities)
+    except ValueError as e:
+        parser.error(str(e))
+    if not (args.output or args.simulate):
+        parser.error("nothing to do: give --output and/or --simulate")
+
+    if args.output:
+        start = time.perf_counter()
+        write = write_csv if args.output.lower().endswith(".csv") else write_binary
+        count = write(generator, args.output)
+        print(f"Wrote {count} jobs to {args.output} in {time.perf_counter() - start:.2f}s")
+
+    if args.simulate:
+        algorithm = {short: name for name, short in RESULT_NAMES.items()}[args.simulate]
+        print(f"--- Streaming {generator} through {algorithm} ---")
+        start = time.perf_counter()
+        metrics, makespan = simulate(generator, algorithm, quantum=args.quantum,
+                                     aging_interval=args.aging_interval, priority_aging=args.priority_aging)
+        elapsed = time.perf_counter() - start
+        print(f"{metrics.count} jobs, makespan {makespan}, {elapsed:.2f}s "
+              f"({metrics.count / elapsed if elapsed else math.inf:,.0f} jobs/s)")
+        print("\t\tWait\tTurnaround\tResponse")
+        for label, wait, turnaround, response in metrics.stats():
+            print(f"{label + ':':<8}\t{wait:.2f}\t{turnaround:.2f}\t\t{response:.2f}")
+        if hasattr(metrics, "class_stats"):
+            print("\nPriority\tCount\tAvg Wait\tP95 Wait\tAvg Response\tP95 Response")
+            for priority, count, *values in metrics.class_stats():
+                print(f"{priority}\t\t{count}\t" + "\t\t".join(f"{value:.2f}" for value in values))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
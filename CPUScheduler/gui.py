@@ -1,8 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from process import Process
-from scheduler import solve_fcfs, solve_sjf, solve_srt, solve_rr, solve_mlfq
+from workload import Workload, load_workload
+from sweep import SWEEP_COLUMNS, parse_values, run_sweep
+from metrics import MetricsAggregator, PriorityMetrics
+from result_cache import ResultCache, cached_run
+from scheduler import ALGORITHMS, PRIORITY_ALGORITHMS
+from smp import GLOBAL, QUEUE_MODES
+from worker import SimulationTask, SimulationCancelled
+from profiler import Profiler
+from overhead import SwitchCost, cpu_efficiency
+from gantt_view import GanttView
+from table_view import AttributeColumn, VirtualTable
 import csv
+from itertools import chain
 
 class CPUSchedulerGUI:
     def __init__(self, root):
@@ -10,8 +21,23 @@ class CPUSchedulerGUI:
         self.root.title("CPU Scheduling Simulator")
         self.root.geometry("1100x800")
         
-        # Store processes
-        self.process_list = []
+        # Input: the loaded CSV/binary workload, read in place (never copied into
+        # Process objects on the Tk thread), plus the manually added processes
+        self.csv_workload = None
+        self.manual_processes = []
+        
+        # Results of previous runs, so re-displaying or exporting is instant
+        self.result_cache = ResultCache()
+        
+        # Simulation or sweep running in the background (None when idle)
+        self.sim_task = None
+        self.sim_algo = None
+        self.sim_status = None  # Progress text of sim_task, for the status bar
+        self.sim_finish = None  # Shows sim_task's result, called on the Tk thread
+        self.sim_profiler = None
+        
+        # (algorithm, processes, gantt_data, metrics) of the last finished run, for export
+        self.last_run = None
         
         # --- UI LAYOUT ---
         
@@ -22,8 +48,8 @@ class CPUSchedulerGUI:
         # Algorithm Selection
         tk.Label(control_frame, text="Algorithm:").grid(row=0, column=0, padx=5)
         self.algo_var = tk.StringVar()
-        self.algo_combo = ttk.Combobox(control_frame, textvariable=self.algo_var, state="readonly")
-        self.algo_combo['values'] = ("FCFS", "SJF (Non-Preemptive)", "SRT (Preemptive)", "Round Robin", "MLFQ")
+        self.algo_combo = ttk.Combobox(control_frame, textvariable=self.algo_var, state="readonly", width=24)
+        self.algo_combo['values'] = ALGORITHMS
         self.algo_combo.current(0)
         self.algo_combo.grid(row=0, column=1, padx=5)
         
@@ -40,8 +66,9 @@ class CPUSchedulerGUI:
         self.aging_entry.grid(row=0, column=5, padx=5)
         
         # Run Button
-        tk.Button(control_frame, text="Run Simulation", command=self.run_simulation, 
-                 bg="#4CAF50", fg="white", font=("Arial", 10, "bold")).grid(row=0, column=6, padx=10)
+        self.run_button = tk.Button(control_frame, text="Run Simulation", command=self.run_simulation, 
+                                    bg="#4CAF50", fg="white", font=("Arial", 10, "bold"))
+        self.run_button.grid(row=0, column=6, padx=10)
         
         # Export Button
         tk.Button(control_frame, text="Export Results", command=self.export_results,
@@ -50,10 +77,67 @@ class CPUSchedulerGUI:
         # Reset Button
         tk.Button(control_frame, text="Reset", command=self.reset_data, 
                  bg="#f44336", fg="white").grid(row=0, column=8, padx=10)
+        
+        # Sweep Button (Quantum / Aging entries accept ranges like 1:20 or 1,2,4,8)
+        self.sweep_button = tk.Button(control_frame, text="Parameter Sweep", command=self.run_parameter_sweep,
+                                      bg="#9C27B0", fg="white")
+        self.sweep_button.grid(row=1, column=6, padx=10, pady=(5, 0))
+        
+        # Simulation timeout in seconds (empty = no limit)
+        tk.Label(control_frame, text="Timeout (s):").grid(row=1, column=0, padx=5, pady=(5, 0))
+        self.timeout_entry = tk.Entry(control_frame, width=5)
+        self.timeout_entry.insert(0, "60")
+        self.timeout_entry.grid(row=1, column=1, padx=5, pady=(5, 0), sticky="w")
+        
+        # Multi-core: number of CPUs, and one shared run queue or one per core
+        tk.Label(control_frame, text="Cores:").grid(row=1, column=2, padx=5, pady=(5, 0))
+        self.cores_entry = tk.Entry(control_frame, width=5)
+        self.cores_entry.insert(0, "1")
+        self.cores_entry.grid(row=1, column=3, padx=5, pady=(5, 0))
+        
+        tk.Label(control_frame, text="Run Queues:").grid(row=1, column=4, padx=5, pady=(5, 0))
+        self.queues_var = tk.StringVar(value=GLOBAL)
+        ttk.Combobox(control_frame, textvariable=self.queues_var, values=QUEUE_MODES,
+                     state="readonly", width=8).grid(row=1, column=5, padx=5, pady=(5, 0))
+        
+        # Profiling (counters and timings in the Profile tab; memory tracing slows the run down)
+        profile_frame = tk.Frame(control_frame)
+        profile_frame.grid(row=1, column=8, padx=5, pady=(5, 0), sticky="w")
+        self.profile_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(profile_frame, text="Profile", variable=self.profile_var).pack(side="left")
+        self.trace_memory_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(profile_frame, text="Trace memory", variable=self.trace_memory_var).pack(side="left")
+        
+        # Aging interval of the Priority algorithms (0 = no aging, like main.py's --priority-aging)
+        priority_aging_frame = tk.Frame(control_frame)
+        priority_aging_frame.grid(row=0, column=9, padx=5, sticky="w")
+        tk.Label(priority_aging_frame, text="Priority Aging:").pack(side="left")
+        self.priority_aging_entry = tk.Entry(priority_aging_frame, width=5)
+        self.priority_aging_entry.insert(0, "0")
+        self.priority_aging_entry.pack(side="left")
+        
+        # Context-switch overhead: a whole number, or uniform:LOW:HIGH / exp:MEAN / normal:MEAN:STDDEV
+        switch_frame = tk.Frame(control_frame)
+        switch_frame.grid(row=1, column=9, padx=5, pady=(5, 0), sticky="w")
+        tk.Label(switch_frame, text="Switch Cost:").pack(side="left")
+        self.switch_cost_entry = tk.Entry(switch_frame, width=10)
+        self.switch_cost_entry.insert(0, "0")
+        self.switch_cost_entry.pack(side="left")
+        
+        # Cancel Button (only active while a simulation runs)
+        self.cancel_button = tk.Button(control_frame, text="Cancel", command=self.cancel_simulation,
+                                       bg="#ff9800", fg="white", state="disabled")
+        self.cancel_button.grid(row=1, column=7, padx=10, pady=(5, 0))
+        
+        # Progress / status line
+        self.status_var = tk.StringVar(value="Ready")
+        tk.Label(control_frame, textvariable=self.status_var, anchor="w").grid(
+            row=2, column=0, columnspan=9, sticky="w", padx=5, pady=(5, 0))
 
         # 2. Tabbed Interface for Input Methods
         input_notebook = ttk.Notebook(root)
         input_notebook.pack(fill="both", expand=True, padx=10, pady=5)
+        self.input_notebook = input_notebook
         
         # Tab 1: CSV Import
         csv_tab = ttk.Frame(input_notebook)
@@ -70,17 +154,10 @@ class CPUSchedulerGUI:
         csv_display_frame = tk.LabelFrame(csv_tab, text="Loaded CSV Data")
         csv_display_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
+        # Only the visible rows are materialized, so large workloads stay responsive
         columns = ("PID", "Arrival", "Burst", "Priority")
-        self.csv_tree = ttk.Treeview(csv_display_frame, columns=columns, show="headings", height=10)
-        for col in columns:
-            self.csv_tree.heading(col, text=col)
-            self.csv_tree.column(col, width=80, anchor="center")
-        
-        csv_scroll = ttk.Scrollbar(csv_display_frame, orient="vertical", command=self.csv_tree.yview)
-        self.csv_tree.configure(yscrollcommand=csv_scroll.set)
-        
-        self.csv_tree.pack(side="left", fill="both", expand=True)
-        csv_scroll.pack(side="right", fill="y")
+        self.csv_table = VirtualTable(csv_display_frame, columns, height=10)
+        self.csv_table.frame.pack(fill="both", expand=True)
         
         # Tab 2: Manual Input
         manual_tab = ttk.Frame(input_notebook)
@@ -134,59 +211,57 @@ class CPUSchedulerGUI:
         tk.Button(example_frame, text="Load Example Processes", 
                  command=self.load_manual_example).pack(side="left")
         
+        # Tab 3: Profile of the last profiled run
+        self.profile_tab = ttk.Frame(input_notebook)
+        input_notebook.add(self.profile_tab, text="Profile")
+        self.profile_table = VirtualTable(self.profile_tab, ("Measure", "Value"), height=10)
+        self.profile_table.frame.pack(fill="both", expand=True, padx=10, pady=5)
+        
         # 3. Results Section
         results_frame = tk.LabelFrame(root, text="Simulation Results")
         results_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
         # Results Tree
         res_columns = ("PID", "Start", "Finish", "Wait", "Turnaround", "Response")
-        self.result_tree = ttk.Treeview(results_frame, columns=res_columns, show="headings", height=8)
-        for col in res_columns:
-            self.result_tree.heading(col, text=col)
-            self.result_tree.column(col, width=80, anchor="center")
-        
-        result_scroll = ttk.Scrollbar(results_frame, orient="vertical", command=self.result_tree.yview)
-        self.result_tree.configure(yscrollcommand=result_scroll.set)
-        
-        self.result_tree.pack(side="left", fill="both", expand=True)
-        result_scroll.pack(side="right", fill="y")
+        self.result_table = VirtualTable(results_frame, res_columns, height=8)
+        self.result_table.frame.pack(fill="both", expand=True)
+        self.result_table.tree.tag_configure('avg', background='#e6f3ff', font=('Arial', 10, 'bold'))
         
         # 4. Gantt Chart Area (Bottom)
         gantt_frame = tk.LabelFrame(root, text="Gantt Chart Visualization")
         gantt_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
+        # Zoom controls (Ctrl+Wheel also zooms, Wheel or drag pans)
+        zoom_frame = tk.Frame(gantt_frame)
+        zoom_frame.pack(fill="x", padx=5)
+        tk.Button(zoom_frame, text="Zoom In", command=lambda: self.gantt_view.zoom(2)).pack(side="left", padx=2)
+        tk.Button(zoom_frame, text="Zoom Out", command=lambda: self.gantt_view.zoom(0.5)).pack(side="left", padx=2)
+        tk.Button(zoom_frame, text="Fit", command=lambda: self.gantt_view.fit()).pack(side="left", padx=2)
+        
         self.canvas = tk.Canvas(gantt_frame, bg="white", height=120)
         self.canvas.pack(fill="both", expand=True, padx=5, pady=5)
         
-        # Scrollbar for Gantt
-        self.gantt_scroll = tk.Scrollbar(gantt_frame, orient="horizontal", command=self.canvas.xview)
+        # Scrollbar for Gantt (driven by the view, which only draws the visible window)
+        self.gantt_scroll = tk.Scrollbar(gantt_frame, orient="horizontal")
         self.gantt_scroll.pack(fill="x")
-        self.canvas.configure(xscrollcommand=self.gantt_scroll.set)
+        self.gantt_view = GanttView(self.canvas, self.gantt_scroll)
 
     def load_csv(self):
         filename = filedialog.askopenfilename(
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv"), ("Binary workloads", "*.wkb"), ("All files", "*.*")]
         )
         if not filename:
             return
             
-        self.process_list = []
-        # Clear existing
-        for item in self.csv_tree.get_children():
-            self.csv_tree.delete(item)
-            
         try:
-            with open(filename, 'r') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    p = Process(row['pid'], int(row['arrival_time']), 
-                               int(row['burst_time']), int(row['priority']))
-                    self.process_list.append(p)
-                    self.csv_tree.insert("", "end", values=(p.pid, p.arrival_time, 
-                                                          p.burst_time, p.priority))
-            messagebox.showinfo("Success", f"Loaded {len(self.process_list)} processes from CSV")
+            # Parsed once per file version; reloading an unchanged file hits the cache
+            workload = load_workload(filename)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load CSV: {e}")
+            return
+        
+        self.show_csv_workload(workload)
+        messagebox.showinfo("Success", f"Loaded {len(workload)} processes from CSV")
 
     def load_example(self):
         # Create example CSV content
@@ -197,17 +272,17 @@ class CPUSchedulerGUI:
             ["P4", 3, 6, 0]
         ]
         
-        self.process_list = []
-        for item in self.csv_tree.get_children():
-            self.csv_tree.delete(item)
-            
-        for data in example_data:
-            p = Process(data[0], data[1], data[2], data[3])
-            self.process_list.append(p)
-            self.csv_tree.insert("", "end", values=(p.pid, p.arrival_time, 
-                                                  p.burst_time, p.priority))
+        processes = [Process(data[0], data[1], data[2], data[3]) for data in example_data]
+        self.show_csv_workload(Workload.from_processes(processes))
         messagebox.showinfo("Example Loaded", "Loaded example CSV data with 4 processes")
 
+    def show_csv_workload(self, workload):
+        # The table reads straight from the workload's columns; Process objects
+        # are only built by the simulation run, in the background
+        self.csv_workload = workload
+        self.csv_table.set_data([workload.pids, workload.arrival_times,
+                                 workload.burst_times, workload.priorities])
+
     def add_manual_process(self):
         try:
             pid = self.pid_entry.get().strip()
@@ -220,13 +295,13 @@ class CPUSchedulerGUI:
                 return
                 
             # Check for duplicate PID
-            for p in self.process_list:
-                if p.pid == pid:
-                    messagebox.showwarning("Warning", f"PID '{pid}' already exists!")
-                    return
+            if any(p.pid == pid for p in self.manual_processes) or (
+                    self.csv_workload is not None and pid in self.csv_workload.pids):
+                messagebox.showwarning("Warning", f"PID '{pid}' already exists!")
+                return
             
             p = Process(pid, arrival, burst, priority)
-            self.process_list.append(p)
+            self.manual_processes.append(p)
             
             # Add to manual tree
             self.manual_tree.insert("", "end", values=(pid, arrival, burst, priority))
@@ -251,15 +326,8 @@ class CPUSchedulerGUI:
         for item in self.manual_tree.get_children():
             self.manual_tree.delete(item)
         
-        # Remove manual processes from process_list
-        # We'll keep a separate list or use tags next time, but for simplicity:
-        # Rebuild process_list from CSV tree only
-        temp_list = []
-        for item in self.csv_tree.get_children():
-            values = self.csv_tree.item(item)['values']
-            p = Process(values[0], values[1], values[2], values[3])
-            temp_list.append(p)
-        self.process_list = temp_list
+        # Remove the manual processes, keeping the CSV ones
+        self.manual_processes = []
         
         messagebox.showinfo("Cleared", "Manual input cleared!")
 
@@ -274,178 +342,272 @@ class CPUSchedulerGUI:
         # Clear existing manual input first
         for item in self.manual_tree.get_children():
             self.manual_tree.delete(item)
+        self.manual_processes = []
         
         for proc in example_processes:
             self.manual_tree.insert("", "end", values=tuple(proc))
             p = Process(proc[0], proc[1], proc[2], proc[3])
-            self.process_list.append(p)
+            self.manual_processes.append(p)
         
         messagebox.showinfo("Example Loaded", "Loaded 4 example processes to manual input")
 
     def reset_data(self):
-        self.process_list = []
-        for tree in [self.csv_tree, self.manual_tree, self.result_tree]:
-            for item in tree.get_children():
-                tree.delete(item)
-        self.canvas.delete("all")
+        self.csv_workload = None
+        self.manual_processes = []
+        for item in self.manual_tree.get_children():
+            self.manual_tree.delete(item)
+        self.csv_table.clear()
+        self.result_table.clear()
+        self.profile_table.clear()
+        self.gantt_view.clear()
+        self.last_run = None
         messagebox.showinfo("Reset", "All data has been reset!")
 
     def run_simulation(self):
-        if not self.process_list:
+        if self.sim_task is not None:
+            messagebox.showwarning("Warning", "A simulation is already running.")
+            return
+        if not self.has_input():
             messagebox.showwarning("Warning", "No processes loaded! Add processes via CSV or Manual Input.")
             return
             
         # Get Algorithm
         algo = self.algo_var.get()
         
-        # CREATE DEEP COPY of list to avoid modifying original input data
-        sim_processes = []
-        for p in self.process_list:
-            sim_processes.append(Process(p.pid, p.arrival_time, p.burst_time, p.priority))
-            
-        result_procs = []
-        gantt_data = []
-        
+        # Read every input on the Tk thread; the worker must not touch widgets
         try:
-            if algo == "FCFS":
-                result_procs, gantt_data = solve_fcfs(sim_processes)
-            elif algo == "SJF (Non-Preemptive)":
-                result_procs, gantt_data = solve_sjf(sim_processes)
-            elif algo == "SRT (Preemptive)":
-                result_procs, gantt_data = solve_srt(sim_processes)
-            elif algo == "Round Robin":
-                q = int(self.quantum_entry.get())
-                result_procs, gantt_data = solve_rr(sim_processes, q)
-            elif algo == "MLFQ":
-                aging = int(self.aging_entry.get())
-                result_procs, gantt_data = solve_mlfq(sim_processes, aging_interval=aging)
-                
-            self.display_results(result_procs)
-            self.draw_gantt_chart(gantt_data)
-            
-            # Show summary
-            avg_wait = sum(p.waiting_time for p in result_procs) / len(result_procs)
-            avg_turn = sum(p.turnaround_time for p in result_procs) / len(result_procs)
-            messagebox.showinfo("Simulation Complete", 
-                              f"Algorithm: {algo}\n"
-                              f"Processes: {len(result_procs)}\n"
-                              f"Avg Wait Time: {avg_wait:.2f}\n"
-                              f"Avg Turnaround Time: {avg_turn:.2f}")
-            
+            params = self.read_parameters(algo)
+            cpus = self.read_cpus()
+            trace_memory = self.trace_memory_var.get()
+            profiler = Profiler(trace_memory) if self.profile_var.get() or trace_memory else None
+            timeout_text = self.timeout_entry.get().strip()
+            timeout = float(timeout_text) if timeout_text else None
         except ValueError as e:
             messagebox.showerror("Input Error", f"Please check your input values: {e}")
-        except Exception as e:
-            messagebox.showerror("Simulation Error", str(e))
+            return
+        
+        # Only the inputs are captured here; the worker builds the workload from them
+        csv_workload, manual = self.csv_workload, list(self.manual_processes)
+        total = (len(csv_workload) if csv_workload is not None else 0) + len(manual)
+        
+        def simulate(progress):
+            workload = self.input_workload(csv_workload, manual)
+            if profiler is None:
+                return cached_run(self.result_cache, workload, algo, progress=progress, **params, **cpus)
+            with profiler:
+                return cached_run(self.result_cache, workload, algo, progress=progress, profiler=profiler,
+                                  **params, **cpus)
+        
+        self.sim_profiler = profiler
+        self.start_task(SimulationTask(simulate, timeout=timeout), algo, self.show_simulation,
+                        lambda task: f"simulated time {task.sim_time}, {task.completed}/{total} jobs completed")
 
-    def display_results(self, processes):
-        # Clear previous results
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
-            
-        # Calculate averages
-        total_wait = sum(p.waiting_time for p in processes)
-        total_turn = sum(p.turnaround_time for p in processes)
-        total_response = sum(p.response_time for p in processes)
-        count = len(processes)
-        
-        avg_wait = total_wait / count if count > 0 else 0
-        avg_turn = total_turn / count if count > 0 else 0
-        avg_response = total_response / count if count > 0 else 0
-        
-        # Insert process results
-        for p in processes:
-            self.result_tree.insert("", "end", values=(
-                p.pid, p.start_time, p.completion_time, 
-                p.waiting_time, p.turnaround_time, p.response_time
-            ))
-            
-        # Insert Average row with different background
-        self.result_tree.insert("", "end", values=(
-            "AVG", "", "", 
-            f"{avg_wait:.2f}", f"{avg_turn:.2f}", f"{avg_response:.2f}"
-        ), tags=('avg',))
+    def start_task(self, task, label, finish, status):
+        """
+        Starts 'task' (a SimulationTask) and polls it from the Tk thread.
+        'status(task)' describes its progress; 'finish(task)' shows its result.
+        """
+        self.sim_task = task
+        self.sim_algo = label
+        self.sim_finish = finish
+        self.sim_status = status
+        task.start()
+        
+        self.run_button.config(state="disabled")
+        self.sweep_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.status_var.set(f"Running {label}...")
+        self.root.after(100, self.poll_simulation)
+
+    def cancel_simulation(self):
+        if self.sim_task is not None:
+            self.sim_task.cancel()
+            self.status_var.set("Cancelling...")
+
+    def poll_simulation(self):
+        task = self.sim_task
+        if task is None:
+            return
         
-        self.result_tree.tag_configure('avg', background='#e6f3ff', font=('Arial', 10, 'bold'))
+        if not task.done:
+            self.status_var.set(f"Running {self.sim_algo}: {self.sim_status(task)}, {task.elapsed:.1f}s elapsed")
+            self.root.after(100, self.poll_simulation)
+            return
+        
+        # Finished: back on the Tk thread, so it is safe to update the widgets
+        self.sim_task = None
+        self.run_button.config(state="normal")
+        self.sweep_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        
+        if isinstance(task.error, SimulationCancelled):
+            self.status_var.set(f"{self.sim_algo}: {task.error}")
+            messagebox.showwarning("Simulation Stopped", str(task.error))
+            return
+        if task.error is not None:
+            self.status_var.set(f"{self.sim_algo}: failed")
+            messagebox.showerror("Simulation Error", str(task.error))
+            return
+        self.sim_finish(task)
 
-    def draw_gantt_chart(self, gantt_data):
-        self.canvas.delete("all")
+    def show_simulation(self, task):
+        result_procs, gantt_data, metrics, cached = task.result
+        self.last_run = (self.sim_algo, result_procs, gantt_data, metrics)
+        efficiency, _ = cpu_efficiency(gantt_data)
+        self.status_var.set(f"{self.sim_algo}: {metrics.count} jobs in {task.elapsed:.2f}s, "
+                            f"CPU efficiency {efficiency:.2%}" + (" (cached)" if cached else ""))
+        self.display_results(result_procs, metrics)
+        self.draw_gantt_chart(gantt_data)
+        if self.sim_profiler is not None:
+            self.display_profile(self.sim_profiler)
+        
+        # Show summary
+        messagebox.showinfo("Simulation Complete", 
+                          f"Algorithm: {self.sim_algo}\n"
+                          f"Processes: {metrics.count}\n"
+                          f"Avg Wait Time: {metrics.wait.mean:.2f} (P95 {metrics.wait.percentile(95):.2f})\n"
+                          f"Avg Turnaround Time: {metrics.turnaround.mean:.2f} "
+                          f"(P95 {metrics.turnaround.percentile(95):.2f})\n"
+                          f"CPU Efficiency: {efficiency:.2%}"
+                          + "".join(f"\nPriority {priority}: {count} jobs, Avg Wait {wait:.2f}, "
+                                    f"Avg Response {response:.2f}"
+                                    for priority, count, wait, _, response, _ in self.class_stats(metrics)))
+
+    def has_input(self):
+        return bool(self.manual_processes) or (self.csv_workload is not None and len(self.csv_workload) > 0)
+
+    @staticmethod
+    def input_workload(csv_workload, manual):
+        """
+        The workload to simulate: the loaded one itself when there is no
+        manual input (so a mapped binary file stays mapped and its digest is
+        computed once), otherwise its columns with the manual processes appended.
+        Called by the background tasks, since the copy is O(jobs).
+        """
+        if csv_workload is None:
+            return Workload.from_processes(manual)
+        if not manual:
+            return csv_workload
+        return Workload(chain(csv_workload.pids, (p.pid for p in manual)),
+                        chain(csv_workload.arrival_times, (p.arrival_time for p in manual)),
+                        chain(csv_workload.burst_times, (p.burst_time for p in manual)),
+                        chain(csv_workload.priorities, (p.priority for p in manual)))
+
+    def read_parameters(self, algo):
+        """
+        Returns the quantum and aging intervals from the entries as keyword
+        arguments for cached_run, defaults for algorithms that ignore them.
+        """
+        quantum = int(self.quantum_entry.get()) if algo == "Round Robin" else 2
+        aging = int(self.aging_entry.get()) if algo == "MLFQ" else 20
+        priority_aging = int(self.priority_aging_entry.get()) if algo in PRIORITY_ALGORITHMS else 0
+        if priority_aging < 0:
+            raise ValueError("aging interval must not be negative")
+        return {"quantum": quantum, "aging_interval": aging, "priority_aging": priority_aging}
+
+    @staticmethod
+    def class_stats(metrics):
+        """Per-priority-class rows of a Priority run, [] for the other algorithms."""
+        return metrics.class_stats() if isinstance(metrics, PriorityMetrics) else []
+
+    def read_cpus(self):
+        """Returns the cores / run queue / switch cost settings as keyword arguments for cached_run."""
+        cores = int(self.cores_entry.get())
+        if cores < 1:
+            raise ValueError("need at least one core")
+        return {"cores": cores, "queues": self.queues_var.get(),
+                "switch_cost": SwitchCost(self.switch_cost_entry.get())}
+
+    def run_parameter_sweep(self):
+        if self.sim_task is not None:
+            messagebox.showwarning("Warning", "A simulation is already running.")
+            return
+        if not self.has_input():
+            messagebox.showwarning("Warning", "No processes loaded! Add processes via CSV or Manual Input.")
+            return
         
-        if not gantt_data:
-            self.canvas.create_text(300, 60, text="No Gantt chart data available", 
-                                   font=("Arial", 12), fill="gray")
+        algo = self.algo_var.get()
+        try:
+            if algo == "Round Robin":
+                param_name = "Quantum"
+                values = parse_values(self.quantum_entry.get())
+            elif algo == "MLFQ":
+                param_name = "Aging Interval"
+                values = parse_values(self.aging_entry.get())
+            else:
+                messagebox.showwarning("Warning", "Parameter sweeps are available for Round Robin and MLFQ only.")
+                return
+            if any(v <= 0 for v in values):
+                raise ValueError("sweep values must be positive")
+            switch_cost = SwitchCost(self.switch_cost_entry.get())
+            timeout_text = self.timeout_entry.get().strip()
+            timeout = float(timeout_text) if timeout_text else None
+        except ValueError as e:
+            messagebox.showerror("Input Error", f"Please check your sweep values: {e}")
             return
         
-        start_x = 20
-        y = 30
-        height = 40
-        scale = 40  # pixels per time unit
+        csv_workload, manual = self.csv_workload, list(self.manual_processes)
         
-        # Color palette for PIDs
-        colors = ["#ff9999", "#99ccff", "#99ff99", "#ffff99", "#ffcc99", 
-                 "#cc99ff", "#ff99cc", "#99ffcc", "#ccff99", "#ffccff"]
-        pid_color_map = {}
+        def sweep(progress):
+            workload = self.input_workload(csv_workload, manual)
+            # One step per finished run; cancelling drops the runs not started yet
+            return run_sweep(workload, algo, values, switch_cost=switch_cost, progress=task.step)
         
-        max_time = 0
+        task = SimulationTask(sweep, timeout=timeout)
+        self.start_task(task, f"{algo} {param_name} Sweep",
+                        lambda task: self.show_sweep(task, algo, param_name),
+                        lambda task: f"{task.completed}/{len(values)} runs done")
+
+    def show_sweep(self, task, algo, param_name):
+        # Show the table in its own window
+        window = tk.Toplevel(self.root)
+        window.title(f"{algo} {param_name} Sweep")
+        self.status_var.set(f"{algo} {param_name} Sweep: {len(task.result)} runs in {task.elapsed:.2f}s")
+        
+        columns = (param_name,) + SWEEP_COLUMNS[1:]
+        tree = ttk.Treeview(window, columns=columns, show="headings", height=15)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=110, anchor="center")
         
-        # Draw process blocks
-        for pid, start, end in gantt_data:
-            duration = end - start
-            width = duration * scale
-            
-            x0 = start_x + (start * scale)
-            x1 = x0 + width
-            
-            # Assign color
-            if pid not in pid_color_map:
-                color_idx = len(pid_color_map) % len(colors)
-                pid_color_map[pid] = colors[color_idx]
-            
-            # Draw Rectangle
-            self.canvas.create_rectangle(x0, y, x1, y+height, 
-                                       fill=pid_color_map[pid], 
-                                       outline="black", 
-                                       width=2)
-            
-            # Draw Text (PID)
-            self.canvas.create_text((x0+x1)/2, y+height/2, 
-                                  text=pid, 
-                                  font=("Arial", 10, "bold"))
-            
-            # Draw Time Markers at start
-            self.canvas.create_text(x0, y+height+15, 
-                                  text=str(start), 
-                                  font=("Arial", 8))
-            
-            max_time = max(max_time, end)
-        
-        # Final time marker
-        self.canvas.create_text(start_x + (max_time * scale), y+height+15, 
-                              text=str(max_time), 
-                              font=("Arial", 8))
-        
-        # Draw timeline
-        self.canvas.create_line(start_x, y+height+25, 
-                              start_x + (max_time * scale), y+height+25, 
-                              width=2)
-        
-        # Legend
-        legend_x = start_x
-        legend_y = y + height + 40
-        for i, (pid, color) in enumerate(pid_color_map.items()):
-            x_pos = legend_x + (i * 80)
-            self.canvas.create_rectangle(x_pos, legend_y, x_pos+20, legend_y+15, 
-                                       fill=color, outline="black")
-            self.canvas.create_text(x_pos+30, legend_y+7, 
-                                  text=pid, 
-                                  font=("Arial", 9), 
-                                  anchor="w")
-        
-        # Update scroll region
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        sweep_scroll = ttk.Scrollbar(window, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=sweep_scroll.set)
+        
+        for value, avg_wait, avg_turn, avg_response in task.result:
+            tree.insert("", "end", values=(value, f"{avg_wait:.2f}", f"{avg_turn:.2f}", f"{avg_response:.2f}"))
+        
+        tree.pack(side="left", fill="both", expand=True)
+        sweep_scroll.pack(side="right", fill="y")
+
+    def display_results(self, processes, metrics=None):
+        if metrics is None:
+            metrics = MetricsAggregator.from_processes(processes)
+        
+        # Process results are read from the process objects as rows scroll into view
+        columns = [AttributeColumn(processes, name) for name in
+                   ("pid", "start_time", "completion_time", "waiting_time", "turnaround_time", "response_time")]
+        
+        # Summary rows (AVG, percentiles, max, stddev) come from the aggregator, shown last
+        footer = [("AVG" if label == "Average" else label, "", "",
+                   f"{wait:.2f}", f"{turnaround:.2f}", f"{response:.2f}")
+                  for label, wait, turnaround, response in metrics.stats()]
+        # Priority runs: average wait / response of each priority class
+        footer += [(f"Prio {priority} ({count})", "", "", f"{wait:.2f}", "", f"{response:.2f}")
+                   for priority, count, wait, _, response, _ in self.class_stats(metrics)]
+        
+        self.result_table.set_data(columns, footer)
+
+    def display_profile(self, profiler):
+        rows = profiler.rows()
+        self.profile_table.set_data([[name for name, _ in rows], [value for _, value in rows]])
+        self.input_notebook.select(self.profile_tab)
+
+    def draw_gantt_chart(self, gantt_data):
+        self.gantt_view.set_data(gantt_data)
 
     def export_results(self):
-        if not self.process_list:
-            messagebox.showwarning("Warning", "No results to export!")
+        if self.last_run is None:
+            messagebox.showwarning("Warning", "No results to export! Run a simulation first.")
             return
             
         filename = filedialog.asksaveasfilename(
@@ -455,24 +617,8 @@ class CPUSchedulerGUI:
         
         if filename:
             try:
-                # Re-run simulation to get fresh results
-                algo = self.algo_var.get()
-                sim_processes = []
-                for p in self.process_list:
-                    sim_processes.append(Process(p.pid, p.arrival_time, p.burst_time, p.priority))
-                
-                if algo == "FCFS":
-                    result_procs, _ = solve_fcfs(sim_processes)
-                elif algo == "SJF (Non-Preemptive)":
-                    result_procs, _ = solve_sjf(sim_processes)
-                elif algo == "SRT (Preemptive)":
-                    result_procs, _ = solve_srt(sim_processes)
-                elif algo == "Round Robin":
-                    q = int(self.quantum_entry.get())
-                    result_procs, _ = solve_rr(sim_processes, q)
-                elif algo == "MLFQ":
-                    aging = int(self.aging_entry.get())
-                    result_procs, _ = solve_mlfq(sim_processes, aging_interval=aging)
+                # The results on screen: the last finished run, never re-simulated here
+                algo, result_procs, gantt_data, metrics = self.last_run
                 
                 with open(filename, 'w', newline='') as file:
                     writer = csv.writer(file)
@@ -492,14 +638,21 @@ class CPUSchedulerGUI:
                             p.waiting_time, p.turnaround_time, p.response_time
                         ])
                     
-                    # Write averages
+                    # Write averages, percentiles, max and stddev
                     writer.writerow([])
-                    avg_wait = sum(p.waiting_time for p in result_procs) / len(result_procs)
-                    avg_turn = sum(p.turnaround_time for p in result_procs) / len(result_procs)
-                    avg_response = sum(p.response_time for p in result_procs) / len(result_procs)
+                    for label, wait, turnaround, response in metrics.stats():
+                        writer.writerow(["Averages" if label == "Average" else label, "", "", "", "", "", 
+                                       f"{wait:.2f}", f"{turnaround:.2f}", f"{response:.2f}"])
+                    efficiency, overhead = cpu_efficiency(gantt_data)
+                    writer.writerow(["CPU Efficiency", f"{efficiency:.2%}", "Overhead", overhead])
                     
-                    writer.writerow(["Averages", "", "", "", "", "", 
-                                   f"{avg_wait:.2f}", f"{avg_turn:.2f}", f"{avg_response:.2f}"])
+                    # Per-priority-class statistics (Priority algorithms only)
+                    class_rows = self.class_stats(metrics)
+                    if class_rows:
+                        writer.writerow([])
+                        writer.writerow(["Priority", "Count", "Avg Wait", "P95 Wait", "Avg Response", "P95 Response"])
+                        writer.writerows((priority, count) + tuple(f"{value:.2f}" for value in values)
+                                         for priority, count, *values in class_rows)
                 
                 messagebox.showinfo("Success", f"Results exported to {filename}")
                 
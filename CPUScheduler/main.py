@@ -1,175 +1,326 @@
-import csv
+import argparse
 import os
-from process import Process
-from scheduler import solve_fcfs, solve_sjf, solve_srt, solve_rr, solve_mlfq
+import shutil
+import sys
+import time
+from timeline import Timeline, as_lanes
+from workload import load_workload, WorkloadFormatError
+from metrics import MetricsAggregator, PriorityMetrics
+from result_cache import ResultCache, cached_run
 from visualizer import plot_gantt_chart
+from sweep import parse_values, run_sweep
+from profiler import Profiler
+from overhead import OVERHEAD_PID, SwitchCost, cpu_efficiency
+from compare import RESULT_NAMES, comparison_rows, run_comparison, write_comparison_csv, write_results_csv
+from smp import GLOBAL, QUEUE_MODES
 
-def load_processes(filename):
-    processes = []
-    try:
-        with open(filename, 'r') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                p = Process(
-                    pid=row['pid'],
-                    arrival_time=int(row['arrival_time']),
-                    burst_time=int(row['burst_time']),
-                    priority=int(row['priority'])
-                )
-                processes.append(p)
-        print(f"Successfully loaded {len(processes)} processes from {filename}")
-        return processes
-    except FileNotFoundError:
-        print(f"Error: The file '{filename}' was not found.")
-        return []
-    except ValueError:
-        print("Error: Invalid data format in CSV. Ensure numbers are integers.")
-        return []
+def print_gantt_chart(gantt_data, width=None, title="Gantt Chart"):
+    """
+    Prints the Gantt chart, scaled to fit 'width' columns (default: the terminal width).
+    Charts that fit are drawn at 2 characters per time unit, with labels cut
+    to their cell and context switches drawn as '.'; longer ones are scaled
+    down, and runs of segments too short to get a column of their own are
+    merged into one '.' cell. The output is built in memory and written once.
+    """
+    timeline = gantt_data if isinstance(gantt_data, Timeline) else Timeline(gantt_data)
+    if width is None:
+        width = shutil.get_terminal_size().columns
+    width = max(width, 10)
     
-def print_gantt_chart(gantt_data):
-    print("\n--- Gantt Chart ---")
-    # gantt_data is a list of tuples: (PID, Start, End)
+    lines = ["", f"--- {title} ---"]
+    n = len(timeline)
+    if n == 0:
+        sys.stdout.write("\n".join(lines + ["(no segments)", "", ""]))
+        return
     
-    # Top border
-    print(" ", end="")
-    for entry in gantt_data:
-        pid, start, end = entry
-        duration = end - start
-        print("-" * duration * 2 + " ", end="") 
-    print()
+    # Cells of (width, label, end time); idle gaps are not drawn, like before
+    cells = []
+    total = timeline.busy_through(n - 1)
+    scale = None
+    has_overhead = False
+    if 1 + 2 * total + n <= width:
+        for pid, start, end in timeline:
+            cell_width = 2 * (end - start)
+            if pid == OVERHEAD_PID:
+                has_overhead = True
+                cells.append((cell_width, "." * cell_width, end))
+            else:
+                cells.append((cell_width, str(pid)[:cell_width], end))
+    else:
+        # Each cell ends at a segment boundary and is at least 3 columns wide
+        scale = (width - 1) / total
+        firsts = [] # First segment of each cell
+        col, first = 0, 0
+        while first < n:
+            i = timeline.busy_index((col + 3.5) / scale)
+            if i >= n:
+                # No room left for another cell: the last one takes the rest
+                cell_width, _, _ = cells.pop()
+                col -= cell_width + 1
+                first = firsts.pop()
+                i = n - 1
+            next_col = int(timeline.busy_through(i) * scale + 0.5)
+            cell_width = next_col - col - 1
+            pid = str(timeline[i][0])
+            label = pid if i == first and len(pid) <= cell_width else "." * cell_width
+            cells.append((cell_width, label, timeline[i][2]))
+            firsts.append(first)
+            col, first = next_col, i + 1
     
-    # PID Row
-    print("|", end="")
-    for entry in gantt_data:
-        pid, start, end = entry
-        duration = end - start
-        # Center the PID in the block
-        fmt = f"{{:^{duration*2}}}"
-        print(fmt.format(pid) + "|", end="")
-    print()
+    # Top border, PID row, bottom border
+    border = " " + "".join("-" * w + " " for w, _, _ in cells)
+    lines.append(border)
+    lines.append("|" + "".join(f"{label:^{w}}|" for w, label, _ in cells))
+    lines.append(border)
     
-    # Bottom border
-    print(" ", end="")
-    for entry in gantt_data:
-        pid, start, end = entry
-        duration = end - start
-        print("-" * duration * 2 + " ", end="")
-    print()
+    # Timeline: each end time is right-aligned before its cell boundary, if it fits
+    parts = ["0"]
+    length = 1
+    boundary = 0
+    for w, _, end in cells:
+        boundary += w + 1
+        text = str(end)
+        if boundary - len(text) > length:
+            parts.append(" " * (boundary - len(text) - length) + text)
+            length = boundary
+    lines.append("".join(parts))
+    
+    if scale is not None:
+        lines.append(f"(scaled to {width} columns, 1 column = {1 / scale:.3g} time units, "
+                     f"'.' = segments too short to label)")
+    elif has_overhead:
+        lines.append("('.' = context switch)")
+    sys.stdout.write("\n".join(lines) + "\n\n")
+
+def print_results(processes, gantt, metrics=None, gantt_width=None):
+    if metrics is None:
+        metrics = MetricsAggregator.from_processes(processes)
     
-    # Timeline
-    print("0", end="")
-    for entry in gantt_data:
-        pid, start, end = entry
-        duration = end - start
-        fmt = f"{{:>{duration*2}}}"
-        print(fmt.format(end) + " ", end="") 
-    print("\n")
-
-def print_results(processes, gantt):
     print("\nPID\tArrival\tBurst\tFinish\tWait\tTurnaround\tResponse")
     print("-" * 65)
     
-    total_wait = 0
-    total_turnaround = 0
-    total_response = 0
-    
     for p in processes:
         print(f"{p.pid}\t{p.arrival_time}\t{p.burst_time}\t{p.completion_time}\t"
               f"{p.waiting_time}\t{p.turnaround_time}\t\t{p.response_time}")
         
-        total_wait += p.waiting_time
-        total_turnaround += p.turnaround_time
-        total_response += p.response_time
-        
-    n = len(processes)
     print("-" * 65)
-    print(f"Averages:\t\t\t{total_wait/n:.2f}\t{total_turnaround/n:.2f}\t\t{total_response/n:.2f}")
-    print_gantt_chart(gantt)
+    for label, wait, turnaround, response in metrics.stats():
+        label = "Averages" if label == "Average" else label
+        print(f"{label + ':':<8}\t\t\t{wait:.2f}\t{turnaround:.2f}\t\t{response:.2f}")
+    efficiency, overhead = cpu_efficiency(gantt)
+    if overhead:
+        print(f"CPU efficiency: {efficiency:.2%} ({overhead} time units spent switching)")
+    if isinstance(metrics, PriorityMetrics):
+        print_class_stats(metrics)
+    lanes = as_lanes(gantt)
+    if len(lanes) == 1:
+        print_gantt_chart(lanes[0], gantt_width)
+    else:
+        for core, lane in enumerate(lanes):
+            print_gantt_chart(lane, gantt_width, title=f"Gantt Chart: Core {core}")
+
+def print_class_stats(metrics):
+    print("\nPriority\tCount\tAvg Wait\tP95 Wait\tAvg Response\tP95 Response")
+    print("-" * 80)
+    for priority, count, wait, wait_p95, response, response_p95 in metrics.class_stats():
+        print(f"{priority}\t\t{count}\t{wait:.2f}\t\t{wait_p95:.2f}\t\t{response:.2f}\t\t{response_p95:.2f}")
 
-def export_to_csv(filename, processes, algorithm_name):
+def export_to_csv(filename, processes, algorithm_name, metrics=None, efficiency=None):
     """
     Saves the processing metrics to a CSV file.
     """
     try:
-        with open(filename, 'w', newline='') as file:
-            writer = csv.writer(file)
-            
-            # Write Header
-            writer.writerow(["Algorithm", algorithm_name])
-            writer.writerow([]) # Empty line
-            writer.writerow(["PID", "Arrival", "Burst", "Finish", "Wait", "Turnaround", "Response"])
-            
-            # Write Data
-            total_wait = 0
-            total_turnaround = 0
-            total_response = 0
-            n = len(processes)
-            
-            for p in processes:
-                writer.writerow([
-                    p.pid, 
-                    p.arrival_time, 
-                    p.burst_time, 
-                    p.completion_time, 
-                    p.waiting_time, 
-                    p.turnaround_time, 
-                    p.response_time
-                ])
-                total_wait += p.waiting_time
-                total_turnaround += p.turnaround_time
-                total_response += p.response_time
-            
-            writer.writerow([])
-            writer.writerow(["Averages", "", "", "", 
-                             f"{total_wait/n:.2f}", 
-                             f"{total_turnaround/n:.2f}", 
-                             f"{total_response/n:.2f}"])
-            
+        write_results_csv(filename, processes, algorithm_name, metrics, efficiency)
         print(f"Results exported to '{filename}'")
     except Exception as e:
         print(f"Error exporting to CSV: {e}")
 
+def run_cached(cache, workload, algorithm, profile=False, trace_memory=False, **params):
+    if not (profile or trace_memory):
+        processes, gantt, metrics, cached = cached_run(cache, workload, algorithm, **params)
+        if cached:
+            print(f"--- {algorithm}: input unchanged, using cached results ---")
+        return processes, gantt, metrics
+    
+    # Profiled runs always simulate, so the counters describe a real run
+    with Profiler(trace_memory=trace_memory) as profiler:
+        processes, gantt, metrics, _ = cached_run(cache, workload, algorithm, profiler=profiler, **params)
+    print(profiler.format_report(algorithm))
+    return processes, gantt, metrics
+
+def print_sweep_table(results, param_name):
+    print(f"\n{param_name}\tAvg Wait\tAvg Turnaround\tAvg Response")
+    print("-" * 65)
+    for value, avg_wait, avg_turn, avg_response in results:
+        print(f"{value}\t\t{avg_wait:.2f}\t\t{avg_turn:.2f}\t\t{avg_response:.2f}")
+
+def print_comparison_table(results):
+    rows = comparison_rows(results)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths)))
+             for row in rows]
+    lines.insert(1, "-" * len(lines[0]))
+    print("\n".join(lines))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CPU Scheduling Simulator")
+    parser.add_argument("--input", default="input.csv",
+                        help="Workload CSV, or a binary workload made with 'python workload.py' (default: input.csv)")
+    parser.add_argument("--sweep-quantum", metavar="VALUES",
+                        help="Sweep the Round Robin quantum, e.g. 1:20 or 1,2,4,8")
+    parser.add_argument("--sweep-aging", metavar="VALUES",
+                        help="Sweep the MLFQ aging interval, e.g. 5:100:5")
+    parser.add_argument("--algorithm", action="append", type=str.upper, metavar="NAME",
+                        choices=list(RESULT_NAMES.values()),
+                        help="Run only this algorithm (repeatable): " + ", ".join(RESULT_NAMES.values()))
+    parser.add_argument("--priority-aging", type=int, default=0, metavar="INTERVAL",
+                        help="Priority algorithms: every INTERVAL time units each waiting process "
+                             "moves up one priority level (default: 0, no aging)")
+    parser.add_argument("--compare", action="store_true",
+                        help="Run all algorithms at once in worker processes and write one result file "
+                             "per algorithm plus comparison_summary.csv")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for sweeps and --compare (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-run the simulations instead of reusing cached results")
+    parser.add_argument("--gantt-width", type=int, metavar="COLUMNS",
+                        help="Width of the text Gantt charts (default: terminal width)")
+    parser.add_argument("--cores", type=int, default=1,
+                        help="Number of CPUs to schedule on (default: 1)")
+    parser.add_argument("--queues", choices=QUEUE_MODES, default=GLOBAL,
+                        help="With --cores > 1: one shared run queue, or one per core with load balancing (default: global)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print counters (events, queue operations, context switches, preemptions, ...) "
+                             "and phase timings for every run")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Like --profile, and also report the tracemalloc peak (slower)")
+    parser.add_argument("--switch-cost", metavar="SPEC", default="0",
+                        help="Time charged for each context switch: a whole number, uniform:LOW:HIGH, "
+                             "exp:MEAN or normal:MEAN:STDDEV (default: 0)")
+    parser.add_argument("--switch-seed", type=int, default=0,
+                        help="Seed for random switch costs (default: 0)")
+    parser.add_argument("--plot", metavar="FILE",
+                        help="Save the Gantt chart (MLFQ, or the last --algorithm) to FILE (.png, .svg or .pdf) "
+                             "instead of opening a window")
+    args = parser.parse_args()
+    if args.cores < 1:
+        parser.error("--cores must be at least 1")
+    if args.priority_aging < 0:
+        parser.error("--priority-aging must not be negative")
+    try:
+        args.switch_cost = SwitchCost(args.switch_cost, seed=args.switch_seed)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
 if __name__ == "__main__":
-    process_list = load_processes("input.csv")
+    args = parse_args()
+    
+    # Parsed once; every algorithm gets its own fresh processes from the workload
+    try:
+        workload = load_workload(args.input)
+        print(f"Successfully loaded {len(workload)} processes from {args.input}")
+    except (FileNotFoundError, WorkloadFormatError) as e:
+        print(f"Error: {e}")
+        workload = None
 
     output_dir = "output_results"
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    if process_list:
+    if workload and (args.sweep_quantum or args.sweep_aging):
+        # Sweep mode: one table per swept parameter instead of the full run
+        if args.sweep_quantum:
+            print("\n" + "="*30)
+            print("--- Round Robin Quantum Sweep ---")
+            print_sweep_table(run_sweep(workload, "Round Robin", parse_values(args.sweep_quantum),
+                                        args.workers, args.switch_cost), "Quantum")
+        if args.sweep_aging:
+            print("\n" + "="*30)
+            print("--- MLFQ Aging Interval Sweep ---")
+            print_sweep_table(run_sweep(workload, "MLFQ", parse_values(args.sweep_aging),
+                                        args.workers, args.switch_cost), "Aging")
+    
+    elif workload and args.compare:
+        # Every engine at once, each in its own worker over the same shared workload
+        print("\n" + "="*30)
+        print("--- Comparing all algorithms ---")
+        start = time.perf_counter()
+        results = run_comparison(workload, output_dir=output_dir, workers=args.workers,
+                                 cache_dir=None if args.no_cache else os.path.join(output_dir, ".cache"),
+                                 cores=args.cores, queues=args.queues, switch_cost=args.switch_cost,
+                                 priority_aging=args.priority_aging,
+                                 profile=args.profile, trace_memory=args.profile_memory)
+        elapsed = time.perf_counter() - start
+        print_comparison_table(results)
+        
+        summary_file = os.path.join(output_dir, "comparison_summary.csv")
+        write_comparison_csv(summary_file, results)
+        print(f"\nResults written to '{output_dir}' (one file per algorithm, summary in '{summary_file}')")
+        print(f"Wall time {elapsed:.2f}s, sum of engine times {sum(r[4] for r in results):.2f}s")
+    
+    elif workload and args.algorithm:
+        # Only the algorithms asked for, each exported to results_<name>.csv; the last one is plotted
+        cache = None if args.no_cache else ResultCache(disk_dir=os.path.join(output_dir, ".cache"))
+        run_options = {"cores": args.cores, "queues": args.queues, "switch_cost": args.switch_cost,
+                       "profile": args.profile, "trace_memory": args.profile_memory}
+        names = {short: name for name, short in RESULT_NAMES.items()}
+        for short in args.algorithm:
+            print("\n" + "="*30)
+            result, gantt, metrics = run_cached(cache, workload, names[short], quantum=2, aging_interval=20,
+                                                priority_aging=args.priority_aging, **run_options)
+            print_results(result, gantt, metrics, args.gantt_width)
+            export_to_csv(f"{output_dir}/results_{short}.csv", result, names[short], metrics,
+                          cpu_efficiency(gantt))
+        
+        if args.plot:
+            plot_gantt_chart(gantt, output=args.plot)
+            print(f"\nGantt chart saved to {args.plot}")
+        else:
+            print("\nLaunching Matplotlib Visualization...")
+            plot_gantt_chart(gantt)
+    
+    elif workload:
+        # Results are cached on disk by (input, algorithm, parameters),
+        # so re-running over an unchanged input skips the simulations
+        cache = None if args.no_cache else ResultCache(disk_dir=os.path.join(output_dir, ".cache"))
+        run_options = {"cores": args.cores, "queues": args.queues, "switch_cost": args.switch_cost,
+                       "profile": args.profile, "trace_memory": args.profile_memory}
+        
         # Run FCFS
         print("\n" + "="*30)
-        fcfs_result, fcfs_gantt = solve_fcfs(process_list[:])
+        fcfs_result, fcfs_gantt, fcfs_metrics = run_cached(cache, workload, "FCFS", **run_options)
         
-        print_results(fcfs_result, fcfs_gantt)
+        print_results(fcfs_result, fcfs_gantt, fcfs_metrics, args.gantt_width)
 
         # Run SJF
         print("\n" + "="*30)
-        process_list_sjf = load_processes("input.csv") 
-        sjf_result, sjf_gantt = solve_sjf(process_list_sjf)
-        print_results(sjf_result, sjf_gantt)
+        sjf_result, sjf_gantt, sjf_metrics = run_cached(cache, workload, "SJF (Non-Preemptive)", **run_options)
+        print_results(sjf_result, sjf_gantt, sjf_metrics, args.gantt_width)
 
         # Run SRT
         print("\n" + "="*30)
-        process_list_srt = load_processes("input.csv") 
-        srt_result, srt_gantt = solve_srt(process_list_srt)
-        print_results(srt_result, srt_gantt)
+        srt_result, srt_gantt, srt_metrics = run_cached(cache, workload, "SRT (Preemptive)", **run_options)
+        print_results(srt_result, srt_gantt, srt_metrics, args.gantt_width)
 
         # Run RR
         print("\n" + "="*30)
-        process_list_rr = load_processes("input.csv") 
         # Note: The requirement says Quantum = 2 for the sample scenario
-        rr_result, rr_gantt = solve_rr(process_list_rr, quantum=2)
-        print_results(rr_result, rr_gantt)
+        rr_result, rr_gantt, rr_metrics = run_cached(cache, workload, "Round Robin", quantum=2, **run_options)
+        print_results(rr_result, rr_gantt, rr_metrics, args.gantt_width)
 
         # Run MLFQ
         print("\n" + "="*30)
         print("Running MLFQ for Visualization...")
 
-        process_list_mlfq = load_processes("input.csv") 
-        mlfq_result, mlfq_gantt = solve_mlfq(process_list_mlfq, aging_interval=20)
-        print_results(mlfq_result, mlfq_gantt)
-        export_to_csv(f"{output_dir}/results_MLFQ.csv", mlfq_result, "MLFQ")
+        mlfq_result, mlfq_gantt, mlfq_metrics = run_cached(cache, workload, "MLFQ", aging_interval=20, **run_options)
+        print_results(mlfq_result, mlfq_gantt, mlfq_metrics, args.gantt_width)
+        export_to_csv(f"{output_dir}/results_MLFQ.csv", mlfq_result, "MLFQ", mlfq_metrics,
+                      cpu_efficiency(mlfq_gantt))
 
-        print("\nLaunching Matplotlib Visualization...")
-        plot_gantt_chart(mlfq_gantt)
\ No newline at end of file
+        if args.plot:
+            plot_gantt_chart(mlfq_gantt, output=args.plot)
+            print(f"\nGantt chart saved to {args.plot}")
+        else:
+            print("\nLaunching Matplotlib Visualization...")
+            plot_gantt_chart(mlfq_gantt)
\ No newline at end of file
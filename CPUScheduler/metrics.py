@@ -0,0 +1,244 @@
+import math
+from batch import log_bucket_counts, summarize, to_list
+
+
+class QuantileSketch:
+    """
+    Fixed-memory percentile estimate over non-negative values.
+    The first 'exact_limit' values are kept as-is, so small runs get exact
+    percentiles. Past that, values go into log-spaced buckets: any quantile
+    is within 'relative_accuracy' of the true value, and memory depends only
+    on the range of values seen (a few thousand buckets at most), not on the count.
+    """
+    __slots__ = ("_gamma", "_log_gamma", "_buckets", "_zeros", "_exact", "_exact_limit", "count")
+
+    def __init__(self, relative_accuracy=0.01, exact_limit=1024):
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets = {}
+        self._zeros = 0
+        self._exact = []
+        self._exact_limit = exact_limit
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if self._exact is not None:
+            self._exact.append(value)
+            if len(self._exact) <= self._exact_limit:
+                return
+            # Too many to keep: switch over to the buckets for good
+            exact, self._exact = self._exact, None
+            for v in exact:
+                self._add_to_bucket(v)
+        else:
+            self._add_to_bucket(value)
+
+    def extend(self, values):
+        """Adds a batch of values at once (same result as add() for each)."""
+        self.count += len(values)
+        if self._exact is not None:
+            if len(self._exact) + len(values) <= self._exact_limit:
+                self._exact.extend(to_list(values))
+                return
+            exact, self._exact = self._exact, None
+            self._add_batch(exact)
+        self._add_batch(values)
+
+    def _add_batch(self, values):
+        zeros, counts = log_bucket_counts(values, self._log_gamma)
+        self._zeros += zeros
+        buckets = self._buckets
+        for i, count in counts.items():
+            buckets[i] = buckets.get(i, 0) + count
+
+    def _add_to_bucket(self, value):
+        if value <= 0:
+            self._zeros += 1
+        else:
+            i = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[i] = self._buckets.get(i, 0) + 1
+
+    def quantile(self, q):
+        if self.count == 0:
+            return 0.0
+        
+        # Nearest-rank: the smallest value with at least q of the data at or below it
+        rank = max(1, math.ceil(q * self.count))
+        if self._exact is not None:
+            return sorted(self._exact)[rank - 1]
+        
+        seen = self._zeros
+        if rank <= seen:
+            return 0.0
+        for i in sorted(self._buckets):
+            seen += self._buckets[i]
+            if seen >= rank:
+                return 2 * self._gamma ** i / (self._gamma + 1)
+        return 0.0
+
+
+class RunningStats:
+    """
+    Single-pass count, mean, stddev, min, max and percentiles of one metric.
+    add() only buffers the value; every BATCH values (or when a statistic is
+    read) the buffer is folded in with array operations, so feeding one
+    value per completed process stays cheap and memory stays bounded.
+    """
+    __slots__ = ("_count", "_mean", "_m2", "_min", "_max", "_sketch", "_pending")
+    BATCH = 4096
+
+    def __init__(self):
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = 0
+        self._max = 0
+        self._sketch = QuantileSketch()
+        self._pending = []
+
+    def add(self, value):
+        self._pending.append(value)
+        if len(self._pending) >= self.BATCH:
+            self._flush()
+
+    def extend(self, values):
+        self._flush()
+        self._merge(values)
+
+    def _flush(self):
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._merge(pending)
+
+    def _merge(self, values):
+        n, mean, m2, low, high = summarize(values)
+        if n == 0:
+            return
+        if self._count == 0:
+            self._min, self._max = low, high
+        else:
+            self._min = min(self._min, low)
+            self._max = max(self._max, high)
+        
+        # Chan et al.'s pairwise update: combines two (count, mean, M2) summaries stably
+        total = self._count + n
+        delta = mean - self._mean
+        self._mean += delta * n / total
+        self._m2 += m2 + delta * delta * self._count * n / total
+        self._count = total
+        self._sketch.extend(values)
+
+    @property
+    def count(self):
+        return self._count + len(self._pending)
+
+    @property
+    def mean(self):
+        self._flush()
+        return self._mean
+
+    @property
+    def min(self):
+        self._flush()
+        return self._min
+
+    @property
+    def max(self):
+        self._flush()
+        return self._max
+
+    @property
+    def stddev(self):
+        self._flush()
+        return math.sqrt(self._m2 / self._count) if self._count else 0.0
+
+    def percentile(self, p):
+        # Estimates never leave the observed range, so P100 is exactly the max
+        self._flush()
+        if self._count == 0:
+            return 0.0
+        return min(max(self._sketch.quantile(p / 100), self._min), self._max)
+
+
+class MetricsAggregator:
+    """
+    Streaming wait / turnaround / response statistics for one run.
+    Engines call add() as each process completes; the CLI, GUI and CSV
+    export read the summary from here instead of re-walking the process list.
+    """
+    METRICS = ("waiting_time", "turnaround_time", "response_time")
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self):
+        self.wait = RunningStats()
+        self.turnaround = RunningStats()
+        self.response = RunningStats()
+
+    @classmethod
+    def from_processes(cls, processes):
+        metrics = cls()
+        metrics.add_columns([p.waiting_time for p in processes],
+                            [p.turnaround_time for p in processes],
+                            [p.response_time for p in processes])
+        return metrics
+
+    def add(self, process):
+        self.wait.add(process.waiting_time)
+        self.turnaround.add(process.turnaround_time)
+        self.response.add(process.response_time)
+
+    def add_columns(self, waiting, turnaround, response):
+        """Adds a whole run's worth of per-process values at once."""
+        self.wait.extend(waiting)
+        self.turnaround.extend(turnaround)
+        self.response.extend(response)
+
+    @property
+    def count(self):
+        return self.wait.count
+
+    def stats(self):
+        """Returns [(label, wait, turnaround, response)] rows for display."""
+        columns = (self.wait, self.turnaround, self.response)
+        rows = [("Average",) + tuple(s.mean for s in columns)]
+        for p in self.PERCENTILES:
+            rows.append((f"P{p}",) + tuple(s.percentile(p) for s in columns))
+        rows.append(("Max",) + tuple(s.max for s in columns))
+        rows.append(("StdDev",) + tuple(s.stddev for s in columns))
+        return rows
+
+
+class PriorityMetrics(MetricsAggregator):
+    """
+    MetricsAggregator that also keeps separate statistics for each priority
+    class (the processes' priority from the input, before any aging).
+    The Priority algorithms' runs are collected with this one.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.classes = {} # priority -> MetricsAggregator
+
+    @classmethod
+    def from_processes(cls, processes):
+        metrics = super().from_processes(processes)
+        groups = {}
+        for p in processes:
+            groups.setdefault(p.priority, []).append(p)
+        for priority, group in groups.items():
+            metrics.classes[priority] = MetricsAggregator.from_processes(group)
+        return metrics
+
+    def add(self, process):
+        super().add(process)
+        metrics = self.classes.get(process.priority)
+        if metrics is None:
+            metrics = self.classes[process.priority] = MetricsAggregator()
+        metrics.add(process)
+
+    def class_stats(self):
+        """Returns [(priority, count, avg wait, P95 wait, avg response, P95 response)] rows, highest priority first."""
+        return [(priority, m.count, m.wait.mean, m.wait.percentile(95),
+                 m.response.mean, m.response.percentile(95))
+                for priority, m in sorted(self.classes.items())]
@@ -0,0 +1,346 @@
+import heapq
+import math
+from collections import deque
+from aging_heap import AgingHeap
+
+
+# Event kinds yielded by OnlineScheduler.events()
+GANTT = "gantt"         # ("gantt", (pid, start, end))
+COMPLETED = "completed" # ("completed", process)
+
+
+class OnlineScheduler:
+    """
+    Incremental version of a solve_* engine.
+    submit() processes in arrival order, call advance_to(t) to simulate
+    everything before time t, and drain events() for finished processes and
+    Gantt segments. Every process arriving before t must be submitted before
+    advance_to(t); processes arriving at t or later can still come afterwards.
+    Finished processes are only referenced by their COMPLETED event, so once
+    the caller drains the events they can be freed.
+    Context switches are free here: switch costs (overhead.py) only apply to
+    the batch engines.
+    """
+
+    def __init__(self, metrics=None):
+        self.time = 0
+        self.metrics = metrics
+        self._pending = deque() # Submitted but not arrived yet
+        self._last_arrival = -math.inf
+        self._events = deque()
+        self._segment = None # Newest Gantt segment, held back in case the next one extends it
+        self._seq = 0        # Admission counter, used for stable tie-breaking
+
+    def submit(self, process):
+        if process.arrival_time < self.time:
+            raise ValueError(f"Process {process.pid} arrives at {process.arrival_time}, "
+                             f"but the scheduler is already at time {self.time}")
+        if process.arrival_time < self._last_arrival:
+            raise ValueError("Processes must be submitted in arrival order")
+        self._last_arrival = process.arrival_time
+        self._pending.append(process)
+
+    def advance_to(self, time):
+        """Simulates everything that happens before 'time'."""
+        if time < self.time:
+            raise ValueError(f"Cannot go back in time from {self.time} to {time}")
+
+        while self.time < time:
+            self._admit()
+            limit = time
+            if self._pending:
+                limit = min(limit, self._pending[0].arrival_time)
+
+            if not self._has_work():
+                if limit == math.inf:
+                    break # Nothing left to do
+                self.time = limit # CPU idle: jump straight to the next event
+                continue
+
+            self._run(limit)
+
+    def close(self):
+        """Runs every submitted process to completion and flushes the last Gantt segment."""
+        self.advance_to(math.inf)
+        if self._segment is not None:
+            self._events.append((GANTT, self._segment))
+            self._segment = None
+
+    def events(self):
+        """Yields (and forgets) the events produced so far."""
+        while self._events:
+            yield self._events.popleft()
+
+    def __iter__(self):
+        return self.events()
+
+    # --- Helpers for the algorithms ---
+
+    def _admit(self):
+        while self._pending and self._pending[0].arrival_time <= self.time:
+            self._arrive(self._pending.popleft())
+            self._seq += 1
+
+    def _execute(self, p, run_time):
+        """Runs p for run_time units. Returns True if it completed."""
+        if p.start_time == -1:
+            p.start_time = self.time
+
+        end = self.time + run_time
+        segment = self._segment
+        if segment is not None and segment[0] == p.pid and segment[2] == self.time:
+            self._segment = (p.pid, segment[1], end)
+        else:
+            if segment is not None:
+                self._events.append((GANTT, segment))
+            self._segment = (p.pid, self.time, end)
+
+        p.remaining_time -= run_time
+        self.time = end
+
+        if p.remaining_time == 0:
+            p.completion_time = self.time
+            p.turnaround_time = p.completion_time - p.arrival_time
+            p.waiting_time = p.turnaround_time - p.burst_time
+            p.response_time = p.start_time - p.arrival_time
+            if self.metrics is not None:
+                self.metrics.add(p)
+            self._events.append((COMPLETED, p))
+            return True
+        return False
+
+    # --- Implemented by each algorithm ---
+
+    def _arrive(self, process):
+        raise NotImplementedError
+
+    def _has_work(self):
+        raise NotImplementedError
+
+    def _run(self, limit):
+        """Makes the scheduling decision at self.time and runs until at most 'limit'."""
+        raise NotImplementedError
+
+
+class FCFSScheduler(OnlineScheduler):
+    def __init__(self, metrics=None):
+        super().__init__(metrics)
+        self._ready = deque()
+        self._running = None
+
+    def _arrive(self, process):
+        self._ready.append(process)
+
+    def _has_work(self):
+        return self._running is not None or bool(self._ready)
+
+    def _run(self, limit):
+        if self._running is None:
+            self._running = self._ready.popleft()
+        p = self._running
+        if self._execute(p, min(p.remaining_time, limit - self.time)):
+            self._running = None
+
+
+class SJFScheduler(OnlineScheduler):
+    def __init__(self, metrics=None):
+        super().__init__(metrics)
+        self._ready = [] # min-heap of (burst_time, seq, process)
+        self._running = None
+
+    def _arrive(self, process):
+        heapq.heappush(self._ready, (process.burst_time, self._seq, process))
+
+    def _has_work(self):
+        return self._running is not None or bool(self._ready)
+
+    def _run(self, limit):
+        # Non-preemptive: only pick when the CPU is free
+        if self._running is None:
+            self._running = heapq.heappop(self._ready)[2]
+        p = self._running
+        if self._execute(p, min(p.remaining_time, limit - self.time)):
+            self._running = None
+
+
+class SRTScheduler(OnlineScheduler):
+    def __init__(self, metrics=None):
+        super().__init__(metrics)
+        self._ready = [] # min-heap of (remaining_time, arrival_time, seq, process)
+
+    def _arrive(self, process):
+        heapq.heappush(self._ready, (process.remaining_time, process.arrival_time, self._seq, process))
+
+    def _has_work(self):
+        return bool(self._ready)
+
+    def _run(self, limit):
+        # Only arrivals can preempt, and the base class stops at each one
+        _, _, seq, p = heapq.heappop(self._ready)
+        if not self._execute(p, min(p.remaining_time, limit - self.time)):
+            heapq.heappush(self._ready, (p.remaining_time, p.arrival_time, seq, p))
+
+
+class RRScheduler(OnlineScheduler):
+    def __init__(self, quantum, metrics=None):
+        super().__init__(metrics)
+        self.quantum = quantum
+        self._queue = deque()
+        self._running = None
+        self._used = 0
+        # A process whose quantum just ran out. It rejoins the queue at the next
+        # decision, after anything arriving at that same instant, like solve_rr.
+        self._expired = None
+
+    def _arrive(self, process):
+        self._queue.append(process)
+
+    def _has_work(self):
+        return self._running is not None or self._expired is not None or bool(self._queue)
+
+    def _run(self, limit):
+        if self._expired is not None:
+            self._queue.append(self._expired)
+            self._expired = None
+        if self._running is None:
+            self._running = self._queue.popleft()
+            self._used = 0
+
+        p = self._running
+        run_time = min(self.quantum - self._used, p.remaining_time, limit - self.time)
+        self._used += run_time
+        if self._execute(p, run_time):
+            self._running = None
+        elif self._used >= self.quantum:
+            self._expired = p
+            self._running = None
+
+
+class MLFQScheduler(OnlineScheduler):
+    # Same 3 levels as solve_mlfq: RR(Q=2), RR(Q=4), FCFS
+    QUANTUMS = (2, 4, math.inf)
+
+    def __init__(self, aging_interval=20, metrics=None):
+        super().__init__(metrics)
+        self.aging_interval = aging_interval
+        self._queues = [deque(), deque(), deque()]
+        self._level = {} # process -> queue level, dropped on completion
+        self._running = None
+        self._slice = 0
+
+    def _arrive(self, process):
+        self._queues[0].append(process)
+        self._level[process] = 0
+
+    def _has_work(self):
+        return self._running is not None or any(self._queues)
+
+    def _run(self, limit):
+        queues = self._queues
+
+        # Aging: every 'aging_interval' units, move everyone waiting in Q1/Q2 back to Q0
+        if self.time > 0 and self.time % self.aging_interval == 0:
+            for q_idx in range(1, 3):
+                while queues[q_idx]:
+                    proc = queues[q_idx].popleft()
+                    queues[0].append(proc)
+                    self._level[proc] = 0
+
+        active = next((i for i in range(3) if queues[i]), -1)
+
+        # Preempt a lower-level process when a higher queue has work
+        p = self._running
+        if p is not None and active != -1 and self._level[p] > active:
+            queues[self._level[p]].append(p)
+            p = None
+        if p is None:
+            p = queues[active].popleft()
+            self._slice = 0
+        self._running = p
+
+        # Next time anything outside the running process can change
+        if queues[1] or queues[2]:
+            limit = min(limit, (self.time // self.aging_interval + 1) * self.aging_interval)
+
+        level = self._level[p]
+        run_time = min(p.remaining_time, self.QUANTUMS[level] - self._slice, limit - self.time)
+        self._slice += run_time
+
+        if self._execute(p, run_time):
+            del self._level[p]
+            self._running = None
+        elif self._slice >= self.QUANTUMS[level]:
+            # Demote (max level is 2)
+            next_level = min(2, level + 1)
+            self._level[p] = next_level
+            queues[next_level].append(p)
+            self._running = None
+
+
+class PriorityScheduler(OnlineScheduler):
+    """Same rules as solve_priority: lowest priority number first, optionally preemptive and aging."""
+
+    def __init__(self, preemptive=False, aging_interval=0, metrics=None):
+        super().__init__(metrics)
+        self.preemptive = preemptive
+        self.aging_interval = aging_interval
+        self._ready = AgingHeap(aging_interval) # Ties go to the earlier admission (seq)
+        self._order = {}                        # process -> seq, dropped on completion
+        self._running = None
+        self._running_priority = 0
+
+    def _arrive(self, process):
+        self._order[process] = self._seq
+        self._ready.arrive(process, process.priority, self._seq, self.time)
+
+    def _has_work(self):
+        return self._running is not None or bool(self._ready)
+
+    def _run(self, limit):
+        ready = self._ready
+
+        p = self._running
+        if p is not None and self.preemptive and ready and ready.peek(self.time)[0] < self._running_priority:
+            ready.push(p, self._running_priority, self._order[p], self.time)
+            p = None
+        if p is None:
+            self._running_priority, p = ready.pop(self.time)
+        self._running = p
+
+        # Next time aging lets a waiting process beat the running one
+        if self.preemptive and ready:
+            limit = min(limit, ready.beats_at(self._running_priority, self.time))
+
+        if self._execute(p, min(p.remaining_time, limit - self.time)):
+            del self._order[p]
+            self._running = None
+
+
+def make_scheduler(algorithm, quantum=2, aging_interval=20, priority_aging=0, metrics=None):
+    """Returns the incremental scheduler for one of scheduler.ALGORITHMS, by name."""
+    if algorithm == "FCFS":
+        return FCFSScheduler(metrics)
+    if algorithm == "SJF (Non-Preemptive)":
+        return SJFScheduler(metrics)
+    if algorithm == "SRT (Preemptive)":
+        return SRTScheduler(metrics)
+    if algorithm == "Round Robin":
+        return RRScheduler(quantum, metrics)
+    if algorithm == "MLFQ":
+        return MLFQScheduler(aging_interval, metrics)
+    if algorithm in ("Priority (Non-Preemptive)", "Priority (Preemptive)"):
+        return PriorityScheduler(algorithm == "Priority (Preemptive)", priority_aging, metrics)
+    raise ValueError(f"Unknown algorithm '{algorithm}'")
+
+
+def stream(scheduler, processes):
+    """
+    Feeds an arrival-ordered iterable of processes into 'scheduler' and
+    yields its events as they happen, so the trace never has to be in memory.
+    """
+    for p in processes:
+        scheduler.advance_to(p.arrival_time)
+        yield from scheduler.events()
+        scheduler.submit(p)
+    scheduler.close()
+    yield from scheduler.events()
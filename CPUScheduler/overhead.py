@@ -0,0 +1,103 @@
+import math
+import random
+from timeline import as_lanes
+
+
+# Pid of the context-switch segments in gantt_data
+OVERHEAD_PID = "<cs>"
+
+DISTRIBUTIONS = ("uniform", "exp", "normal")
+
+
+class SwitchCost:
+    """
+    Time a CPU spends switching to a different process, as a spec string:
+      "2"               every switch costs 2 time units
+      "uniform:1:3"     uniform integer in [1, 3]
+      "exp:2"           exponential with mean 2, rounded
+      "normal:2:0.5"    normal with mean 2 and stddev 0.5, rounded, never negative
+    Engines call sampler() once per run; draws come from a generator seeded
+    with 'seed', so a run with the same spec and seed is reproducible (and
+    can be cached). Times are whole time units, like the rest of the schedule.
+    """
+    __slots__ = ("spec", "seed", "_kind", "_args")
+
+    def __init__(self, spec="0", seed=0):
+        self.spec = str(spec).strip()
+        self.seed = seed
+        self._kind, self._args = _parse(self.spec)
+
+    @property
+    def is_zero(self):
+        return self._kind == "fixed" and self._args[0] == 0
+
+    def sampler(self):
+        """Returns a function giving the cost of the next switch."""
+        kind, args = self._kind, self._args
+        if kind == "fixed":
+            cost = args[0]
+            return lambda: cost
+        rng = random.Random(f"{self.seed}-{self.spec}")
+        if kind == "uniform":
+            low, high = args
+            return lambda: rng.randint(low, high)
+        if kind == "exp":
+            mean = args[0]
+            return lambda: round(rng.expovariate(1 / mean)) if mean > 0 else 0
+        mean, stddev = args
+        return lambda: max(0, round(rng.gauss(mean, stddev)))
+
+    def __reduce__(self):
+        return (SwitchCost, (self.spec, self.seed))
+
+    def __str__(self):
+        return self.spec if self._kind == "fixed" else f"{self.spec} (seed {self.seed})"
+
+    def __repr__(self):
+        return f"SwitchCost({self.spec!r}, seed={self.seed})"
+
+
+def _parse(spec):
+    kind, _, rest = spec.partition(":")
+    try:
+        if not rest:
+            cost = int(kind)
+            if cost < 0:
+                raise ValueError
+            return "fixed", (cost,)
+        args = tuple(float(x) for x in rest.split(":"))
+    except ValueError:
+        raise ValueError(f"Invalid switch cost '{spec}', expected a whole number or "
+                         f"{', '.join(DISTRIBUTIONS)}:<params>") from None
+
+    if kind == "uniform" and len(args) == 2 and 0 <= args[0] <= args[1]:
+        low, high = math.ceil(args[0]), math.floor(args[1])
+        if low > high:
+            raise ValueError(f"Invalid switch cost '{spec}': no whole number between {args[0]:g} and {args[1]:g}")
+        return kind, (low, high)
+    if kind == "exp" and len(args) == 1 and args[0] >= 0:
+        return kind, args
+    if kind == "normal" and len(args) == 2 and args[1] >= 0:
+        return kind, args
+    raise ValueError(f"Invalid switch cost '{spec}': use uniform:LOW:HIGH, exp:MEAN or normal:MEAN:STDDEV")
+
+
+def switch_sampler(switch_cost):
+    """The engines' entry point: a sampler, or None when switching is free."""
+    if switch_cost is None:
+        return None
+    if not isinstance(switch_cost, SwitchCost):
+        switch_cost = SwitchCost(switch_cost)
+    return None if switch_cost.is_zero else switch_cost.sampler()
+
+
+def cpu_efficiency(gantt_data):
+    """
+    Returns (efficiency, overhead time) of a schedule: the share of busy CPU
+    time spent running processes rather than switching between them.
+    """
+    busy = overhead = 0
+    for lane in as_lanes(gantt_data):
+        busy += lane.busy_time(0, lane.end_time)
+        overhead += lane.pid_time(OVERHEAD_PID)
+    return (1.0 - overhead / busy if busy else 1.0), overhead
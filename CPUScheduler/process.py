@@ -1,4 +1,9 @@
 class Process:
+    # No per-instance __dict__: keeps big runs from being dominated by dicts
+    __slots__ = ("pid", "arrival_time", "burst_time", "priority",
+                 "remaining_time", "start_time", "completion_time",
+                 "waiting_time", "turnaround_time", "response_time")
+
     def __init__(self, pid, arrival_time, burst_time, priority=0):
         self.pid = pid                   
         self.arrival_time = arrival_time 
@@ -0,0 +1,109 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from overhead import OVERHEAD_PID
+from timeline import as_lanes
+
+
+# Display names of the counters, in report order
+COUNTERS = {
+    "events": "Events processed",
+    "dispatches": "Dispatches",
+    "queue_ops": "Ready-queue operations",
+    "context_switches": "Context switches",
+    "preemptions": "Preemptions",
+    "quantum_expiries": "Quantum expiries",
+    "demotions": "MLFQ demotions",
+    "aging_boosts": "Aging boosts",
+    "steals": "Work steals",
+    "migrations": "Load-balancing migrations",
+    "simulated_time": "Simulated time units",
+    "busy_time": "Busy CPU time units",
+    "switch_time": "Switch overhead time units",
+}
+
+
+class Profiler:
+    """
+    Collects counters and phase timings for one simulation run.
+    Pass it to the engines (profiler=...) the same way as 'metrics'. The
+    engines count in local variables and report once at the end of the
+    run, so with profiler=None the hot loops do no extra work.
+    Used as a context manager it also times the whole run and, with
+    trace_memory=True, records the tracemalloc peak (tracing slows Python
+    down, so it is off by default).
+
+        with Profiler(trace_memory=True) as profiler:
+            cached_run(None, workload, "MLFQ", profiler=profiler)
+        print(profiler.format_report("MLFQ"))
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.phases = {} # phase name -> seconds, in first-entered order
+        self.wall_time = 0.0
+        self.memory_peak = None # bytes, when trace_memory is on
+        self._started = None
+        self._owns_tracing = False
+
+    def __enter__(self):
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                if hasattr(tracemalloc, "reset_peak"): # Python 3.9+
+                    tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._owns_tracing = True
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wall_time += time.perf_counter() - self._started
+        if self.trace_memory:
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+        return False
+
+    @contextmanager
+    def phase(self, name):
+        """Times the enclosed block and adds it to phase 'name'."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, **counts):
+        """Adds to the named counters (engines call this once, at the end of a run)."""
+        for name, value in counts.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_schedule(self, gantt_data):
+        """Adds the counters that can be read off the finished schedule (one lane per core)."""
+        lanes = as_lanes(gantt_data)
+        self.count(context_switches=sum(lane.context_switches(OVERHEAD_PID) for lane in lanes),
+                   busy_time=sum(lane.busy_time(0, lane.end_time) for lane in lanes),
+                   switch_time=sum(lane.pid_time(OVERHEAD_PID) for lane in lanes))
+        self.counters["simulated_time"] = max(self.counters["simulated_time"],
+                                              max(lane.end_time for lane in lanes))
+
+    def rows(self):
+        """Returns [(name, value)] rows for display: phases, counters, memory."""
+        rows = [(f"Phase: {name}", f"{seconds:.4f} s") for name, seconds in self.phases.items()]
+        if self.wall_time:
+            rows.append(("Wall time", f"{self.wall_time:.4f} s"))
+        rows.extend((label, f"{self.counters.get(name, 0):,}") for name, label in COUNTERS.items())
+        rows.extend((name, f"{value:,}") for name, value in self.counters.items() if name not in COUNTERS)
+        if self.memory_peak is not None:
+            rows.append(("Peak traced memory", f"{self.memory_peak / 2**20:.2f} MiB"))
+        return rows
+
+    def format_report(self, title=None):
+        rows = self.rows()
+        width = max(len(name) for name, _ in rows)
+        lines = [f"--- Profile{': ' + title if title else ''} ---"]
+        lines.extend(f"{name:<{width}}  {value:>14}" for name, value in rows)
+        return "\n".join(lines)
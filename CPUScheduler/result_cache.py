@@ -0,0 +1,194 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from contextlib import nullcontext, suppress
+from metrics import MetricsAggregator, PriorityMetrics
+from overhead import SwitchCost
+from scheduler import ALGORITHM_PARAMS, PRIORITY_ALGORITHMS, run_algorithm
+from smp import GLOBAL
+
+
+# Bump whenever engine output or the cached objects change, so old disk entries are ignored
+CACHE_VERSION = 4
+
+
+class ResultCache:
+    """
+    Simulation results keyed by a hash of (workload, algorithm, parameters).
+    The memory tier is an LRU of the last 'max_entries' results. If
+    'disk_dir' is given, results are also pickled there and the least
+    recently used files are deleted once the directory exceeds 'max_disk_bytes'.
+    Cached results are shared: callers must treat them as read-only.
+    """
+
+    def __init__(self, max_entries=16, disk_dir=None, max_disk_bytes=256 * 2**20):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def key(workload, algorithm, **params):
+        # Only the parameters the algorithm actually uses are part of the key
+        used = {name: params[name] for name in ALGORITHM_PARAMS.get(algorithm, ()) if name in params}
+        if params.get("cores", 1) > 1:
+            used["cores"] = params["cores"]
+            used["queues"] = params.get("queues", GLOBAL)
+        switch_cost = params.get("switch_cost")
+        if switch_cost is not None:
+            if not isinstance(switch_cost, SwitchCost):
+                switch_cost = SwitchCost(switch_cost)
+            if not switch_cost.is_zero:
+                used["switch_cost"] = str(switch_cost) # Includes the seed of random costs
+        text = f"{CACHE_VERSION}|{workload.digest()}|{algorithm}|{sorted(used.items())}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        result = self._load(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, result)
+        return result
+
+    def put(self, key, result):
+        self._remember(key, result)
+        self._store(key, result)
+
+    def clear(self):
+        self._memory.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # --- Disk tier ---
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key + ".pkl")
+
+    def _load(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                result = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Unreadable or stale entry: drop it (unless another process already did) and recompute
+            with suppress(OSError):
+                os.remove(path)
+            return None
+        try:
+            os.utime(path) # Mark as recently used for eviction
+        except FileNotFoundError:
+            pass # Evicted by another process meanwhile
+        return result
+
+    def _store(self, key, result):
+        if not self.disk_dir:
+            return
+
+        # Write to a temp file first so readers never see a half-written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        # Other processes may share the directory and evict the same files concurrently
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(".pkl"):
+                try:
+                    stat = os.stat(os.path.join(self.disk_dir, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class _ProgressMetrics:
+    """Feeds an aggregator and also reports each completed process to a callback."""
+    __slots__ = ("metrics", "callback")
+
+    def __init__(self, metrics, callback):
+        self.metrics = metrics
+        self.callback = callback
+
+    def add(self, process):
+        self.metrics.add(process)
+        self.callback(process)
+
+
+def cached_run(cache, workload, algorithm, quantum=2, aging_interval=20, progress=None,
+               cores=1, queues=GLOBAL, profiler=None, switch_cost=None, priority_aging=0):
+    """
+    Returns (processes, gantt_data, metrics, cached) for one run, simulating
+    only if the cache has no result for this workload and configuration.
+    'cache' may be None to always simulate. 'progress', if given, is called
+    with every process as it completes (an exception from it aborts the run).
+    With a 'profiler' the run is always simulated (a cache hit has nothing
+    to measure) and timed in 'prepare', 'simulate' and 'cache' phases.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key(workload, algorithm, quantum=quantum, aging_interval=aging_interval,
+                        priority_aging=priority_aging, cores=cores, queues=queues, switch_cost=switch_cost)
+        if profiler is None:
+            result = cache.get(key)
+            if result is not None:
+                return result + (True,)
+
+    # Phases are only timed when profiling
+    phase = profiler.phase if profiler is not None else (lambda name: nullcontext())
+    metrics = PriorityMetrics() if algorithm in PRIORITY_ALGORITHMS else MetricsAggregator()
+    feed = metrics if progress is None else _ProgressMetrics(metrics, progress)
+    with phase("prepare"):
+        processes = workload.to_processes()
+    with phase("simulate"):
+        processes, gantt_data = run_algorithm(algorithm, processes,
+                                              quantum=quantum, aging_interval=aging_interval,
+                                              metrics=feed, cores=cores, queues=queues,
+                                              profiler=profiler, switch_cost=switch_cost,
+                                              priority_aging=priority_aging)
+    result = (processes, gantt_data, metrics)
+    if cache is not None:
+        with phase("cache"):
+            cache.put(key, result)
+    return result + (False,)
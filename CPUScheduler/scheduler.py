@@ -1,17 +1,30 @@
+import heapq
+import math
 from collections import deque
+from timeline import Timeline
+from aging_heap import AgingHeap
+from overhead import OVERHEAD_PID, switch_sampler
+from smp import GLOBAL, solve_smp
 
 
-def solve_fcfs(processes):
+def solve_fcfs(processes, metrics=None, profiler=None, switch_cost=None):
     print("--- Running FCFS Algorithm ---")
     
     processes.sort(key=lambda p: p.arrival_time)
     
     current_time = 0
-    gantt_data = [] 
+    gantt_data = Timeline()
+    switch = switch_sampler(switch_cost)
     
     for p in processes:
         if current_time < p.arrival_time:
             current_time = p.arrival_time
+        
+        # Every job is a switch to a new process
+        if switch is not None:
+            cost = switch()
+            gantt_data.append((OVERHEAD_PID, current_time, current_time + cost))
+            current_time += cost
             
         p.start_time = current_time
         p.completion_time = current_time + p.burst_time
@@ -19,59 +32,77 @@ def solve_fcfs(processes):
         p.turnaround_time = p.completion_time - p.arrival_time
         p.waiting_time = p.turnaround_time - p.burst_time
         p.response_time = p.start_time - p.arrival_time
+        if metrics is not None:
+            metrics.add(p)
         
         gantt_data.append((p.pid, p.start_time, p.completion_time))
         
         current_time = p.completion_time
+    
+    if profiler is not None:
+        profiler.count(events=len(processes), dispatches=len(processes))
         
     return processes, gantt_data
 
 
-def solve_sjf(processes):
+def solve_sjf(processes, metrics=None, profiler=None, switch_cost=None):
     print("--- Running SJF Algorithm (Non-Preemptive) ---")
     
     n = len(processes)
     current_time = 0
-    completed = 0
-    gantt_data = []
+    gantt_data = Timeline()
+    switch = switch_sampler(switch_cost)
     
-
-    is_completed = [False] * n
+    # Walk the processes in arrival order (stable, so equal arrivals keep
+    # their input order) instead of rescanning the whole list every dispatch
+    arrival_order = sorted(range(n), key=lambda i: processes[i].arrival_time)
+    next_idx = 0
     
-    while completed < n:
-        ready_queue = []
-        for i in range(n):
-            if processes[i].arrival_time <= current_time and not is_completed[i]:
-                ready_queue.append(i) 
-        
+    # Ready queue is a min-heap of (burst_time, input index).
+    # The index breaks ties the same way min() over the input order did.
+    ready_queue = []
+    
+    for _ in range(n):
         if not ready_queue:
-            next_arrival = float('inf')
-            for p in processes:
-                if p.arrival_time > current_time:
-                    next_arrival = min(next_arrival, p.arrival_time)
-            current_time = next_arrival
-            continue
-
-        idx_to_run = min(ready_queue, key=lambda i: processes[i].burst_time)
+            # CPU idle: jump straight to the next arrival
+            current_time = max(current_time, processes[arrival_order[next_idx]].arrival_time)
+        
+        # Admit everything that has arrived by now
+        while next_idx < n and processes[arrival_order[next_idx]].arrival_time <= current_time:
+            i = arrival_order[next_idx]
+            heapq.heappush(ready_queue, (processes[i].burst_time, i))
+            next_idx += 1
+        
+        _, idx_to_run = heapq.heappop(ready_queue)
         p = processes[idx_to_run]
         
+        # Every dispatch is a switch to a new process (non-preemptive: nothing interrupts it)
+        if switch is not None:
+            cost = switch()
+            gantt_data.append((OVERHEAD_PID, current_time, current_time + cost))
+            current_time += cost
+        
         p.start_time = current_time
         p.completion_time = current_time + p.burst_time
         
         p.turnaround_time = p.completion_time - p.arrival_time
         p.waiting_time = p.turnaround_time - p.burst_time
         p.response_time = p.start_time - p.arrival_time
+        if metrics is not None:
+            metrics.add(p)
         
         gantt_data.append((p.pid, p.start_time, p.completion_time))
         
-        is_completed[idx_to_run] = True
-        completed += 1
         current_time = p.completion_time
+    
+    if profiler is not None:
+        # One push and one pop per process
+        profiler.count(events=n, dispatches=n, queue_ops=2 * n)
         
     return processes, gantt_data
 
 
-def solve_srt(processes):
+def solve_srt(processes, metrics=None, profiler=None, switch_cost=None):
     print("--- Running SRT Algorithm (Preemptive) ---")
     
     # Sort by arrival time initially to handle the queue easier visually
@@ -80,41 +111,83 @@ def solve_srt(processes):
     n = len(processes)
     current_time = 0
     completed = 0
-    gantt_data = [] # Store (PID, start, end)
+    gantt_data = Timeline() # Store (PID, start, end)
+    
+    # Ready queue is a min-heap of (remaining_time, arrival_time, index),
+    # the same ordering the per-tick min() used to pick
+    ready_queue = []
+    next_idx = 0
     
     # To detect context switches for the Gantt chart
     last_pid = None
     start_time_block = 0
     
+    # Switch overhead still to pay before the current process runs
+    switch = switch_sampler(switch_cost)
+    switch_left = 0
+    
+    # Profiling counts (kept in locals, reported once at the end)
+    events = 0
+    preemptions = 0
+    requeued = -1 # Process put back at the last step, to tell preemptions from continuations
+    
     while completed < n:
-        # 1. Find all available processes that are NOT done
-        ready_queue = []
-        for p in processes:
-            if p.arrival_time <= current_time and p.remaining_time > 0:
-                ready_queue.append(p)
-        
+        events += 1
         if not ready_queue:
             if last_pid is not None:
                 gantt_data.append((last_pid, start_time_block, current_time))
                 last_pid = None
             
-            current_time += 1
+            # CPU idle: jump straight to the next arrival
+            current_time = max(current_time, processes[next_idx].arrival_time)
             start_time_block = current_time # Reset block start
-            continue
-
-        current_process = min(ready_queue, key=lambda p: (p.remaining_time, p.arrival_time))
         
-        if current_process.start_time == -1:
-            current_process.start_time = current_time
+        # 1. Admit everything that has arrived by now
+        while next_idx < n and processes[next_idx].arrival_time <= current_time:
+            p = processes[next_idx]
+            heapq.heappush(ready_queue, (p.remaining_time, p.arrival_time, next_idx))
+            next_idx += 1
+
+        _, _, idx = heapq.heappop(ready_queue)
+        current_process = processes[idx]
+        if requeued != idx and requeued != -1:
+            preemptions += 1
+        requeued = -1
             
         if current_process.pid != last_pid:
             if last_pid is not None:
                  gantt_data.append((last_pid, start_time_block, current_time))
             last_pid = current_process.pid
             start_time_block = current_time
+            if switch is not None:
+                switch_left = switch() # A preempted, unfinished switch is simply lost
+        
+        # The switch runs until it is done or the next arrival, which may preempt it
+        if switch_left:
+            step = switch_left
+            if next_idx < n:
+                step = min(step, processes[next_idx].arrival_time - current_time)
+            gantt_data.append((OVERHEAD_PID, current_time, current_time + step))
+            current_time += step
+            switch_left -= step
+            start_time_block = current_time
+            if switch_left:
+                heapq.heappush(ready_queue, (current_process.remaining_time, current_process.arrival_time, idx))
+                requeued = idx
+                continue
+        
+        # 2. Only an arrival can preempt, so run until completion or the next arrival
+        run_time = current_process.remaining_time
+        if next_idx < n:
+            run_time = min(run_time, processes[next_idx].arrival_time - current_time)
+        
+        # A switch ending right at an arrival leaves an empty slice: not a start yet
+        # (unless there is nothing to run, as with a zero burst)
+        if current_process.start_time == -1 and (run_time or not current_process.remaining_time):
+            current_process.start_time = current_time
             
-        current_process.remaining_time -= 1
-        current_time += 1
+        current_process.remaining_time -= run_time
+        current_time += run_time
         
         if current_process.remaining_time == 0:
             completed += 1
@@ -123,14 +196,25 @@ def solve_srt(processes):
             current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
             current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
             current_process.response_time = current_process.start_time - current_process.arrival_time
+            if metrics is not None:
+                metrics.add(current_process)
+        else:
+            heapq.heappush(ready_queue, (current_process.remaining_time, current_process.arrival_time, idx))
+            requeued = idx
 
     if last_pid is not None:
         gantt_data.append((last_pid, start_time_block, current_time))
+    
+    if profiler is not None:
+        # Every step pops one process and all but each process's last step push it back.
+        # A process only gets the CPU anew at its first step and after a preemption.
+        profiler.count(events=events, dispatches=n + preemptions, queue_ops=2 * events,
+                       preemptions=preemptions)
         
     return processes, gantt_data
 
 
-def solve_rr(processes, quantum):
+def solve_rr(processes, quantum, metrics=None, profiler=None, switch_cost=None):
     print(f"--- Running Round Robin Algorithm (Quantum={quantum}) ---")
     
     # Sort by arrival first to easily manage initial loading
@@ -140,24 +224,35 @@ def solve_rr(processes, quantum):
     queue = deque()
     current_time = 0
     completed = 0
-    gantt_data = [] 
+    gantt_data = Timeline()
     
-    in_queue_indices = set()
+    # Processes are arrival-sorted, so everything before next_idx has
+    # already been queued and nothing after it has arrived yet
+    next_idx = 0
     
     # Helper to push new arrivals to queue
     def check_new_arrivals(time):
-        for i, p in enumerate(processes):
-            if p.arrival_time <= time and i not in in_queue_indices and p.remaining_time > 0:
-                queue.append(i)
-                in_queue_indices.add(i)
+        nonlocal next_idx
+        while next_idx < n and processes[next_idx].arrival_time <= time:
+            queue.append(next_idx)
+            next_idx += 1
 
     # Initial load
     check_new_arrivals(current_time)
     
+    # Switching to a different process than the last one costs time first
+    switch = switch_sampler(switch_cost)
+    last_pid = None
+    
+    # Profiling counts (kept in locals, reported once at the end)
+    events = 0
+    requeues = 0
+    
     while completed < n:
+        events += 1
         if not queue:
-            # Idle time logic
-            current_time += 1
+            # Idle time logic: jump straight to the next arrival
+            current_time = processes[next_idx].arrival_time
             check_new_arrivals(current_time)
             continue
             
@@ -168,6 +263,12 @@ def solve_rr(processes, quantum):
         # Determine run time (Process runs for Quantum OR until completion)
         run_time = min(quantum, p.remaining_time)
         
+        if switch is not None and p.pid != last_pid:
+            cost = switch()
+            gantt_data.append((OVERHEAD_PID, current_time, current_time + cost))
+            current_time += cost
+        last_pid = p.pid
+        
         # Metrics: Response Time (First time it runs)
         if p.start_time == -1:
             p.start_time = current_time
@@ -188,13 +289,22 @@ def solve_rr(processes, quantum):
             p.turnaround_time = p.completion_time - p.arrival_time
             p.waiting_time = p.turnaround_time - p.burst_time
             p.response_time = p.start_time - p.arrival_time
+            if metrics is not None:
+                metrics.add(p)
         else:
             # Not finished? Back to the queue
             queue.append(idx)
+            requeues += 1
+    
+    if profiler is not None:
+        # Each process is pushed on arrival and after every expired quantum, and popped as often
+        dispatches = n + requeues
+        profiler.count(events=events, dispatches=dispatches, queue_ops=2 * dispatches,
+                       quantum_expiries=requeues)
             
     return processes, gantt_data
 
-def solve_mlfq(processes, aging_interval=20):
+def solve_mlfq(processes, aging_interval=20, metrics=None, profiler=None, switch_cost=None):
     print(f"--- Running MLFQ Algorithm (Aging Interval={aging_interval}) ---")
     
     # Sort for easier arrival checks
@@ -203,7 +313,7 @@ def solve_mlfq(processes, aging_interval=20):
     n = len(processes)
     current_time = 0
     completed = 0
-    gantt_data = []
+    gantt_data = Timeline()
     
     # 3 Levels of Queues
     # queue_level 0 = RR(Q=2)
@@ -223,18 +333,35 @@ def solve_mlfq(processes, aging_interval=20):
     last_pid = None
     start_time_block = 0
     
+    # Switch overhead still to pay before the current process runs
+    switch = switch_sampler(switch_cost)
+    switch_left = 0
+    
+    # Processes are arrival-sorted, so a cursor is enough to find new arrivals
+    next_idx = 0
+    
+    # Profiling counts (kept in locals, reported once at the end)
+    events = 0
+    dispatches = 0
+    preemptions = 0
+    demotions = 0
+    boosted = 0
+    
     while completed < n:
+        events += 1
         # 1. Check for New Arrivals
         # Important: Add them to Q0 (High Priority)
-        for p in processes:
-            if p.arrival_time == current_time:
-                queues[0].append(p)
-                p_level[p.pid] = 0
+        while next_idx < n and processes[next_idx].arrival_time <= current_time:
+            p = processes[next_idx]
+            queues[0].append(p)
+            p_level[p.pid] = 0
+            next_idx += 1
         
         # 2. Check Aging (Prevent Starvation)
         # Every 'aging_interval' units, reset everyone to Q0
         if current_time > 0 and current_time % aging_interval == 0:
             # Move everyone from Q1 and Q2 back to Q0
+            boosted += len(queues[1]) + len(queues[2])
             for q_idx in range(1, 3):
                 while queues[q_idx]:
                     proc = queues[q_idx].popleft()
@@ -258,11 +385,22 @@ def solve_mlfq(processes, aging_interval=20):
             queues[p_level[current_proc.pid]].append(current_proc)
             current_proc = None
             time_slice = 0
+            switch_left = 0 # A switch cut short by the preemption is lost
+            preemptions += 1
 
         # If no process is running, pick one
         if not current_proc and active_queue_index != -1:
             current_proc = queues[active_queue_index].popleft()
             time_slice = 0
+            dispatches += 1
+        
+        # Next time anything outside the running process can change:
+        # an arrival, or an aging boost while someone waits in Q1/Q2
+        next_event = float('inf')
+        if next_idx < n:
+            next_event = processes[next_idx].arrival_time
+        if queues[1] or queues[2]:
+            next_event = min(next_event, (current_time // aging_interval + 1) * aging_interval)
             
         # 4. Update Gantt (Visualization Logic)
         if current_proc:
@@ -271,15 +409,29 @@ def solve_mlfq(processes, aging_interval=20):
                     gantt_data.append((last_pid, start_time_block, current_time))
                 last_pid = current_proc.pid
                 start_time_block = current_time
+                if switch is not None:
+                    switch_left = switch()
+            
+            # Switch first, until it is done or the next event; then decide again
+            if switch_left:
+                step = min(switch_left, next_event - current_time)
+                gantt_data.append((OVERHEAD_PID, current_time, current_time + step))
+                current_time += step
+                switch_left -= step
+                start_time_block = current_time
+                continue
             
             # Metric: Response Time
             if current_proc.start_time == -1:
                 current_proc.start_time = current_time
                 
-            # EXECUTE
-            current_proc.remaining_time -= 1
-            time_slice += 1
-            current_time += 1
+            # EXECUTE until completion, quantum expiry or the next event
+            run_time = min(current_proc.remaining_time,
+                           quantums[p_level[current_proc.pid]] - time_slice,
+                           next_event - current_time)
+            current_proc.remaining_time -= run_time
+            time_slice += run_time
+            current_time += run_time
             
             # Check Completion
             if current_proc.remaining_time == 0:
@@ -288,6 +440,8 @@ def solve_mlfq(processes, aging_interval=20):
                 current_proc.turnaround_time = current_proc.completion_time - current_proc.arrival_time
                 current_proc.waiting_time = current_proc.turnaround_time - current_proc.burst_time
                 current_proc.response_time = current_proc.start_time - current_proc.arrival_time
+                if metrics is not None:
+                    metrics.add(current_proc)
                 current_proc = None # CPU is free
                 time_slice = 0
             
@@ -299,18 +453,175 @@ def solve_mlfq(processes, aging_interval=20):
                 queues[next_level].append(current_proc)
                 current_proc = None # CPU is free
                 time_slice = 0
+                demotions += 1 # Only levels 0 and 1 have a quantum, so every expiry demotes
                 
         else:
-            # IDLE
+            # IDLE: every queue is empty, so jump straight to the next arrival
             if last_pid is not None:
                 gantt_data.append((last_pid, start_time_block, current_time))
                 last_pid = None
             
-            current_time += 1
+            current_time = next_event
             start_time_block = current_time
 
     # Final Gantt flush
     if last_pid is not None:
         gantt_data.append((last_pid, start_time_block, current_time))
+    
+    if profiler is not None:
+        # Pushes: arrivals, preempted and demoted processes, and every aging move (a pop and a push)
+        profiler.count(events=events, dispatches=dispatches, preemptions=preemptions,
+                       quantum_expiries=demotions, demotions=demotions, aging_boosts=boosted,
+                       queue_ops=n + preemptions + demotions + 2 * boosted + dispatches)
         
-    return processes, gantt_data
\ No newline at end of file
+    return processes, gantt_data
+
+
+def solve_priority(processes, preemptive=False, aging_interval=0, metrics=None, profiler=None,
+                   switch_cost=None):
+    mode = "Preemptive" if preemptive else "Non-Preemptive"
+    aging = f", Aging Interval={aging_interval}" if aging_interval else ""
+    print(f"--- Running Priority Algorithm ({mode}{aging}) ---")
+    
+    # Lower number = higher priority; ties go to the earlier arrival, then input order
+    processes.sort(key=lambda p: p.arrival_time)
+    
+    n = len(processes)
+    current_time = 0
+    completed = 0
+    gantt_data = Timeline()
+    
+    # Ready set ordered by (effective priority, index), the index standing for
+    # (arrival, input order). With aging, every 'aging_interval' time units
+    # each waiting process moves up one level (down to 0); AgingHeap does
+    # that with an offset on the keys, without visiting the waiting processes
+    ready = AgingHeap(aging_interval)
+    next_idx = 0
+    
+    # The process on the CPU (-1 when idle) and its priority: dispatched at
+    # 'dispatched_at', running from 'run_start' (later by the switch overhead, if any)
+    running = -1
+    running_priority = 0
+    dispatched_at = run_start = 0
+    last_pid = None
+    switch = switch_sampler(switch_cost)
+    
+    # Profiling counts (kept in locals, reported once at the end)
+    events = 0
+    dispatches = 0
+    preemptions = 0
+    
+    def charge(i):
+        """Charges process i for its time on the CPU since its dispatch, up to now."""
+        p = processes[i]
+        if dispatched_at < run_start: # Switch overhead (cut short if preempted during it)
+            gantt_data.append((OVERHEAD_PID, dispatched_at, min(current_time, run_start)))
+            if p.start_time == run_start and (current_time < run_start or current_time == run_start and p.remaining_time):
+                p.start_time = -1 # Never actually ran (a zero burst is done once switched in)
+        if current_time > run_start:
+            p.remaining_time -= current_time - run_start
+            gantt_data.append((p.pid, run_start, current_time))
+    
+    while completed < n:
+        events += 1
+        # 1. Next event: arrival, end of the running process, or the aging tick
+        # at which a waiting process comes to beat it
+        next_time = processes[next_idx].arrival_time if next_idx < n else math.inf
+        if running != -1:
+            next_time = min(next_time, run_start + processes[running].remaining_time)
+            if preemptive and ready:
+                next_time = min(next_time, ready.beats_at(running_priority, current_time))
+        current_time = max(current_time, next_time)
+        
+        # 2. The running process finishes
+        if running != -1 and run_start + processes[running].remaining_time == current_time:
+            charge(running)
+            p = processes[running]
+            running = -1
+            completed += 1
+            p.completion_time = current_time
+            
+            p.turnaround_time = p.completion_time - p.arrival_time
+            p.waiting_time = p.turnaround_time - p.burst_time
+            p.response_time = p.start_time - p.arrival_time
+            if metrics is not None:
+                metrics.add(p)
+        
+        # 3. Admit everything that has arrived by now (an aging tick now already counts for them)
+        while next_idx < n and processes[next_idx].arrival_time <= current_time:
+            ready.arrive(next_idx, processes[next_idx].priority, next_idx, current_time)
+            next_idx += 1
+        
+        # 4. Preemption: a waiting process with a strictly better priority takes the CPU
+        if preemptive and running != -1 and ready and ready.peek(current_time)[0] < running_priority:
+            charge(running)
+            ready.push(running, running_priority, running, current_time)
+            running = -1
+            preemptions += 1
+        
+        # 5. Idle CPU: dispatch the best waiting process
+        if running == -1 and ready:
+            running_priority, running = ready.pop(current_time)
+            p = processes[running]
+            dispatched_at = run_start = current_time
+            if switch is not None and p.pid != last_pid:
+                run_start += switch()
+                last_pid = p.pid
+            if p.start_time == -1:
+                p.start_time = run_start
+            dispatches += 1
+    
+    if profiler is not None:
+        # Pushes (arrivals and preempted processes) and pops match the dispatches;
+        # a process that ages all the way to 0 moves heaps once (a pop and a push)
+        profiler.count(events=events, dispatches=dispatches, preemptions=preemptions,
+                       aging_boosts=ready.moves, queue_ops=2 * dispatches + 2 * ready.moves)
+    
+    return processes, gantt_data
+
+
+# Algorithm names as shown in the GUI, and the parameters each one uses
+ALGORITHMS = ("FCFS", "SJF (Non-Preemptive)", "SRT (Preemptive)", "Round Robin", "MLFQ",
+              "Priority (Non-Preemptive)", "Priority (Preemptive)")
+PRIORITY_ALGORITHMS = ("Priority (Non-Preemptive)", "Priority (Preemptive)")
+ALGORITHM_PARAMS = {"Round Robin": ("quantum",), "MLFQ": ("aging_interval",),
+                    "Priority (Non-Preemptive)": ("priority_aging",), "Priority (Preemptive)": ("priority_aging",)}
+
+
+def run_algorithm(algorithm, processes, quantum=2, aging_interval=20, metrics=None, cores=1, queues=GLOBAL,
+                  profiler=None, switch_cost=None, priority_aging=0):
+    """
+    Runs the named algorithm on 'processes'. Returns (processes, gantt_data).
+    With cores > 1 it runs on that many CPUs (see solve_smp) and gantt_data
+    is a list with one Timeline per core.
+    'profiler' (a profiler.Profiler) collects the engine's counters.
+    'switch_cost' (an overhead.SwitchCost or spec string) charges time for
+    every context switch; the overhead shows up in gantt_data as
+    OVERHEAD_PID segments.
+    'priority_aging' is the aging interval of the Priority algorithms (0: no aging).
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}'")
+    if cores > 1:
+        result = solve_smp(processes, algorithm, cores=cores, queues=queues, quantum=quantum,
+                           aging_interval=aging_interval, metrics=metrics, profiler=profiler,
+                           switch_cost=switch_cost, priority_aging=priority_aging)
+    elif algorithm == "FCFS":
+        result = solve_fcfs(processes, metrics=metrics, profiler=profiler, switch_cost=switch_cost)
+    elif algorithm == "SJF (Non-Preemptive)":
+        result = solve_sjf(processes, metrics=metrics, profiler=profiler, switch_cost=switch_cost)
+    elif algorithm == "SRT (Preemptive)":
+        result = solve_srt(processes, metrics=metrics, profiler=profiler, switch_cost=switch_cost)
+    elif algorithm == "Round Robin":
+        result = solve_rr(processes, quantum, metrics=metrics, profiler=profiler, switch_cost=switch_cost)
+    elif algorithm in PRIORITY_ALGORITHMS:
+        result = solve_priority(processes, preemptive=algorithm == "Priority (Preemptive)",
+                                aging_interval=priority_aging, metrics=metrics, profiler=profiler,
+                                switch_cost=switch_cost)
+    else:
+        result = solve_mlfq(processes, aging_interval=aging_interval, metrics=metrics, profiler=profiler,
+                            switch_cost=switch_cost)
+
+    if profiler is not None:
+        profiler.record_schedule(result[1])
+    return result
@@ -0,0 +1,532 @@
+import heapq
+import math
+from collections import deque
+from aging_heap import AgingHeap
+from overhead import OVERHEAD_PID, switch_sampler
+from timeline import Timeline
+
+
+# Where waiting processes live
+GLOBAL = "global"     # One run queue shared by every core
+PER_CORE = "per-core" # A run queue per core, with load balancing and work stealing
+QUEUE_MODES = (GLOBAL, PER_CORE)
+
+
+class _ReadyQueue:
+    """
+    Ready set of one queue (the global one, or one core's) for one algorithm.
+    Holds indices into the arrival-sorted process list; 'procs' is that list.
+    """
+    preemptive = False
+    ages = False  # Whether age() does anything (and aging ticks are events)
+    rises = False # Whether waiting processes can come to beat a running one with nothing new arriving
+
+    def __init__(self, procs):
+        self.procs = procs
+
+    def admit(self, i):
+        """Adds a process that has just arrived."""
+        self.push(i)
+
+    def push(self, i):
+        raise NotImplementedError
+
+    def pop(self):
+        raise NotImplementedError
+
+    def steal(self):
+        """
+        Removes a process for another core to run: the one this core would
+        run last from the FIFO queues (FCFS, RR, MLFQ), the one it would run
+        next from the heaps (SJF, SRT, Priority), which can only give up their top.
+        """
+        raise NotImplementedError
+
+    def requeue(self, i):
+        """Puts back a process whose time slice ran out."""
+        self.push(i)
+
+    def slice(self, i):
+        """How long process i may run once dispatched before being requeued."""
+        return math.inf
+
+    def age(self):
+        pass
+
+    def beats_at(self, key):
+        """Time from which the best waiting process beats a running one with 'key', with nothing new arriving."""
+        return math.inf
+
+
+class _FIFOQueue(_ReadyQueue):
+    """FCFS, and Round Robin with a quantum."""
+
+    def __init__(self, procs, quantum=math.inf):
+        super().__init__(procs)
+        self.quantum = quantum
+        self._queue = deque()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def push(self, i):
+        self._queue.append(i)
+
+    def pop(self):
+        return self._queue.popleft()
+
+    def steal(self):
+        return self._queue.pop()
+
+    def slice(self, i):
+        return self.quantum
+
+
+class _SJFQueue(_ReadyQueue):
+    """Shortest burst first; ties go to the process given first in the input, as in solve_sjf."""
+
+    def __init__(self, procs, input_order=None):
+        super().__init__(procs)
+        # input_order[i]: position of procs[i] in the caller's list (procs is arrival-sorted)
+        self.input_order = range(len(procs)) if input_order is None else input_order
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, i):
+        heapq.heappush(self._heap, (self.procs[i].burst_time, self.input_order[i], i))
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def steal(self):
+        return self.pop()
+
+
+class _SRTQueue(_SJFQueue):
+    """Shortest remaining time first, preempting the running process when beaten."""
+    preemptive = True
+
+    def push(self, i):
+        p = self.procs[i]
+        heapq.heappush(self._heap, (p.remaining_time, p.arrival_time, i))
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def best(self):
+        return self._heap[0] if self._heap else None
+
+    def running_key(self, i, remaining):
+        return (remaining, self.procs[i].arrival_time, i)
+
+
+class _PriorityQueue(_ReadyQueue):
+    """
+    Lowest priority number first; ties go to the earlier arrival. With
+    aging, every tick improves each waiting process by one level, down to
+    0, without visiting them (same rules as solve_priority, see AgingHeap).
+    'clock' returns the engine's current time.
+    """
+
+    def __init__(self, procs, priority, preemptive, aging_interval, clock):
+        super().__init__(procs)
+        self.priority = priority # Shared by every queue: process index -> priority when it last left a queue
+        self.preemptive = preemptive
+        self.rises = preemptive and aging_interval > 0
+        self.clock = clock
+        self._heap = AgingHeap(aging_interval)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def admit(self, i):
+        self._heap.arrive(i, self.priority[i], i, self.clock())
+
+    def push(self, i):
+        self._heap.push(i, self.priority[i], i, self.clock())
+
+    def pop(self):
+        priority, i = self._heap.pop(self.clock())
+        self.priority[i] = priority
+        return i
+
+    def steal(self):
+        return self.pop()
+
+    def best(self):
+        top = self._heap.peek(self.clock())
+        return top[0] if top else None
+
+    def running_key(self, i, remaining):
+        return self.priority[i]
+
+    def beats_at(self, key):
+        return self._heap.beats_at(key, self.clock())
+
+    @property
+    def boosted(self):
+        return self._heap.moves # Processes that aged all the way to 0
+
+    @property
+    def aging_ops(self):
+        return 2 * self._heap.moves # Popped from the aging heap, pushed on the settled one
+
+
+class _MLFQQueue(_ReadyQueue):
+    """Same 3 levels as solve_mlfq: RR(Q=2), RR(Q=4), FCFS, with aging back to the top."""
+    preemptive = True
+    ages = True
+    QUANTUMS = (2, 4, math.inf)
+
+    def __init__(self, procs, levels):
+        super().__init__(procs)
+        self.levels = levels # Shared by every queue: process index -> level
+        self._queues = (deque(), deque(), deque())
+        self._size = 0 # Kept alongside the deques: len() is on the hot path
+        self.demotions = 0
+        self.boosted = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, i):
+        self._queues[self.levels[i]].append(i)
+        self._size += 1
+
+    def pop(self):
+        queues = self._queues
+        self._size -= 1
+        return (queues[0] or queues[1] or queues[2]).popleft()
+
+    def steal(self):
+        queues = self._queues
+        self._size -= 1
+        return (queues[2] or queues[1] or queues[0]).pop()
+
+    def requeue(self, i):
+        # Quantum used up: demote (max level is 2, which has no quantum)
+        self.levels[i] = min(2, self.levels[i] + 1)
+        self.demotions += 1
+        self.push(i)
+
+    def slice(self, i):
+        return self.QUANTUMS[self.levels[i]]
+
+    def best(self):
+        queues = self._queues
+        return next((level for level in range(3) if queues[level]), None)
+
+    def running_key(self, i, remaining):
+        return self.levels[i]
+
+    def age(self):
+        queues = self._queues
+        self.boosted += len(queues[1]) + len(queues[2])
+        for level in (1, 2):
+            while queues[level]:
+                i = queues[level].popleft()
+                self.levels[i] = 0
+                queues[0].append(i)
+
+    @property
+    def aging_ops(self):
+        return 2 * self.boosted # Popped from a lower level, pushed on the top one
+
+
+def _make_queue_factory(algorithm, procs, quantum, priority_aging=0, input_order=None, clock=None):
+    if algorithm == "FCFS":
+        return lambda: _FIFOQueue(procs)
+    if algorithm == "SJF (Non-Preemptive)":
+        return lambda: _SJFQueue(procs, input_order)
+    if algorithm == "SRT (Preemptive)":
+        return lambda: _SRTQueue(procs)
+    if algorithm == "Round Robin":
+        return lambda: _FIFOQueue(procs, quantum)
+    if algorithm == "MLFQ":
+        levels = [0] * len(procs)
+        return lambda: _MLFQQueue(procs, levels)
+    if algorithm in ("Priority (Non-Preemptive)", "Priority (Preemptive)"):
+        priority = [p.priority for p in procs]
+        preemptive = algorithm == "Priority (Preemptive)"
+        return lambda: _PriorityQueue(procs, priority, preemptive, priority_aging, clock)
+    raise ValueError(f"Unknown algorithm '{algorithm}'")
+
+
+def solve_smp(processes, algorithm, cores=2, queues=GLOBAL, quantum=2, aging_interval=20,
+              balance_interval=50, metrics=None, profiler=None, switch_cost=None, priority_aging=0):
+    """
+    Runs 'algorithm' on 'cores' CPUs. Returns (processes, lanes), where
+    lanes[c] is the Timeline of core c.
+    queues=GLOBAL: every core takes work from one shared run queue.
+    queues=PER_CORE: each core has its own queue. New processes go to an
+    idle core if there is one, otherwise round robin over the cores; every
+    'balance_interval' time units work moves from the longest queues to the
+    shortest, and a core whose queue runs dry steals from the longest one.
+    Preemptive algorithms (SRT, MLFQ, preemptive Priority) preempt the worst
+    running process whenever a waiting one in the same queue beats it.
+    MLFQ ages every 'aging_interval' time units, the Priority algorithms
+    every 'priority_aging' (0: never).
+    Like the single-CPU engines this is event-driven: time jumps straight to
+    the next arrival, end of a time slice, MLFQ aging boost, balancing tick,
+    or aging tick at which a waiting Priority process comes to preempt.
+    With cores=1 the schedule matches the single-CPU engine exactly.
+    'profiler', if given, receives the run's counters at the end.
+    With 'switch_cost', a core that starts a different process than the
+    last one it ran first spends that long switching.
+    """
+    print(f"--- Running {algorithm} on {cores} cores ({queues} run queue) ---")
+    if cores < 1:
+        raise ValueError("Need at least one core")
+    if queues not in QUEUE_MODES:
+        raise ValueError(f"Unknown queue mode '{queues}', expected one of {', '.join(QUEUE_MODES)}")
+
+    # Arrival order (stable), remembering where each process was in the input for SJF's ties
+    input_order = sorted(range(len(processes)), key=lambda k: processes[k].arrival_time)
+    processes[:] = [processes[k] for k in input_order]
+    n = len(processes)
+    new_queue = _make_queue_factory(algorithm, processes, quantum, priority_aging, input_order, lambda: now)
+
+    shared = queues == GLOBAL
+    ready = [new_queue()] if shared else [new_queue() for _ in range(cores)]
+    preemptive = ready[0].preemptive
+    aging = ready[0].ages
+    rises = ready[0].rises
+    lanes = [Timeline() for _ in range(cores)]
+
+    # Per-core state
+    running = [-1] * cores   # Process index, -1 when idle
+    slice_start = [0] * cores # When the process starts running, after any switch
+    dispatch_at = [0] * cores
+    loaded = [None] * cores  # Pid each core last switched to
+    version = [0] * cores    # Bumped on preemption, to skip stale slice-end events
+    idle = list(range(cores - 1, -1, -1)) # Stack of idle cores, lowest number on top
+    events = []              # Min-heap of (slice end, core, version)
+    dirty = set()            # Queues that received processes since the last preemption check
+    overtakes = []           # Min-heap of (time, queue, version): aging lets the queue's best beat a running process
+    overtake_version = [0] * len(ready)
+    touched = set()          # Queues whose best or whose cores' running processes changed (to re-arm overtakes)
+    switch = switch_sampler(switch_cost)
+
+    waiting = 0              # Processes sitting in any ready queue
+    next_idx = 0
+    next_core = 0            # Round-robin placement when no core is idle
+    completed = 0
+    now = 0
+
+    # Profiling counts (kept in locals, reported once at the end)
+    steps = 0
+    expiries = 0
+    preemptions = 0
+    steals = 0
+    migrations = 0
+
+    def stop(core):
+        """Charges the running process on 'core' up to 'now'; returns its index."""
+        i = running[core]
+        p = processes[i]
+        start = slice_start[core]
+        if dispatch_at[core] < start: # Switch overhead (cut short if preempted during it)
+            lanes[core].append((OVERHEAD_PID, dispatch_at[core], min(now, start)))
+            if p.start_time == start and (now < start or now == start and p.remaining_time):
+                p.start_time = -1 # Never actually ran (a zero burst is done once switched in)
+        if now > start:
+            p.remaining_time -= now - start
+            lanes[core].append((p.pid, start, now))
+        running[core] = -1
+        idle.append(core)
+        return i
+
+    def dispatch(core, i):
+        p = processes[i]
+        start = now
+        if switch is not None and p.pid != loaded[core]:
+            start += switch()
+            loaded[core] = p.pid
+        if p.start_time == -1:
+            p.start_time = start
+        running[core] = i
+        dispatch_at[core] = now
+        slice_start[core] = start
+        heapq.heappush(events, (start + min(p.remaining_time, ready[0].slice(i)), core, version[core]))
+        if rises:
+            touched.add(0 if shared else core)
+
+    def worst_running(queue_index):
+        """(core, key) of the running process a process from this queue would preempt first; key None if none."""
+        queue = ready[queue_index]
+        worst_core, worst_key = -1, None
+        for core in (range(cores) if shared else (queue_index,)):
+            i = running[core]
+            if i == -1:
+                continue
+            key = queue.running_key(i, processes[i].remaining_time - max(0, now - slice_start[core]))
+            if worst_key is None or key > worst_key:
+                worst_core, worst_key = core, key
+        return worst_core, worst_key
+
+    while completed < n:
+        steps += 1
+        # 1. Next event: arrival, end of a slice, aging boost, balancing tick or overtake
+        while events and events[0][2] != version[events[0][1]]:
+            heapq.heappop(events)
+        while overtakes and overtakes[0][2] != overtake_version[overtakes[0][1]]:
+            heapq.heappop(overtakes)
+        next_time = processes[next_idx].arrival_time if next_idx < n else math.inf
+        if events:
+            next_time = min(next_time, events[0][0])
+        if overtakes:
+            next_time = min(next_time, overtakes[0][0])
+        if waiting:
+            if aging:
+                next_time = min(next_time, (now // aging_interval + 1) * aging_interval)
+            if not shared and cores > 1:
+                next_time = min(next_time, (now // balance_interval + 1) * balance_interval)
+        now = max(now, next_time)
+
+        # 2. Slices ending now: completions, and processes whose quantum ran out
+        expired = []
+        while events and events[0][0] == now:
+            _, core, ver = heapq.heappop(events)
+            if ver != version[core] or running[core] == -1:
+                continue
+            i = stop(core)
+            p = processes[i]
+            if p.remaining_time == 0:
+                completed += 1
+                p.completion_time = now
+                p.turnaround_time = p.completion_time - p.arrival_time
+                p.waiting_time = p.turnaround_time - p.burst_time
+                p.response_time = p.start_time - p.arrival_time
+                if metrics is not None:
+                    metrics.add(p)
+            else:
+                expired.append((core, i))
+
+        # 3. Arrivals (before the expired ones rejoin, like solve_rr)
+        while next_idx < n and processes[next_idx].arrival_time <= now:
+            if shared:
+                target = 0
+            elif idle:
+                target = idle[-1]
+            else:
+                target = next_core
+                next_core = (next_core + 1) % cores
+            ready[target].admit(next_idx)
+            dirty.add(target)
+            waiting += 1
+            next_idx += 1
+
+        expiries += len(expired)
+        for core, i in expired:
+            target = 0 if shared else core
+            ready[target].requeue(i)
+            dirty.add(target)
+            waiting += 1
+
+        # 4. MLFQ aging: everyone waiting in the lower levels goes back to the top
+        if aging and waiting and now > 0 and now % aging_interval == 0:
+            for target, queue in enumerate(ready):
+                if len(queue):
+                    queue.age()
+                    dirty.add(target)
+
+        # 5. Load balancing: even out the per-core queue lengths
+        if not shared and waiting and cores > 1 and now % balance_interval == 0:
+            received, moved = _balance(ready)
+            dirty.update(received)
+            migrations += moved
+
+        # Priority aging has let a queue's best process come to beat a running one
+        while overtakes and overtakes[0][0] <= now:
+            _, queue_index, ver = heapq.heappop(overtakes)
+            if ver == overtake_version[queue_index]:
+                dirty.add(queue_index)
+
+        # 6. Preemption: a waiting process that beats a running one takes its core.
+        # Running processes only get better over time, so only queues that
+        # received something since the last check can preempt. Finding the
+        # worst running process scans every core with a global queue (O(cores)
+        # per check) and only the queue's own core with per-core queues.
+        if preemptive and waiting and dirty:
+            for queue_index in dirty:
+                queue = ready[queue_index]
+                while len(queue) and not (shared and idle):
+                    best = queue.best()
+                    worst_core, worst_key = worst_running(queue_index)
+                    if worst_core == -1 or not best < worst_key:
+                        break
+                    version[worst_core] += 1
+                    preemptions += 1
+                    queue.push(stop(worst_core)) # Back into its queue without demotion
+                    waiting += 1
+                    dispatch(worst_core, queue.pop())
+                    idle.remove(worst_core)
+                    waiting -= 1
+
+        if rises:
+            touched.update(dirty)
+        dirty.clear()
+
+        # 7. Idle cores pick up work (stealing from the longest queue if their own is empty)
+        if waiting and idle:
+            still_idle = []
+            while idle and waiting:
+                core = idle.pop()
+                queue = ready[0] if shared else ready[core]
+                if len(queue):
+                    dispatch(core, queue.pop())
+                    waiting -= 1
+                    continue
+                victim = max(ready, key=len)
+                if len(victim):
+                    dispatch(core, victim.steal())
+                    waiting -= 1
+                    steals += 1
+                else:
+                    still_idle.append(core)
+            idle.extend(reversed(still_idle))
+
+        # 8. Priority aging: re-arm the time at which each changed queue's best
+        # process comes to beat the worst running process it could preempt
+        if rises:
+            for queue_index in touched:
+                overtake_version[queue_index] += 1
+                worst_key = worst_running(queue_index)[1]
+                if worst_key is not None and len(ready[queue_index]):
+                    at = ready[queue_index].beats_at(worst_key)
+                    if at < math.inf:
+                        heapq.heappush(overtakes, (at, queue_index, overtake_version[queue_index]))
+            touched.clear()
+
+    if profiler is not None:
+        # Every process that leaves a core unfinished is dispatched again later
+        dispatches = n + expiries + preemptions
+        boosted = sum(getattr(q, "boosted", 0) for q in ready)
+        # Pushes: arrivals, requeues and preemptions (one per dispatch) and migrations;
+        # pops: dispatches and migrations; plus the aging moves
+        profiler.count(events=steps, dispatches=dispatches, preemptions=preemptions,
+                       quantum_expiries=expiries, steals=steals, migrations=migrations,
+                       demotions=sum(getattr(q, "demotions", 0) for q in ready), aging_boosts=boosted,
+                       queue_ops=2 * dispatches + 2 * migrations + sum(getattr(q, "aging_ops", 0) for q in ready))
+
+    return processes, lanes
+
+
+def _balance(ready):
+    """
+    Moves work from the longest queues to the shortest until they differ by
+    at most one. Returns (indices of the queues that received work, number
+    of processes moved).
+    """
+    received = set()
+    moved = 0
+    while True:
+        longest = max(range(len(ready)), key=lambda q: len(ready[q]))
+        shortest = min(range(len(ready)), key=lambda q: len(ready[q]))
+        if len(ready[longest]) - len(ready[shortest]) <= 1:
+            return received, moved
+        ready[shortest].push(ready[longest].steal())
+        received.add(shortest)
+        moved += 1
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from scheduler import solve_rr, solve_mlfq
+from metrics import MetricsAggregator
+
+
+SWEEP_COLUMNS = ("Value", "Avg Wait", "Avg Turnaround", "Avg Response")
+
+# Workload shared by every task of a worker process (set once by _init_worker)
+_worker_workload = None
+
+
+def parse_values(text):
+    """
+    Parses a sweep specification into a list of ints.
+    Accepts a single value ("2"), a comma list ("1,2,4,8") or an
+    inclusive range "start:stop" / "start:stop:step" ("1:20", "5:100:5").
+    """
+    values = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if ":" in part:
+            bounds = [int(x) for x in part.split(":")]
+            if len(bounds) not in (2, 3):
+                raise ValueError(f"Invalid range '{part}', expected start:stop[:step]")
+            start, stop = bounds[0], bounds[1]
+            step = bounds[2] if len(bounds) == 3 else 1
+            if step <= 0:
+                raise ValueError(f"Invalid range '{part}', step must be positive")
+            values.extend(range(start, stop + 1, step))
+        else:
+            values.append(int(part))
+    if not values:
+        raise ValueError("No sweep values given")
+    return values
+
+
+def _init_worker(workload):
+    global _worker_workload
+    _worker_workload = workload
+
+
+def _run_point(algorithm, value, switch_cost=None):
+    processes = _worker_workload.to_processes()
+    
+    metrics = MetricsAggregator()
+    
+    # Keep the per-run banners out of the sweep output
+    with contextlib.redirect_stdout(io.StringIO()):
+        if algorithm == "Round Robin":
+            solve_rr(processes, value, metrics=metrics, switch_cost=switch_cost)
+        else:
+            solve_mlfq(processes, aging_interval=value, metrics=metrics, switch_cost=switch_cost)
+    
+    return (value, metrics.wait.mean, metrics.turnaround.mean, metrics.response.mean)
+
+
+def run_sweep(workload, algorithm, values, workers=None, switch_cost=None, progress=None):
+    """
+    Runs 'algorithm' ("Round Robin" sweeps quantum, "MLFQ" sweeps the aging
+    interval) once per value, spread over a process pool.
+    The workload is handed to each worker once, not once per run.
+    With 'switch_cost' every run pays that context-switch overhead, which
+    is what makes small quanta expensive.
+    'progress' is called with each result row as it comes in; if it raises
+    (e.g. worker.SimulationCancelled), the runs not yet started are dropped.
+    Returns a list of (value, avg_wait, avg_turnaround, avg_response) in 'values' order.
+    """
+    if algorithm not in ("Round Robin", "MLFQ"):
+        raise ValueError(f"Cannot sweep algorithm '{algorithm}'")
+    if any(v <= 0 for v in values):
+        raise ValueError("Sweep values must be positive")
+    
+    results = []
+    workers = min(workers or os.cpu_count() or 1, len(values))
+    if workers <= 1:
+        _init_worker(workload)
+        for v in values:
+            results.append(_run_point(algorithm, v, switch_cost))
+            if progress is not None:
+                progress(results[-1])
+        return results
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(workload,)) as pool:
+        futures = [pool.submit(_run_point, algorithm, v, switch_cost) for v in values]
+        try:
+            for future in futures:
+                results.append(future.result())
+                if progress is not None:
+                    progress(results[-1])
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return results
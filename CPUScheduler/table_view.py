@@ -0,0 +1,178 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class AttributeColumn:
+    """Read-only column over a list of objects, e.g. the waiting_time of every Process."""
+    __slots__ = ("items", "name")
+
+    def __init__(self, items, name):
+        self.items = items
+        self.name = name
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, i):
+        return getattr(self.items[i], self.name)
+
+
+class VirtualTable:
+    """
+    Treeview that only holds the rows currently on screen.
+    The data is a list of equal-length columns (sequences, array views or
+    AttributeColumns); scrolling swaps the few visible rows instead of the
+    Treeview holding one item per row, so tables with hundreds of thousands
+    of rows open and scroll instantly. Sorting (click a heading) and the
+    filter box work on row indices into the columns, never on Tk items.
+    'footer' rows, such as the summary statistics, are always shown last.
+    """
+    DEFAULT_ROW_HEIGHT = 20
+
+    def __init__(self, parent, headings, height=10, filter_column=0):
+        self.headings = tuple(headings)
+        self.filter_column = filter_column
+        self.frame = tk.Frame(parent)
+
+        # Filter box (substring match on the filter column)
+        filter_frame = tk.Frame(self.frame)
+        filter_frame.pack(fill="x")
+        tk.Label(filter_frame, text=f"Filter {self.headings[filter_column]}:").pack(side="left", padx=5)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *args: self.set_filter(self.filter_var.get()))
+        tk.Entry(filter_frame, textvariable=self.filter_var, width=15).pack(side="left")
+        self.count_var = tk.StringVar()
+        tk.Label(filter_frame, textvariable=self.count_var, fg="gray").pack(side="left", padx=10)
+
+        self.tree = ttk.Treeview(self.frame, columns=self.headings, show="headings", height=height)
+        for index, col in enumerate(self.headings):
+            self.tree.heading(col, text=col, command=lambda c=index: self.sort_by(c))
+            self.tree.column(col, width=80, anchor="center")
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.on_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.columns = []
+        self.footer = []
+        self.order = None # Visible row indices after sorting/filtering (None = all, in input order)
+        self.sort_column = None
+        self.sort_reverse = False
+        self.filter_text = ""
+        self.top = 0
+
+        rowheight = ttk.Style().lookup("Treeview", "rowheight")
+        self.row_height = int(rowheight) if rowheight else self.DEFAULT_ROW_HEIGHT
+
+        self.tree.bind("<Configure>", lambda e: self.refresh())
+        # Scroll ourselves: the Treeview only knows about the rows it holds
+        self.tree.bind("<MouseWheel>", lambda e: self._on_wheel(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self._on_wheel(-1))
+        self.tree.bind("<Button-5>", lambda e: self._on_wheel(1))
+
+    # --- Public API ---
+
+    def set_data(self, columns, footer=()):
+        """Shows 'columns' (one sequence per heading) plus the 'footer' rows, keeping sort and filter."""
+        self.columns = list(columns)
+        self.footer = list(footer)
+        self.top = 0
+        self._apply_order()
+
+    def clear(self):
+        self.set_data([])
+
+    def sort_by(self, column):
+        """Sorts by 'column'; clicking the same heading again reverses the order."""
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        for index, col in enumerate(self.headings):
+            arrow = (" ▼" if self.sort_reverse else " ▲") if index == column else ""
+            self.tree.heading(col, text=col + arrow)
+        self._apply_order()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip()
+        self.top = 0
+        self._apply_order()
+
+    def on_scroll(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        total = self._total_rows()
+        visible = self._visible_rows()
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = visible if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.refresh()
+
+    def refresh(self):
+        """Re-inserts only the rows that fit in the widget."""
+        tree = self.tree
+        tree.delete(*tree.get_children())
+
+        total = self._total_rows()
+        visible = self._visible_rows()
+        self.top = min(max(self.top, 0), max(0, total - visible))
+        end = min(total, self.top + visible)
+
+        rows = self._row_count()
+        for position in range(self.top, end):
+            if position < rows:
+                index = position if self.order is None else self.order[position]
+                tree.insert("", "end", values=self._row(index))
+            else:
+                tree.insert("", "end", values=self.footer[position - rows], tags=('avg',))
+
+        if total:
+            self.scrollbar.set(self.top / total, end / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    # --- Helpers ---
+
+    def _apply_order(self):
+        n = len(self.columns[0]) if self.columns else 0
+        if n:
+            indices = None
+            if self.filter_text:
+                key = self.columns[self.filter_column]
+                text = self.filter_text.lower()
+                indices = [i for i in range(n) if text in str(key[i]).lower()]
+            if self.sort_column is not None:
+                key = self.columns[self.sort_column]
+                indices = sorted(range(n) if indices is None else indices,
+                                 key=key.__getitem__, reverse=self.sort_reverse)
+            self.order = indices
+        else:
+            self.order = None
+
+        rows = self._row_count()
+        self.count_var.set(f"{rows} of {n} rows" if self.filter_text else f"{n} rows")
+        self.refresh()
+
+    def _row(self, index):
+        return [column[index] for column in self.columns]
+
+    def _row_count(self):
+        if self.order is not None:
+            return len(self.order)
+        return len(self.columns[0]) if self.columns else 0
+
+    def _total_rows(self):
+        return self._row_count() + len(self.footer)
+
+    def _visible_rows(self):
+        # Heading takes about one row; before the widget is mapped use its requested height
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return int(self.tree.cget("height"))
+        return max(1, height // self.row_height - 1)
+
+    def _on_wheel(self, direction):
+        self.on_scroll("scroll", direction * 3, "units")
+        return "break"
@@ -0,0 +1,25 @@
+import pytest
+import reference
+from process import Process
+from reference import make_case, results, run_reference
+from scheduler import run_algorithm
+
+
+SEEDS = range(300)
+
+
+@pytest.mark.parametrize("algorithm", reference.ALGORITHMS)
+def test_engines_match_the_reference(algorithm):
+    for seed in SEEDS:
+        rows, params = make_case(seed)
+        expected, expected_gantt = run_reference(algorithm, rows, **params)
+        processes, gantt = run_algorithm(algorithm, [Process(*row) for row in rows], **params)
+        assert results(processes) == results(expected), seed
+        assert list(gantt) == expected_gantt, seed
+
+
+def test_reference_priority_ages_waiting_processes():
+    # P3 (priority 3) waits behind a stream of priority 0 jobs until aging lifts it
+    rows = [("P1", 0, 4, 0), ("P2", 1, 4, 0), ("P3", 1, 1, 3), ("P4", 5, 4, 0)]
+    processes, gantt = reference.solve_priority([Process(*row) for row in rows], aging_interval=2)
+    assert [pid for pid, _, _ in gantt] == ["P1", "P2", "P3", "P4"]
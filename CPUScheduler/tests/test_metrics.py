@@ -0,0 +1,29 @@
+import math
+import pytest
+import reference
+from metrics import MetricsAggregator
+from process import Process
+from reference import make_case, run_reference
+from scheduler import run_algorithm
+
+
+def assert_same_stats(metrics, processes):
+    expected = MetricsAggregator.from_processes(processes).stats()
+    got = metrics.stats()
+    assert len(got) == len(expected)
+    for got_row, want_row in zip(got, expected):
+        assert got_row[0] == want_row[0]
+        # Streamed and batch standard deviations may differ in the last bit
+        assert all(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+                   for a, b in zip(got_row[1:], want_row[1:])), got_row[0]
+
+
+@pytest.mark.parametrize("algorithm", reference.ALGORITHMS)
+def test_streamed_metrics_match_the_reference(algorithm):
+    # Engines add each process as it completes; the totals must match the finished schedule's
+    for seed in range(100):
+        rows, params = make_case(seed)
+        expected, _ = run_reference(algorithm, rows, **params)
+        metrics = MetricsAggregator()
+        run_algorithm(algorithm, [Process(*row) for row in rows], metrics=metrics, **params)
+        assert_same_stats(metrics, expected)
@@ -0,0 +1,22 @@
+import pytest
+import reference
+from online import COMPLETED, GANTT, make_scheduler, stream
+from process import Process
+from reference import make_case, results, run_reference
+
+
+@pytest.mark.parametrize("algorithm", reference.ALGORITHMS)
+def test_online_schedulers_match_the_reference(algorithm):
+    for seed in range(300):
+        rows, params = make_case(seed)
+        rows.sort(key=lambda row: row[1]) # Online input comes in arrival order
+        expected, expected_gantt = run_reference(algorithm, rows, **params)
+
+        completed, gantt = [], []
+        for kind, event in stream(make_scheduler(algorithm, **params), (Process(*row) for row in rows)):
+            if kind == GANTT:
+                gantt.append(event)
+            elif kind == COMPLETED:
+                completed.append(event)
+        assert results(completed) == results(expected), seed
+        assert gantt == expected_gantt, seed
@@ -0,0 +1,148 @@
+import random
+import pytest
+from overhead import OVERHEAD_PID, SwitchCost, cpu_efficiency
+from process import Process
+from reference import make_case, results
+from scheduler import ALGORITHMS, run_algorithm, solve_priority, solve_srt
+from smp import GLOBAL, PER_CORE, solve_smp
+from timeline import as_lanes
+
+
+SPECS = ("1", "3", "uniform:0:3", "exp:1.5", "normal:2:1")
+
+
+def make_processes(seed, n=150):
+    rng = random.Random(seed)
+    time = 0
+    processes = []
+    for i in range(n):
+        time += rng.randint(0, 4)
+        processes.append(Process(f"P{i}", time, rng.randint(1, 12), rng.randint(0, 5)))
+    return processes
+
+
+def check_schedule(processes, gantt_data):
+    """Every process runs exactly its burst, and its start/response times match its first real run."""
+    ran, first_run = {}, {}
+    for lane in as_lanes(gantt_data):
+        end = 0
+        for pid, start, stop in lane:
+            assert start >= end and stop > start
+            end = stop
+            if pid != OVERHEAD_PID:
+                ran[pid] = ran.get(pid, 0) + stop - start
+                first_run[pid] = min(first_run.get(pid, start), start)
+    for p in processes:
+        assert ran[p.pid] == p.burst_time, p.pid
+        assert p.start_time == first_run[p.pid], p.pid
+        assert p.response_time == p.start_time - p.arrival_time, p.pid
+        assert p.waiting_time == p.completion_time - p.arrival_time - p.burst_time, p.pid
+
+
+def test_srt_switch_ending_at_an_arrival_is_not_a_start():
+    # A's switch ends at t=1 just as shorter B arrives; A first runs at t=4
+    processes, gantt = solve_srt([Process("A", 0, 5), Process("B", 1, 1)], switch_cost="1")
+    check_schedule(processes, gantt)
+    a = next(p for p in processes if p.pid == "A")
+    assert (a.start_time, a.response_time) == (4, 4)
+
+
+def test_smp_switch_ending_at_a_preemption_is_not_a_start():
+    processes, gantt = solve_smp([Process("A", 0, 5), Process("B", 1, 1)], "SRT (Preemptive)",
+                                 cores=1, switch_cost="1")
+    check_schedule(processes, gantt)
+    a = next(p for p in processes if p.pid == "A")
+    assert (a.start_time, a.response_time) == (4, 4)
+
+
+def test_priority_preemption_at_switch_end_with_aging():
+    # P2's switch ends at t=8 as P1 arrives and, with aging, preempts it; P2 first runs at t=13
+    rows = [("P1", 8, 3, 3), ("P2", 7, 2, 3), ("P3", 15, 3, 5)]
+    processes, gantt = solve_priority([Process(*row) for row in rows], preemptive=True,
+                                      aging_interval=2, switch_cost="1")
+    check_schedule(processes, gantt)
+    p2 = next(p for p in processes if p.pid == "P2")
+    assert (p2.start_time, p2.response_time) == (13, 6)
+
+    processes, gantt = solve_smp([Process(*row) for row in rows], "Priority (Preemptive)", cores=1,
+                                 priority_aging=2, switch_cost="1")
+    check_schedule(processes, gantt)
+    assert next(p for p in processes if p.pid == "P2").start_time == 13
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_zero_burst_starts_once_switched_in(algorithm):
+    # B has nothing to run: it starts as it completes, once its switch (if any) is done
+    rows = [("A", 0, 2), ("B", 1, 0)]
+    for switch_cost in (None, "1"):
+        processes, _ = run_algorithm(algorithm, [Process(*row) for row in rows], switch_cost=switch_cost)
+        smp_processes, _ = solve_smp([Process(*row) for row in rows], algorithm, cores=1, switch_cost=switch_cost)
+        b, smp_b = (next(p for p in ps if p.pid == "B") for ps in (processes, smp_processes))
+        assert b.start_time == b.completion_time >= 1
+        assert b.response_time == b.start_time - 1
+        assert (smp_b.start_time, smp_b.response_time) == (b.start_time, b.response_time)
+
+
+@pytest.mark.parametrize("spec", SPECS)
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_switch_cost_schedules(algorithm, spec):
+    for seed in range(3):
+        processes, gantt = run_algorithm(algorithm, make_processes(seed), quantum=3, aging_interval=15,
+                                         switch_cost=SwitchCost(spec, seed), priority_aging=7)
+        check_schedule(processes, gantt)
+        efficiency, overhead = cpu_efficiency(gantt)
+        assert overhead > 0 and 0 < efficiency < 1
+
+
+@pytest.mark.parametrize("cores,queues", [(1, GLOBAL), (3, GLOBAL), (3, PER_CORE)])
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_smp_switch_cost_schedules(algorithm, cores, queues):
+    for seed in range(3):
+        for spec in SPECS:
+            processes, gantt = solve_smp(make_processes(seed), algorithm, cores=cores, queues=queues,
+                                         quantum=3, aging_interval=15, switch_cost=SwitchCost(spec, seed),
+                                         priority_aging=7)
+            check_schedule(processes, gantt)
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_one_core_matches_single_cpu_engine(algorithm):
+    for seed in range(3):
+        for spec in ("0", "1", "3"):
+            single, _ = run_algorithm(algorithm, make_processes(seed), quantum=3, aging_interval=15,
+                                      switch_cost=spec, priority_aging=7)
+            smp, _ = solve_smp(make_processes(seed), algorithm, cores=1, quantum=3, aging_interval=15,
+                               switch_cost=spec, priority_aging=7)
+            key = lambda p: p.pid
+            assert ([(p.pid, p.start_time, p.completion_time) for p in sorted(single, key=key)] ==
+                    [(p.pid, p.start_time, p.completion_time) for p in sorted(smp, key=key)])
+
+
+@pytest.mark.parametrize("spec", ("1", "uniform:0:3", "exp:1.5", "normal:2:1"))
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_seeded_switch_costs_match_across_engines(algorithm, spec):
+    # Small cases full of ties: single-CPU and one-core SMP runs must agree,
+    # and every start time must be the process's first real run
+    for seed in range(300):
+        rows, params = make_case(seed)
+        expected, expected_gantt = run_algorithm(algorithm, [Process(*row) for row in rows],
+                                                 switch_cost=SwitchCost(spec, seed), **params)
+        check_schedule(expected, expected_gantt)
+        processes, lanes = solve_smp([Process(*row) for row in rows], algorithm, cores=1,
+                                     switch_cost=SwitchCost(spec, seed), **params)
+        assert results(processes) == results(expected), seed
+        assert list(lanes[0]) == list(expected_gantt), seed
+
+
+def test_zero_cost_leaves_schedule_unchanged():
+    for algorithm in ALGORITHMS:
+        free, free_gantt = run_algorithm(algorithm, make_processes(0))
+        zero, zero_gantt = run_algorithm(algorithm, make_processes(0), switch_cost="0")
+        assert list(free_gantt) == list(zero_gantt)
+        assert cpu_efficiency(zero_gantt) == (1.0, 0)
+
+
+def test_invalid_spec():
+    for spec in ("-1", "uniform:3:1", "uniform:1.5:1.7", "exp", "gauss:1:2", "1.5"):
+        with pytest.raises(ValueError):
+            SwitchCost(spec)
@@ -0,0 +1,46 @@
+import pytest
+import reference
+from process import Process
+from reference import make_case, results, run_reference
+from scheduler import solve_sjf
+from smp import GLOBAL, PER_CORE, solve_smp
+
+
+def test_sjf_ties_follow_input_order():
+    # B and C wait with equal bursts; solve_sjf runs B first because it comes first in the input
+    def rows():
+        return [Process("A", 0, 5), Process("B", 2, 3), Process("C", 1, 3)]
+    _, single = solve_sjf(rows())
+    _, lanes = solve_smp(rows(), "SJF (Non-Preemptive)", cores=1)
+    assert list(lanes[0]) == list(single) == [("A", 0, 5), ("B", 5, 8), ("C", 8, 11)]
+
+
+def test_every_core_runs_each_process_once():
+    processes = [Process(f"P{i}", i // 3, 1 + i % 4) for i in range(30)]
+    for queues in (GLOBAL, PER_CORE):
+        done, lanes = solve_smp([Process(p.pid, p.arrival_time, p.burst_time) for p in processes],
+                                "SJF (Non-Preemptive)", cores=3, queues=queues)
+        ran = sorted(pid for lane in lanes for pid, _, _ in lane)
+        assert ran == sorted(p.pid for p in processes)
+        assert all(p.completion_time - p.start_time == p.burst_time for p in done)
+
+
+def test_steal_takes_the_back_of_a_fifo_and_the_top_of_a_heap():
+    # Core 0 runs A while P1 and P3 wait in its queue; core 1 runs B, P2 and P4, then steals.
+    # FCFS gives up P3, the last in line; SJF gives up P1, the shortest
+    rows = [("A", 0, 20), ("B", 0, 10), ("P1", 1, 2), ("P2", 2, 1), ("P3", 3, 5), ("P4", 4, 1)]
+    for algorithm, stolen in (("FCFS", ["P3", "P1"]), ("SJF (Non-Preemptive)", ["P1", "P3"])):
+        _, lanes = solve_smp([Process(*row) for row in rows], algorithm, cores=2, queues=PER_CORE,
+                             balance_interval=1000)
+        assert list(lanes[0]) == [("A", 0, 20)]
+        assert [pid for pid, _, _ in lanes[1]][3:] == stolen
+
+
+@pytest.mark.parametrize("algorithm", reference.ALGORITHMS)
+def test_one_core_matches_the_reference(algorithm):
+    for seed in range(300):
+        rows, params = make_case(seed)
+        expected, expected_gantt = run_reference(algorithm, rows, **params)
+        processes, lanes = solve_smp([Process(*row) for row in rows], algorithm, cores=1, **params)
+        assert results(processes) == results(expected), seed
+        assert list(lanes[0]) == expected_gantt, seed
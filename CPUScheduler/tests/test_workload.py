@@ -0,0 +1,27 @@
+import pytest
+import reference
+from process import Process
+from reference import make_case, results, run_reference
+from scheduler import run_algorithm
+from workload import Workload, WorkloadFormatError, load_workload
+
+
+@pytest.mark.parametrize("algorithm", reference.ALGORITHMS)
+def test_runs_sharing_a_workload_match_the_reference(algorithm):
+    for seed in range(100):
+        rows, params = make_case(seed)
+        expected, expected_gantt = run_reference(algorithm, rows, **params)
+        workload = Workload.from_processes([Process(*row) for row in rows])
+        for _ in range(2): # A run must leave the shared columns untouched
+            processes, gantt = run_algorithm(algorithm, workload.to_processes(), **params)
+            assert results(processes) == results(expected), seed
+            assert list(gantt) == expected_gantt, seed
+
+
+@pytest.mark.parametrize("row, message", [("P2,-1,3,0", "arrival_time"), ("P2,1,0,0", "burst_time"),
+                                          ("P2,1,-2,0", "burst_time"), ("P2,1,x,0", "integers")])
+def test_csv_rejects_bad_rows(tmp_path, row, message):
+    path = tmp_path / "input.csv"
+    path.write_text(f"pid,arrival_time,burst_time,priority\nP1,0,4,1\n{row}\n")
+    with pytest.raises(WorkloadFormatError, match=f"line 3.*{message}"):
+        load_workload(str(path))
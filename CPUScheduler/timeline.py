@@ -0,0 +1,152 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from operator import eq, sub
+
+
+class Timeline:
+    """
+    Compact Gantt chart storage.
+    Segments live in typed arrays with pids interned to small ints, and a
+    segment that continues the previous one (same pid, no gap) is merged
+    into it instead of being stored again.
+    Iterates as (pid, start, end) tuples, like the old gantt_data lists.
+    """
+    __slots__ = ("_names", "_ids", "_pid", "_start", "_end", "_busy")
+
+    def __init__(self, segments=()):
+        self._names = [] # interned id -> pid
+        self._ids = {}   # pid -> interned id
+        self._pid = array('l')
+        self._start = array('q')
+        self._end = array('q')
+        self._busy = None # Prefix sums of segment lengths, built on demand
+        for segment in segments:
+            self.append(segment)
+
+    def append(self, segment):
+        """Adds a (pid, start, end) segment, same as list.append on the old gantt_data."""
+        pid, start, end = segment
+        if end <= start:
+            return
+        
+        pid_id = self._ids.get(pid)
+        if pid_id is None:
+            pid_id = len(self._names)
+            self._ids[pid] = pid_id
+            self._names.append(pid)
+        
+        self._busy = None
+        
+        # Run-length merge: same pid picking up exactly where it left off
+        if self._pid and self._pid[-1] == pid_id and self._end[-1] == start:
+            self._end[-1] = end
+            return
+        
+        self._pid.append(pid_id)
+        self._start.append(start)
+        self._end.append(end)
+
+    @property
+    def pids(self):
+        """Distinct pids in order of first appearance."""
+        return list(self._names)
+
+    @property
+    def end_time(self):
+        return self._end[-1] if self._end else 0
+
+    # --- Range queries (segments are appended in time order) ---
+
+    def pid_id(self, i):
+        """Interned id of segment i's pid (0 for the first pid seen, 1 for the next, ...)."""
+        return self._pid[i]
+
+    def visible_range(self, start, end):
+        """Returns (lo, hi): segments lo..hi-1 are the ones overlapping [start, end)."""
+        return bisect_right(self._end, start), bisect_left(self._start, end)
+
+    def segment_at(self, time):
+        """Index of the segment running at 'time', or -1 if the CPU is idle then."""
+        i = bisect_right(self._start, time) - 1
+        if i >= 0 and self._end[i] > time:
+            return i
+        return -1
+
+    def busy_time(self, start, end):
+        """Total time in [start, end) covered by segments, in O(log n)."""
+        return self._busy_before(end) - self._busy_before(start)
+
+    def pid_time(self, pid):
+        """Total time covered by the segments of 'pid'."""
+        pid_id = self._ids.get(pid)
+        if pid_id is None:
+            return 0
+        return sum(end - start for p, start, end in zip(self._pid, self._start, self._end) if p == pid_id)
+
+    def context_switches(self, overhead_pid=None):
+        """
+        Times the CPU goes straight from one process to the next (a segment starting where the previous one ends).
+        Segments of 'overhead_pid' (switch overhead) belong to the switch into the segment after them.
+        """
+        back_to_back = map(eq, self._start[1:], self._end[:-1])
+        overhead_id = self._ids.get(overhead_pid)
+        if overhead_id is None:
+            return sum(back_to_back)
+        return sum(adjacent and pid_id != overhead_id for adjacent, pid_id in zip(back_to_back, self._pid[1:]))
+
+    def busy_through(self, i):
+        """Total time covered by segments 0..i."""
+        return self._busy_prefix()[i + 1]
+
+    def busy_index(self, amount):
+        """Index of the first segment by whose end the CPU has been busy for at least 'amount' (len(self) if never)."""
+        return bisect_left(self._busy_prefix(), amount, 1) - 1
+
+    def _busy_prefix(self):
+        # _busy[k] is the total length of segments 0..k-1
+        if self._busy is None:
+            self._busy = array('q', [0])
+            self._busy.extend(accumulate(map(sub, self._end, self._start)))
+        return self._busy
+
+    def _busy_before(self, time):
+        i = bisect_right(self._start, time) # Segments 0..i-1 start at or before 'time'
+        if i == 0:
+            return 0
+        return self._busy_prefix()[i - 1] + min(self._end[i - 1], time) - self._start[i - 1]
+
+    def __len__(self):
+        return len(self._pid)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return (self._names[self._pid[i]], self._start[i], self._end[i])
+
+    def __iter__(self):
+        names = self._names
+        for pid_id, start, end in zip(self._pid, self._start, self._end):
+            yield (names[pid_id], start, end)
+
+    def __eq__(self, other):
+        if isinstance(other, Timeline):
+            other = list(other)
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"Timeline({len(self)} segments, {len(self._names)} pids)"
+
+
+def as_lanes(gantt_data):
+    """
+    Gantt data as a list of Timelines, one per CPU: a Timeline or a list of
+    (pid, start, end) tuples is a single lane, a list of Timelines (from
+    the multi-core engine) is one lane per core.
+    """
+    if isinstance(gantt_data, Timeline):
+        return [gantt_data]
+    gantt_data = list(gantt_data)
+    if gantt_data and all(isinstance(lane, Timeline) for lane in gantt_data):
+        return gantt_data
+    return [Timeline(gantt_data)]
@@ -1,76 +1,162 @@
-import matplotlib.pyplot as plt
+import re
 import matplotlib.colors as mcolors
-import random
+from matplotlib.collections import PolyCollection
+from overhead import OVERHEAD_PID
+from timeline import as_lanes
 
-def plot_gantt_chart(gantt_data):
+# Beyond this many lanes only every k-th PID gets a y tick label
+MAX_TICK_LABELS = 60
+# Text is the slow part of a Matplotlib render, so never draw more labels than this
+MAX_BAR_LABELS = 500
+
+
+def pid_sort_key(pid):
+    """Natural sort key: P2 < P10, and names without numbers still sort."""
+    return tuple(int(part) if i % 2 else part for i, part in enumerate(re.split(r"(\d+)", str(pid))))
+
+
+def _lane_intervals(timeline, min_gap):
+    """
+    Groups the timeline into {pid: [(start, duration), ...]}. Intervals of the
+    same PID separated by less than 'min_gap' (one pixel) are merged, so no
+    lane ever holds more intervals than the chart has pixels.
+    """
+    lanes = {}
+    for pid, start, end in timeline:
+        intervals = lanes.get(pid)
+        if intervals is None:
+            lanes[pid] = [(start, end - start)]
+            continue
+        last_start, last_duration = intervals[-1]
+        if start - (last_start + last_duration) < min_gap:
+            intervals[-1] = (last_start, end - last_start)
+        else:
+            intervals.append((start, end - start))
+    return lanes
+
+
+def _core_bars(timeline, min_gap):
+    """
+    One core's row as [(pid, start, duration), ...], with the one-pixel
+    merging of _lane_intervals applied in time order: a segment joins the
+    previous bar when it is less than 'min_gap' after it and has the same
+    PID, or when both are narrower than 'min_gap' (drawn in the first one's
+    color). Grouping by PID instead would stretch a PID that recurs on the
+    core, such as the context-switch overhead, under everything in between.
+    No row holds many more bars than the chart has pixels.
+    """
+    bars = []
+    for pid, start, end in timeline:
+        if bars:
+            last_pid, last_start, last_end = bars[-1]
+            if start - last_end < min_gap and (pid == last_pid or
+                                              (last_end - last_start < min_gap and end - start < min_gap)):
+                bars[-1] = (last_pid, last_start, end)
+                continue
+        bars.append((pid, start, end))
+    return [(pid, start, end - start) for pid, start, end in bars]
+
+
+def plot_gantt_chart(gantt_data, output=None, width=10, height=None, dpi=100, title='CPU Scheduling Gantt Chart'):
     """
     Plots a Gantt chart using Matplotlib.
-    gantt_data: List of tuples (PID, Start, End)
+    gantt_data: List of tuples (PID, Start, End) or a Timeline, or a list of
+                Timelines from a multi-core run (one row per core, bars
+                colored by PID)
+    output: File to write (format from the extension: .png, .svg, .pdf, ...).
+            Rendered off-screen with the Agg backend, so it works without a
+            display. Without it the chart is shown in an interactive window.
+    All bars are drawn as a single collection, intervals closer than one
+    pixel are merged, and PID labels are only drawn inside bars wide enough
+    to hold them.
     """
-    if not gantt_data:
+    timelines = as_lanes(gantt_data)
+    if not any(timelines):
         print("No data to plot.")
         return
 
-    # 1. Setup Data for Plotting
-    # We need to group start/durations by PID to plot them on the same 'y' line
-    # Format for broken_barh: (start_time, duration)
-    process_intervals = {}
-    all_pids = set()
-    
-    for pid, start, end in gantt_data:
-        duration = end - start
-        if duration == 0: continue
-        
-        if pid not in process_intervals:
-            process_intervals[pid] = []
-        process_intervals[pid].append((start, duration))
-        all_pids.add(pid)
-        
-    # Sort PIDs to make the Y-axis orderly (e.g., P1 at top or bottom)
-    sorted_pids = sorted(list(all_pids), key=lambda x: int(x[1:]) if x[1:].isdigit() else x)
-    
-    # 2. Setup Figure
-    fig, ax = plt.subplots(figsize=(10, 5))
-    
-    # Generate distinct colors
+    # 1. Setup Figure
+    per_core = len(timelines) > 1
+    sorted_pids = sorted({pid for timeline in timelines for pid in timeline.pids}, key=pid_sort_key)
+    rows = len(timelines) if per_core else len(sorted_pids)
+    if height is None:
+        height = min(40, max(5, 1 + 0.3 * rows))
+
+    if output:
+        # Off-screen figure: no pyplot state, no GUI backend needed
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        FigureCanvasAgg(fig)
+    else:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(width, height), dpi=dpi)
+    ax = fig.add_subplot()
+
+    end_time = max(timeline.end_time for timeline in timelines)
+    x_max = end_time + 2
+    time_per_pixel = x_max / (width * dpi)
+
+    # Generate distinct colors (context-switch overhead is gray)
     colors = list(mcolors.TABLEAU_COLORS.values())
-    pid_color_map = {pid: colors[i % len(colors)] for i, pid in enumerate(sorted_pids)}
+    process_pids = [pid for pid in sorted_pids if pid != OVERHEAD_PID]
+    color_of = {pid: colors[i % len(colors)] for i, pid in enumerate(process_pids)}
+    color_of[OVERHEAD_PID] = 'lightgray'
 
-    # 3. Plot Bars
-    # Y-position: We give each PID a height level (10, 20, 30...)
+    # One row per PID, or per core: (y label, [(pid, start, duration), ...])
+    if per_core:
+        rows = [(f"Core {core}", _core_bars(timeline, time_per_pixel)) for core, timeline in enumerate(timelines)]
+    else:
+        lanes = _lane_intervals(timelines[0], time_per_pixel)
+        rows = [(pid, [(pid, start, duration) for start, duration in lanes[pid]]) for pid in sorted_pids]
+
+    # 2. Build every bar as one polygon of a single collection
+    # Y-position: We give each row a height level (10, 20, 30...)
     y_start = 10
     y_height = 9
+    verts = []
+    facecolors = []
     yticks = []
     yticklabels = []
-    
-    for i, pid in enumerate(sorted_pids):
-        # Y position for this process
+    labels = []
+    # Approximate width of a bold 8pt character, in time units
+    char_time = 8 * 0.7 * dpi / 72 * time_per_pixel
+
+    for i, (row_label, bars) in enumerate(rows):
         y_pos = y_start + (i * 10)
-        
-        # Data for this process
-        intervals = process_intervals[pid]
-        
-        # Plot
-        ax.broken_barh(intervals, (y_pos, y_height), facecolors=pid_color_map[pid], edgecolors='black')
-        
-        # Label placement
-        yticks.append(y_pos + y_height/2)
-        yticklabels.append(pid)
-        
-        # Add labels inside the bars for clarity
-        for start, duration in intervals:
-            center_x = start + duration/2
-            center_y = y_pos + y_height/2
-            ax.text(center_x, center_y, pid, ha='center', va='center', color='white', fontweight='bold', fontsize=8)
-
-    # 4. Formatting
-    ax.set_ylim(5, 5 + len(sorted_pids) * 10 + 5)
-    ax.set_xlim(0, max(end for _, _, end in gantt_data) + 2)
+
+        for pid, start, duration in bars:
+            end = start + duration
+            verts.append(((start, y_pos), (start, y_pos + y_height),
+                          (end, y_pos + y_height), (end, y_pos)))
+            facecolors.append(color_of[pid])
+            # Add labels inside the bars that are wide enough for them
+            if duration >= char_time * (len(str(pid)) + 1) and len(labels) < MAX_BAR_LABELS:
+                labels.append((start + duration / 2, y_pos + y_height / 2, pid))
+
+        yticks.append(y_pos + y_height / 2)
+        yticklabels.append(row_label)
+
+    # Outlines only help while bars are several pixels wide; when dense they just turn black
+    edge_width = 0.8 if len(verts) * 4 < width * dpi else 0
+    ax.add_collection(PolyCollection(verts, facecolors=facecolors, edgecolors='black',
+                                     linewidths=edge_width))
+
+    for x, y, pid in labels:
+        ax.text(x, y, pid, ha='center', va='center', color='white', fontweight='bold', fontsize=8)
+
+    # 3. Formatting
+    step = max(1, -(-len(rows) // MAX_TICK_LABELS))
+    ax.set_ylim(5, 5 + len(rows) * 10 + 5)
+    ax.set_xlim(0, x_max)
     ax.set_xlabel('Time Units')
-    ax.set_yticks(yticks)
-    ax.set_yticklabels(yticklabels)
+    ax.set_yticks(yticks[::step])
+    ax.set_yticklabels(yticklabels[::step])
     ax.grid(True, axis='x', linestyle='--', alpha=0.5)
-    ax.set_title('CPU Scheduling Gantt Chart')
-    
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    ax.set_title(title)
+
+    fig.tight_layout()
+    if output:
+        fig.savefig(output)
+    else:
+        plt.show()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import threading
+import time
+
+
+class SimulationCancelled(Exception):
+    pass
+
+
+class SimulationTimeout(SimulationCancelled):
+    pass
+
+
+class SimulationTask:
+    """
+    Runs a simulation on a background thread so the GUI stays responsive.
+    'func' is called as func(progress); it must hand 'progress' to the engine
+    (see result_cache.cached_run) so it is called for every completed process.
+    That callback keeps 'completed' and 'sim_time' up to date for the UI to
+    poll, and is where cancel() and the timeout take effect. Work that is not
+    a single simulation (a parameter sweep) reports its steps with step().
+    """
+
+    def __init__(self, func, timeout=None):
+        self.func = func
+        self.timeout = timeout
+        self.completed = 0
+        self.sim_time = 0
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started_at if self.started_at else 0.0
+
+    def progress(self, process):
+        self.completed += 1
+        self.sim_time = process.completion_time
+        self.check()
+
+    def step(self, *args):
+        """Progress callback for work counted in other units than processes (e.g. sweep runs)."""
+        self.completed += 1
+        self.check()
+
+    def check(self):
+        """Raises SimulationCancelled once cancel() was called or the timeout has passed."""
+        if self._cancel.is_set():
+            raise SimulationCancelled("Simulation cancelled")
+        if self.timeout is not None and self.elapsed > self.timeout:
+            raise SimulationTimeout(f"Simulation timed out after {self.timeout:g}s")
+
+    def _run(self):
+        try:
+            self.result = self.func(self.progress)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
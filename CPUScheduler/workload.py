@@ -0,0 +1,353 @@
+import argparse
+import csv
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from process import Process
+
+
+# Columns every workload CSV must provide
+CSV_COLUMNS = ("pid", "arrival_time", "burst_time", "priority")
+
+# Binary workload file (.wkb), all little-endian:
+#   header: magic, version, reserved, job count n, pid blob size
+#   arrival[n], burst[n], priority[n] as int64
+#   pid offsets[n + 1] as int64 (offsets[n] is the blob size + 1)
+#   pid blob: UTF-8 pids separated by NUL bytes
+BINARY_MAGIC = b"CPUWKLD\0"
+BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<8sIIQQ")
+
+# Parsed workloads keyed by absolute path -> ((mtime, size), Workload)
+_workload_cache = {}
+
+
+class WorkloadFormatError(ValueError):
+    """Raised when a workload file is missing columns or has a malformed row."""
+
+    def __init__(self, filename, line_num, message):
+        if line_num is None:
+            super().__init__(f"{filename}: {message}")
+        else:
+            super().__init__(f"{filename}, line {line_num}: {message}")
+        self.filename = filename
+        self.line_num = line_num
+
+
+class PidColumn(Sequence):
+    """Pids decoded on access from a NUL-separated UTF-8 blob, as stored in binary workloads."""
+    __slots__ = ("blob", "_offsets")
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        start = self._offsets[i]
+        return str(self.blob[start:self._offsets[i + 1] - 1], "utf-8")
+
+
+class Workload:
+    """
+    Read-only, column-oriented set of jobs.
+    pid, arrival, burst and priority are stored once in typed columns, and
+    every simulation run gets its own fresh Process objects from them, so
+    several runs can share one loaded input without copying it.
+    Workloads loaded from a binary file keep their columns in the
+    memory-mapped file itself, so opening one copies nothing.
+    """
+    __slots__ = ("_pids", "_arrival", "_burst", "_priority", "_digest", "_source")
+
+    def __init__(self, pids, arrival_times, burst_times, priorities):
+        self._init_columns(tuple(pids), array('q', arrival_times),
+                           array('q', burst_times), array('q', priorities))
+
+    def _init_columns(self, pids, arrival, burst, priority, source=None):
+        self._pids = pids
+        self._arrival = arrival
+        self._burst = burst
+        self._priority = priority
+        self._digest = None
+        self._source = source
+        
+        n = len(self._pids)
+        if not (len(self._arrival) == len(self._burst) == len(self._priority) == n):
+            raise ValueError("Workload columns must all have the same length")
+
+    @classmethod
+    def _from_mapped(cls, pids, arrival, burst, priority, source):
+        """Wraps columns without copying them (views into a mapped file)."""
+        workload = cls.__new__(cls)
+        workload._init_columns(pids, arrival, burst, priority, source)
+        return workload
+
+    @classmethod
+    def from_processes(cls, processes):
+        return cls([p.pid for p in processes],
+                   [p.arrival_time for p in processes],
+                   [p.burst_time for p in processes],
+                   [p.priority for p in processes])
+
+    # Read-only column views
+    @property
+    def pids(self):
+        return self._pids
+
+    @property
+    def arrival_times(self):
+        return memoryview(self._arrival).toreadonly()
+
+    @property
+    def burst_times(self):
+        return memoryview(self._burst).toreadonly()
+
+    @property
+    def priorities(self):
+        return memoryview(self._priority).toreadonly()
+
+    @property
+    def source(self):
+        """Binary file the columns are mapped from, or None for an in-memory workload."""
+        return self._source
+
+    def digest(self):
+        """Content hash of the workload (computed once, the columns never change)."""
+        if self._digest is None:
+            h = hashlib.sha256()
+            if isinstance(self._pids, PidColumn):
+                h.update(self._pids.blob) # Already the NUL-joined pids
+            else:
+                h.update("\0".join(map(str, self._pids)).encode())
+            for column in (self._arrival, self._burst, self._priority):
+                h.update(b"\1")
+                h.update(column)
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def __len__(self):
+        return len(self._pids)
+
+    def __getitem__(self, i):
+        # A fresh Process, ready to be scheduled
+        return Process(self._pids[i], self._arrival[i], self._burst[i], self._priority[i])
+
+    def __iter__(self):
+        for i in range(len(self._pids)):
+            yield Process(self._pids[i], self._arrival[i], self._burst[i], self._priority[i])
+
+    def to_processes(self):
+        """Returns a new list of Process objects for one simulation run."""
+        return list(self)
+
+    def __reduce__(self):
+        # Mapped workloads travel to worker processes as their path, so every
+        # worker maps the same file and shares the page cache
+        if self._source is not None:
+            return (load_workload, (self._source,))
+        return (Workload, (self._pids, self._arrival, self._burst, self._priority))
+
+    def __repr__(self):
+        return f"Workload({len(self)} processes)"
+
+
+def load_workload(filename):
+    """
+    Loads a workload CSV (pid,arrival_time,burst_time,priority) or a binary
+    workload written by save_workload (recognized by its header).
+    The file is read only once per (path, mtime, size); later calls with
+    an unchanged file return the same read-only Workload.
+    Raises FileNotFoundError, or WorkloadFormatError with the bad line number.
+    """
+    stat = os.stat(filename)
+    key = os.path.abspath(filename)
+    version = (stat.st_mtime_ns, stat.st_size)
+    
+    cached = _workload_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    with open(filename, 'rb') as file:
+        is_binary = file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    workload = _map_binary(key) if is_binary else _parse_csv(filename)
+    _workload_cache[key] = (version, workload)
+    return workload
+
+
+def clear_workload_cache(filename=None):
+    """Forgets every loaded workload, or only the one loaded from 'filename'."""
+    if filename is None:
+        _workload_cache.clear()
+    else:
+        _workload_cache.pop(os.path.abspath(filename), None)
+
+
+def _parse_csv(filename):
+    pids = []
+    arrival = array('q')
+    burst = array('q')
+    priority = array('q')
+    
+    with open(filename, 'r', newline='') as file:
+        # Plain csv.reader: no per-row dict, columns are looked up once from the header
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return Workload(pids, arrival, burst, priority)
+        
+        header = [name.strip() for name in header]
+        missing = [name for name in CSV_COLUMNS if name not in header]
+        if missing:
+            raise WorkloadFormatError(filename, reader.line_num,
+                                      f"missing column(s): {', '.join(missing)}")
+        pid_col, arrival_col, burst_col, priority_col = (header.index(name) for name in CSV_COLUMNS)
+        width = max(pid_col, arrival_col, burst_col, priority_col) + 1
+        
+        for row in reader:
+            if not row:
+                continue # Skip blank lines like DictReader did
+            if len(row) < width:
+                raise WorkloadFormatError(filename, reader.line_num,
+                                          f"expected {len(header)} fields, got {len(row)}")
+            try:
+                arrival_time, burst_time = int(row[arrival_col]), int(row[burst_col])
+                priority.append(int(row[priority_col]))
+            except ValueError:
+                raise WorkloadFormatError(filename, reader.line_num,
+                                          "arrival_time, burst_time and priority must be integers") from None
+            if arrival_time < 0:
+                raise WorkloadFormatError(filename, reader.line_num, "arrival_time must not be negative")
+            if burst_time <= 0:
+                raise WorkloadFormatError(filename, reader.line_num, "burst_time must be positive")
+            arrival.append(arrival_time)
+            burst.append(burst_time)
+            pids.append(row[pid_col])
+    
+    return Workload(pids, arrival, burst, priority)
+
+
+def save_workload(workload, filename):
+    """Writes 'workload' in the binary format read by load_workload."""
+    save_columns([(workload.pids, workload.arrival_times, workload.burst_times, workload.priorities)],
+                 len(workload), filename)
+
+
+def save_columns(chunks, n, filename):
+    """
+    Writes a binary workload from an iterable of (pids, arrival times, burst
+    times, priorities) column chunks adding up to 'n' jobs. Each chunk is
+    written to its place in every column as it comes, so the whole workload
+    never has to be in memory (used by generator.py for huge traces).
+    """
+    arrival_at = _BINARY_HEADER.size
+    burst_at = arrival_at + 8 * n
+    priority_at = burst_at + 8 * n
+    offsets_at = priority_at + 8 * n
+    blob_at = offsets_at + 8 * (n + 1)
+    
+    with open(filename, 'wb') as file:
+        # Pid i is blob[offsets[i]:offsets[i + 1] - 1] (as if every pid, including the last, ended with a NUL)
+        file.seek(offsets_at)
+        array('q', [0]).tofile(file) # Same bytes in either byte order
+        position = 0
+        count = 0
+        for pids, arrivals, bursts, priorities in chunks:
+            pids = [str(pid) for pid in pids]
+            if any("\0" in pid for pid in pids):
+                raise ValueError("pids cannot contain NUL characters")
+            if not (len(arrivals) == len(bursts) == len(priorities) == len(pids)):
+                raise ValueError("Workload columns must all have the same length")
+            if count + len(pids) > n:
+                raise ValueError(f"Got more than the {n} jobs expected")
+            if not pids:
+                continue
+            
+            # NUL-separated, so every chunk after the first starts with the separator
+            blob = (("\0" if count else "") + "\0".join(pids)).encode()
+            blob_start = position - 1 if count else 0
+            ends = array('q')
+            for pid in pids:
+                position += len(pid.encode()) + 1
+                ends.append(position)
+            
+            for at, column in ((arrival_at + 8 * count, array('q', arrivals)),
+                               (burst_at + 8 * count, array('q', bursts)),
+                               (priority_at + 8 * count, array('q', priorities)),
+                               (offsets_at + 8 * (count + 1), ends)):
+                if sys.byteorder != "little":
+                    column.byteswap()
+                file.seek(at)
+                column.tofile(file)
+            file.seek(blob_at + blob_start)
+            file.write(blob)
+            count += len(pids)
+        
+        if count != n:
+            raise ValueError(f"Expected {n} jobs, got {count}")
+        file.seek(0)
+        file.write(_BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, n, max(0, position - 1)))
+
+
+def convert_csv(csv_filename, binary_filename):
+    """Converts a workload CSV to the binary format. Returns the number of jobs."""
+    workload = _parse_csv(csv_filename)
+    save_workload(workload, binary_filename)
+    return len(workload)
+
+
+def _map_binary(filename):
+    with open(filename, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size < _BINARY_HEADER.size:
+            raise WorkloadFormatError(filename, None, "truncated header")
+        # The mapping stays valid after the file is closed
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    _, version, _, n, blob_size = _BINARY_HEADER.unpack_from(mapped)
+    if version != BINARY_VERSION:
+        raise WorkloadFormatError(filename, None, f"unsupported binary workload version {version}")
+    expected = _BINARY_HEADER.size + 8 * (4 * n + 1) + blob_size
+    if size != expected:
+        raise WorkloadFormatError(filename, None, f"expected {expected} bytes for {n} jobs, found {size}")
+    
+    view = memoryview(mapped)
+    columns = []
+    offset = _BINARY_HEADER.size
+    for length in (n, n, n, n + 1):
+        column = view[offset:offset + 8 * length].cast('q')
+        if sys.byteorder != "little":
+            column = array('q', column) # Not zero-copy on big-endian machines
+            column.byteswap()
+        columns.append(column)
+        offset += 8 * length
+    arrival, burst, priority, offsets = columns
+    
+    pids = PidColumn(view[offset:offset + blob_size], offsets)
+    return Workload._from_mapped(pids, arrival, burst, priority, filename)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a workload CSV to the binary workload format")
+    parser.add_argument("csv_file", help="Input CSV (pid,arrival_time,burst_time,priority)")
+    parser.add_argument("binary_file", help="Output file, e.g. trace.wkb")
+    args = parser.parse_args(argv)
+    
+    try:
+        count = convert_csv(args.csv_file, args.binary_file)
+    except (OSError, WorkloadFormatError) as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Wrote {count} jobs to {args.binary_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())